@@ -4,16 +4,37 @@ Flask-basiertes Backend für AI Interview Agent
 Kompatibel mit Python 3.13
 """
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template
 from datetime import datetime
 import os
-import threading
 import time
 from dotenv import load_dotenv
 
 from config.database_sqlite import DatabaseManager, InterviewSession
+from config.server import prepare_database
 from services.demo_service import DemoVapiClient, DemoSlackNotifier, DemoEvaluator, is_demo_mode
 from services.gemini_service import GeminiEvaluator
+from services.worker_pool import ProcessingPool
+from services.job_queue import JOB_PROCESS_CALL, JobQueue, JobWorker, run_in_process
+from services.assistant_registry import AssistantRegistry
+from services.http_transport import get_shared_transport
+from services.interview_queries import list_changes, list_interviews, serialize_interview
+from services.change_feed import ChangeFeed
+from services.event_bus import EventBus, format_sse
+from services.metrics import metrics
+from services.webhook_dedupe import CLAIMED, WebhookDedupe
+from services.analytics import (
+    analytics_contribution, apply_analytics_delta, build_analytics_query, summarize_analytics
+)
+from services.config_service import config_service
+from services.scoring import scoring_engine
+from services.evaluation_cache import CachedEvaluator, EvaluationCache
+from services.transcript_preprocessor import PreprocessingEvaluator
+from services.map_reduce_evaluator import MapReduceEvaluator, is_map_reduce_mode
+from services.transcript_utils import (
+    TRANSCRIPT_FORMATS, TranscriptCache, etag_matches, iter_transcript, json_document, row_version, transcript_entry,
+    transcript_query, transcript_version_query
+)
 
 load_dotenv()
 def build_transcript_url(call_id: str) -> str:
@@ -21,10 +42,17 @@ def build_transcript_url(call_id: str) -> str:
     if not base:
         port = os.getenv("API_PORT", "8000")
         base = f"http://localhost:{port}"
-    return f"{base.rstrip('/')}/interviews/{call_id}/transcript"
+    # Slack-Links öffnen die lesbare Textansicht
+    return f"{base.rstrip('/')}/interviews/{call_id}/transcript?format=text"
 
 app = Flask(__name__)
 db_manager = DatabaseManager()
+processing_pool = ProcessingPool()
+# Hintergrundjobs liegen in processing_jobs und überstehen Neustarts; der Pool führt sie aus
+job_queue = JobQueue(db_manager)
+job_worker = JobWorker(job_queue, processing_pool, {
+    JOB_PROCESS_CALL: lambda job: process_claimed_call(job.payload["call_id"], job.final_attempt),
+})
 
 # API Services Setup
 gemini_api_key = os.getenv('OPENAI_API_KEY', '')
@@ -50,8 +78,28 @@ else:
     evaluator = InterviewEvaluator()
     slack_notifier = SlackNotifier()
 
-# Datenbank beim Import initialisieren
-db_manager.create_tables()
+# system_config (Schwellen, Interviewdauer, Gewichte, Assistant-ID) über den gecachten Config-Service
+config_service.bind(db_manager)
+assistant_registry = AssistantRegistry(vapi_client, config_service)
+evaluation_cache = EvaluationCache(db_manager)
+transcript_cache = TranscriptCache()
+event_bus = EventBus()
+# Änderungen aus anderen Prozessen (Pre-Fork, scripts/job_worker.py) über die Datenbank nachliefern
+change_feed = ChangeFeed(db_manager, event_bus)
+# Vapi stellt call-ended ggf. mehrfach zu: jeder Call wird nur einmal bewertet
+webhook_dedupe = WebhookDedupe(db_manager)
+# Vorverarbeitung vor dem LLM, optional Map-Reduce über die Interview-Abschnitte,
+# Cache davor (Key enthält Token-Budget und Modus)
+preprocessing_evaluator = PreprocessingEvaluator(evaluator)
+evaluator = preprocessing_evaluator
+map_reduce_evaluator = None
+if is_map_reduce_mode():
+    map_reduce_evaluator = evaluator = MapReduceEvaluator(evaluator)
+evaluator = CachedEvaluator(evaluator, evaluation_cache)
+
+# Datenbank beim Import initialisieren (Schema, Kennzahlen-Backfill); unter gunicorn
+# erledigt das der Master einmal vor dem Fork (gunicorn.conf.py)
+prepare_database(db_manager)
 
 @app.route('/start-interview', methods=['POST'])
 def start_interview():
@@ -64,9 +112,8 @@ def start_interview():
         if not candidate_phone:
             return jsonify({"error": "candidate_phone is required"}), 400
         
-        # Erstelle Assistant (oder verwende bestehenden)
-        assistant = vapi_client.create_assistant()
-        assistant_id = assistant.get('id')
+        # Verwende bestehenden Assistant (wird nur bei Konfigurationsänderung neu erstellt)
+        assistant_id = assistant_registry.get_assistant_id()
         
         if not assistant_id:
             return jsonify({"error": "Failed to create assistant"}), 500
@@ -82,8 +129,7 @@ def start_interview():
             return jsonify({"error": "Failed to initiate call"}), 500
         
         # Speichere Session in DB
-        db_session = db_manager.get_session()
-        try:
+        with db_manager.write_session() as db_session:
             interview_session = InterviewSession(
                 vapi_call_id=call_id,
                 candidate_phone=candidate_phone,
@@ -91,9 +137,9 @@ def start_interview():
                 status="in_progress"
             )
             db_session.add(interview_session)
-            db_session.commit()
-        finally:
-            db_session.close()
+            db_session.flush()
+            event_data = serialize_interview(interview_session)
+        event_bus.publish("interview.created", event_data)
         
         return jsonify({
             "success": True,
@@ -112,86 +158,162 @@ def vapi_webhook():
     if data.get('type') == 'call-ended':
         call_id = data.get('call', {}).get('id')
         if call_id:
-            # Background processing in separatem Thread
-            thread = threading.Thread(target=process_completed_call, args=(call_id,))
-            thread.start()
+            state = webhook_dedupe.claim(call_id)
+            if state != CLAIMED:
+                # Duplikat: läuft schon oder ist erledigt - sofort bestätigen
+                return jsonify({"status": "duplicate", "state": state})
+            try:
+                job_queue.enqueue(JOB_PROCESS_CALL, {"call_id": call_id}, dedupe_key=call_id)
+            except Exception as e:
+                webhook_dedupe.finish(call_id, succeeded=False)
+                # 503 damit Vapi den Webhook erneut zustellt
+                return jsonify({"error": f"Could not queue call: {e}"}), 503
+            webhook_dedupe.handoff(call_id)
+            job_worker.notify()
         
     return jsonify({"status": "received"})
 
-def process_completed_call(call_id: str):
-    """Verarbeitet abgeschlossenen Anruf"""
+def process_claimed_call(call_id: str, final_attempt: bool = True) -> bool:
+    """Job-Handler: verarbeitet den Call und setzt bzw. gibt den Dedupe-Marker frei"""
+    succeeded = False
+    try:
+        succeeded = process_completed_call(call_id, final_attempt)
+    finally:
+        webhook_dedupe.finish(call_id, succeeded)
+    return succeeded
+
+def process_completed_call(call_id: str, final_attempt: bool = True) -> bool:
+    """Verarbeitet abgeschlossenen Anruf (False, wenn ein erneuter Versuch sinnvoll ist).
+
+    Slack-Fehlermeldungen nur beim letzten Versuch (``final_attempt``), damit
+    Retries der Job-Queue nicht jedes Mal benachrichtigen.
+    """
     try:
         call_details = vapi_client.get_call_details(call_id)
         transcript = call_details.get('transcript', '')
         recording_url = call_details.get('recording_url')
 
         if not transcript:
-            slack_notifier.send_error_notification(
-                "Kein Transkript verfuegbar", call_id
-            )
-            return
+            if final_attempt:
+                slack_notifier.send_error_notification(
+                    "Kein Transkript verfuegbar", call_id
+                )
+            return False
 
         evaluation = evaluator.evaluate_interview(transcript)
-        overall_score = evaluator.calculate_overall_score(
-            evaluation.get('einzelbewertungen', {})
-        )
+        if evaluation.get('error'):
+            # LLM/Parser-Fehler nicht als Bewertung speichern - die Job-Queue versucht es später erneut
+            print(f"[WARN] Bewertung für {call_id} fehlgeschlagen: {evaluation['error']}")
+            if final_attempt:
+                slack_notifier.send_error_notification(
+                    f"Bewertung fehlgeschlagen: {evaluation['error']}", call_id
+                )
+            return False
         recommendation = evaluation.get('gesamtbewertung', {}).get('empfehlung')
         next_steps = evaluation.get('naechste_schritte')
         transcript_url = build_transcript_url(call_id)
 
-        db_session = db_manager.get_session()
-        try:
+        candidate_phone = None
+        event_data = None
+        with db_manager.write_session() as db_session:
             session = db_session.query(InterviewSession).filter_by(
                 vapi_call_id=call_id
             ).first()
 
             if session:
+                before = analytics_contribution(session)
                 session.status = "completed"
                 session.transcript = transcript
-                session.evaluation_score = overall_score
+                # Gewichtung hängt von der Position der Session ab
+                session.evaluation_score = evaluator.calculate_overall_score(
+                    evaluation.get('einzelbewertungen', {}), session.position
+                )
                 session.set_evaluation_data(evaluation)
                 session.recommendation = recommendation
                 session.next_steps = next_steps
                 session.recording_url = recording_url
                 session.completed_at = datetime.utcnow()
-                db_session.commit()
+                # Kennzahlen in derselben Transaktion fortschreiben
+                apply_analytics_delta(db_session, before, analytics_contribution(session))
+                candidate_phone = session.candidate_phone
+                event_data = serialize_interview(session)
 
-                slack_notifier.send_interview_result(
-                    evaluation=evaluation,
-                    candidate_phone=session.candidate_phone,
-                    call_id=call_id,
-                    transcript_url=transcript_url,
-                )
+        # Transkript wurde ggf. überschrieben (Neuverarbeitung)
+        transcript_cache.invalidate(call_id)
+        if event_data:
+            event_bus.publish("interview.updated", event_data)
 
-        finally:
-            db_session.close()
+        # Slack erst nach dem Commit, damit der Schreib-Lock nicht auf Slack wartet
+        if candidate_phone:
+            slack_notifier.send_interview_result(
+                evaluation=evaluation,
+                candidate_phone=candidate_phone,
+                call_id=call_id,
+                transcript_url=transcript_url,
+            )
+        return True
 
     except Exception as e:
-        slack_notifier.send_error_notification(
-            f"Processing failed: {str(e)}", call_id
-        )
+        print(f"[ERROR] Verarbeitung von {call_id} fehlgeschlagen: {e}")
+        if final_attempt:
+            slack_notifier.send_error_notification(
+                f"Processing failed: {str(e)}", call_id
+            )
+        return False
 
 
 @app.route('/interviews/<call_id>/transcript', methods=['GET'])
 def get_interview_transcript(call_id):
+    """Transkript als JSON (Standard) oder gestreamt per ?format=text|ndjson, mit ETag"""
+    fmt = request.args.get('format', 'json')
+    if fmt not in TRANSCRIPT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(TRANSCRIPT_FORMATS)}"}), 400
+
+    # Wiederholte Aufrufe (Slack-Links) kommen aus dem LRU; geprüft wird nur updated_at
     db_session = db_manager.get_session()
     try:
-        session = db_session.query(InterviewSession).filter_by(
-            vapi_call_id=call_id
-        ).first()
-        if not session:
-            return jsonify({'error': 'Interview not found'}), 404
-        if not session.transcript:
-            return jsonify({'error': 'Transcript not available'}), 404
-        return jsonify({
-            'call_id': session.vapi_call_id,
-            'candidate_phone': session.candidate_phone,
-            'transcript': session.transcript,
-            'recording_url': session.recording_url,
-            'completed_at': session.completed_at.isoformat() if session.completed_at else None
-        })
+        version = row_version(db_session.execute(transcript_version_query(call_id)).scalar())
+        entry = transcript_cache.get(call_id, version)
+        row = db_session.execute(transcript_query(call_id)).first() if entry is None else None
     finally:
         db_session.close()
+    if entry is None:
+        if not row:
+            return jsonify({'error': 'Interview not found'}), 404
+        if not row.transcript:
+            return jsonify({'error': 'Transcript not available'}), 404
+        entry = transcript_entry(row)
+        if row.status == 'completed':
+            transcript_cache.put(call_id, entry)
+
+    headers = {'ETag': entry['etag'], 'Cache-Control': 'private, no-cache'}
+    if etag_matches(request.headers.get('If-None-Match'), entry['etag']):
+        return Response(status=304, headers=headers)
+    if fmt == 'json':
+        response = jsonify(json_document(entry))
+        response.headers.update(headers)
+        return response
+    return Response(iter_transcript(entry, fmt), mimetype=TRANSCRIPT_FORMATS[fmt], headers=headers)
+
+@app.route('/events', methods=['GET'])
+def interview_events():
+    """Server-Sent Events mit Session-Änderungen für das Dashboard"""
+    subscription = event_bus.subscribe(request.headers.get('Last-Event-ID'))
+    if subscription is None:
+        return jsonify({"error": "Too many event streams"}), 503
+
+    def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                event = subscription.get(timeout=event_bus.keepalive_seconds)
+                # Keepalive-Kommentar hält Proxies offen und erkennt geschlossene Verbindungen
+                yield format_sse(event) if event else ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/demo/complete-interview', methods=['POST'])
 def demo_complete_interview():
@@ -203,33 +325,70 @@ def demo_complete_interview():
     if not call_id:
         return jsonify({"error": "call_id is required"}), 400
     
-    # Background processing
-    thread = threading.Thread(target=process_completed_call, args=(call_id,))
-    thread.start()
+    # Manueller Trigger: eigener Job ohne Dedupe-Key
+    job_queue.enqueue(JOB_PROCESS_CALL, {"call_id": call_id})
+    job_worker.notify()
     
     return jsonify({"message": f"Interview {call_id} wird verarbeitet"})
 
 @app.route('/interviews', methods=['GET'])
 def get_interviews():
-    """Liste aller Interviews"""
+    """Liste der Interviews (Keyset-Pagination, nächste Seite im X-Next-Cursor Header)"""
     db_session = db_manager.get_session()
     try:
-        sessions = db_session.query(InterviewSession).all()
-        return jsonify([
-            {
-                "id": s.id,
-                "candidate_phone": s.candidate_phone,
-                "position": s.position,
-                "status": s.status,
-                "score": s.evaluation_score,
-                "created_at": s.created_at.isoformat() if s.created_at else None,
-                "completed_at": s.completed_at.isoformat() if s.completed_at else None
-            }
-            for s in sessions
-        ])
+        items, next_cursor = list_interviews(
+            db_session,
+            limit=request.args.get('limit'),
+            after_id=request.args.get('after_id'),
+            before_created_at=request.args.get('before_created_at'),
+            before_id=request.args.get('before_id'),
+            status=request.args.get('status'),
+            position=request.args.get('position'),
+            recommendation=request.args.get('recommendation'),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     finally:
         db_session.close()
 
+    response = jsonify(items)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+@app.route('/interviews/changes', methods=['GET'])
+def get_interview_changes():
+    """Delta-Sync: neue/geänderte Interviews seit dem Cursor (updated_after + after_id)"""
+    db_session = db_manager.get_session()
+    try:
+        page = list_changes(
+            db_session,
+            updated_after=request.args.get('updated_after'),
+            after_id=request.args.get('after_id'),
+            limit=request.args.get('limit'),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        db_session.close()
+    return jsonify(page)
+
+@app.route('/analytics', methods=['GET'])
+def get_analytics():
+    """Score-Verteilung und Einladungs-/Absagequoten pro Position und Tag (?position=&since=&until=)"""
+    try:
+        query = build_analytics_query(
+            request.args.get('position'), request.args.get('since'), request.args.get('until')
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    db_session = db_manager.get_session()
+    try:
+        rows = db_session.execute(query).fetchall()
+    finally:
+        db_session.close()
+    return jsonify(summarize_analytics(rows))
+
 @app.route('/status', methods=['GET'])
 def get_system_status():
     """System-Status und Konfiguration"""
@@ -237,7 +396,21 @@ def get_system_status():
         "status": "healthy",
         "mode": "demo" if is_demo_mode() else "production",
         "database": "SQLite",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "processing": processing_pool.stats(),
+        "jobs": job_worker.stats(),
+        "http": get_shared_transport().stats(),
+        "evaluation_cache": evaluation_cache.stats(),
+        "preprocessing": preprocessing_evaluator.stats(),
+        "map_reduce": map_reduce_evaluator.stats() if map_reduce_evaluator else None,
+        "metrics": metrics.snapshot(),
+        "scoring": scoring_engine.stats(),
+        "config": config_service.stats(),
+        "transcript_cache": transcript_cache.stats(),
+        "events": event_bus.stats(),
+        "change_feed": change_feed.stats(),
+        "webhook_dedupe": webhook_dedupe.stats(),
+        "slack_delivery": slack_notifier.delivery_stats()
     })
 
 @app.route('/health', methods=['GET'])
@@ -249,6 +422,12 @@ def index():
     """Web Interface"""
     return render_template('index.html')
 
+# Jobs im App-Prozess abarbeiten (JOB_WORKER_IN_PROCESS=false: nur scripts/job_worker.py);
+# erst hier starten, damit liegengebliebene Jobs alle Handler vorfinden
+if run_in_process():
+    job_worker.start()
+change_feed.start()
+
 if __name__ == "__main__":
     # Port aus ENV oder default 8000
     port = int(os.getenv("API_PORT", 8000))
@@ -262,6 +441,7 @@ if __name__ == "__main__":
     print(f"   POST /start-interview")
     print(f"   POST /webhook/vapi")
     print(f"   GET  /interviews")
+    print(f"   GET  /analytics")
     print(f"   GET  /status")
     if is_demo_mode():
         print(f"   POST /demo/complete-interview")
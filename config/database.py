@@ -1,14 +1,28 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Text, Date, DateTime, Float, Boolean, Index, UniqueConstraint, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
 from sqlalchemy.types import JSON
 from datetime import datetime
 import os
 
+from config.server import per_worker
+
 Base = declarative_base()
 
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
+    __table_args__ = (
+        # Dashboard-Liste (neueste zuerst) und Filter aus GET /interviews
+        Index("ix_interview_sessions_created_at", "created_at", "id"),
+        Index("ix_interview_sessions_status_created_at", "status", "created_at"),
+        Index("ix_interview_sessions_position_created_at", "position", "created_at"),
+        Index("ix_interview_sessions_recommendation_created_at", "recommendation", "created_at"),
+        # Kandidaten-Lookup
+        Index("ix_interview_sessions_candidate_phone", "candidate_phone"),
+        # Delta-Sync (GET /interviews/changes)
+        Index("ix_interview_sessions_updated_at", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     vapi_call_id = Column(String(255), unique=True, nullable=True)
@@ -37,6 +51,8 @@ class InterviewSession(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     call_started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
+    # Bei jedem ORM-/Core-Update gesetzt (Statuswechsel, Bewertung)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Notes and Follow-up
     hr_notes = Column(Text, nullable=True)
@@ -74,6 +90,102 @@ class SystemConfig(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
 
+class EvaluationCacheEntry(Base):
+    __tablename__ = "evaluation_cache"
+    __table_args__ = (
+        Index("ix_evaluation_cache_last_used_at", "last_used_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cache_key = Column(String(64), unique=True, nullable=False)  # sha256(Transkript + Prompt-Version + Modell)
+    model = Column(String(100), nullable=True)
+    prompt_version = Column(String(50), nullable=True)
+    evaluation_data = Column(Text, nullable=False)  # JSON als Text gespeichert
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+class InterviewAnalytics(Base):
+    """Vorberechnete Kennzahlen pro Abschlusstag, Position und Empfehlung.
+
+    Wird in derselben Transaktion wie die Session fortgeschrieben
+    (services/analytics.py); hist_k zählt Scores in [k, k+1), hist_9 inkl. 10.
+    """
+    __tablename__ = "interview_analytics"
+    __table_args__ = (
+        UniqueConstraint("day", "position", "recommendation", name="uq_interview_analytics_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    position = Column(String(100), nullable=False)
+    recommendation = Column(String(50), nullable=False)
+    interviews = Column(Integer, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sq_sum = Column(Float, nullable=False, default=0.0)
+    hist_0 = Column(Integer, nullable=False, default=0)
+    hist_1 = Column(Integer, nullable=False, default=0)
+    hist_2 = Column(Integer, nullable=False, default=0)
+    hist_3 = Column(Integer, nullable=False, default=0)
+    hist_4 = Column(Integer, nullable=False, default=0)
+    hist_5 = Column(Integer, nullable=False, default=0)
+    hist_6 = Column(Integer, nullable=False, default=0)
+    hist_7 = Column(Integer, nullable=False, default=0)
+    hist_8 = Column(Integer, nullable=False, default=0)
+    hist_9 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ProcessedCall(Base):
+    """Dedupe-Marker für call-ended Webhooks (ein Eintrag pro Vapi-Call).
+
+    ``processing`` solange ein Worker den Call bearbeitet, danach ``done``
+    bzw. ``failed`` (darf erneut zugestellt werden), siehe services/webhook_dedupe.py.
+    """
+    __tablename__ = "processed_calls"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    call_id = Column(String(255), unique=True, nullable=False)
+    status = Column(String(20), nullable=False, default="processing")
+    attempts = Column(Integer, nullable=False, default=1)
+    claimed_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+class ProcessingJob(Base):
+    """Dauerhafte Job-Queue für die Hintergrundverarbeitung (services/job_queue.py).
+
+    ``queued`` -> ``running`` (Lease bis ``locked_until``) -> ``done``; bei
+    Fehlern zurück nach ``queued`` mit späterem ``available_at``, nach
+    ``max_attempts`` Versuchen ``dead``.
+    """
+    __tablename__ = "processing_jobs"
+    __table_args__ = (
+        # Claim: fällige Jobs bzw. abgelaufene Leases
+        Index("ix_processing_jobs_status_available_at", "status", "available_at"),
+        Index("ix_processing_jobs_status_locked_until", "status", "locked_until"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON als Text gespeichert
+    dedupe_key = Column(String(255), unique=True, nullable=True)
+    status = Column(String(20), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    lease_token = Column(String(32), nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+# Startwerte für Spalten, die ensure_columns() nachträglich anlegt
+COLUMN_BACKFILLS = {
+    ("interview_sessions", "updated_at"): "COALESCE(completed_at, created_at)",
+}
+
 class DatabaseManager:
     def __init__(self):
         # PyMySQL-Connection (einfacher und zuverlässiger)
@@ -83,11 +195,66 @@ class DatabaseManager:
         else:
             db_url = f"mysql+pymysql://{os.getenv('DB_USER')}@{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
         
-        self.engine = create_engine(db_url, echo=False)
+        # max_connections gilt für alle Server-Prozesse zusammen: Budget pro Worker aufteilen
+        self.engine = create_engine(
+            db_url,
+            echo=False,
+            pool_size=per_worker('DB_POOL_SIZE', 10),
+            max_overflow=per_worker('DB_MAX_OVERFLOW', 10),
+        )
         self.SessionLocal = sessionmaker(bind=self.engine)
         
     def create_tables(self):
         Base.metadata.create_all(self.engine)
+        self.ensure_columns()
+        self.ensure_indexes()
+
+    def ensure_columns(self):
+        """Ergänzt neu deklarierte Spalten auf bestehenden Tabellen (nullable, per ALTER TABLE)"""
+        inspector = inspect(self.engine)
+        added = []
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                if not inspector.has_table(table.name):
+                    continue
+                existing = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+                    if backfill:
+                        conn.execute(text(f"UPDATE {table.name} SET {column.name} = {backfill}"))
+                    added.append(f"{table.name}.{column.name}")
+        return added
+
+    def ensure_indexes(self):
+        """Legt fehlende Indizes auf bestehenden Tabellen an (ohne Rebuild)"""
+        inspector = inspect(self.engine)
+        created = []
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(self.engine)
+                    created.append(index.name)
+        return created
         
     def get_session(self):
-        return self.SessionLocal()
\ No newline at end of file
+        return self.SessionLocal()
+
+    @contextmanager
+    def write_session(self):
+        """Session für Schreibzugriffe: Commit am Ende, Rollback bei Fehlern"""
+        session = self.SessionLocal()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
\ No newline at end of file
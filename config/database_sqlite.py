@@ -1,14 +1,73 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, Boolean
+from sqlalchemy import create_engine, event, Column, Integer, String, Text, Date, DateTime, Float, Boolean, Index, UniqueConstraint, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import deferred, sessionmaker
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
+from typing import Dict, Optional
 import os
 import json
+import asyncio
+import threading
+import zlib
+
+from config.server import per_worker
 
 Base = declarative_base()
 
+# Format-Marker vor dem zlib-Stream; Zeilen ohne Marker (Alt-Daten) werden unverändert gelesen
+COMPRESSED_MARKER = b"\x00zlib1:"
+# Kurze Werte lohnen die Kompression nicht
+COMPRESSION_MIN_BYTES = 256
+
+def compress_text(value: Optional[str]):
+    """str -> BLOB mit Marker (oder unverändert, wenn zu kurz)"""
+    if value is None:
+        return None
+    raw = value.encode("utf-8")
+    if len(raw) < COMPRESSION_MIN_BYTES:
+        return value
+    return COMPRESSED_MARKER + zlib.compress(raw, 6)
+
+def decompress_text(value) -> Optional[str]:
+    """Liest komprimierte und unkomprimierte (Alt-)Werte"""
+    if value is None or isinstance(value, str):
+        return value
+    value = bytes(value)
+    if value.startswith(COMPRESSED_MARKER):
+        value = zlib.decompress(value[len(COMPRESSED_MARKER):])
+    return value.decode("utf-8")
+
+class CompressedText(TypeDecorator):
+    """Text-Spalte, die große Werte zlib-komprimiert als BLOB ablegt.
+
+    SQLite speichert den BLOB trotz TEXT-Deklaration unverändert, daher ist
+    keine Schema-Migration nötig und bestehende Zeilen bleiben lesbar.
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
+    __table_args__ = (
+        # Dashboard-Liste (neueste zuerst) und Filter aus GET /interviews
+        Index("ix_interview_sessions_created_at", "created_at", "id"),
+        Index("ix_interview_sessions_status_created_at", "status", "created_at"),
+        Index("ix_interview_sessions_position_created_at", "position", "created_at"),
+        Index("ix_interview_sessions_recommendation_created_at", "recommendation", "created_at"),
+        # Kandidaten-Lookup
+        Index("ix_interview_sessions_candidate_phone", "candidate_phone"),
+        # Delta-Sync (GET /interviews/changes)
+        Index("ix_interview_sessions_updated_at", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     vapi_call_id = Column(String(255), unique=True, nullable=True)
@@ -20,13 +79,13 @@ class InterviewSession(Base):
     status = Column(String(50), default="pending")  # pending, in_progress, completed, failed
     call_duration = Column(Integer, nullable=True)  # Sekunden
     
-    # Interview Data
-    transcript = Column(Text, nullable=True)
+    # Interview Data (komprimiert, erst beim Zugriff geladen und entpackt)
+    transcript = deferred(Column(CompressedText, nullable=True))
     recording_url = Column(String(500), nullable=True)
     
     # Evaluation Results  
     evaluation_score = Column(Float, nullable=True)
-    evaluation_data = Column(Text, nullable=True)  # JSON als Text gespeichert
+    evaluation_data = deferred(Column(CompressedText, nullable=True))  # JSON, komprimiert
     recommendation = Column(String(50), nullable=True)  # EINLADEN, ABLEHNEN, UNENTSCHIEDEN
     
     # HR Processing
@@ -37,6 +96,8 @@ class InterviewSession(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     call_started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
+    # Bei jedem ORM-/Core-Update gesetzt (Statuswechsel, Bewertung)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Notes and Follow-up
     hr_notes = Column(Text, nullable=True)
@@ -44,7 +105,7 @@ class InterviewSession(Base):
     
     def set_evaluation_data(self, data):
         """Helper zum Setzen von JSON-Daten"""
-        self.evaluation_data = json.dumps(data)
+        self.evaluation_data = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
     
     def get_evaluation_data(self):
         """Helper zum Abrufen von JSON-Daten"""
@@ -84,18 +145,279 @@ class SystemConfig(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow)
 
+class EvaluationCacheEntry(Base):
+    __tablename__ = "evaluation_cache"
+    __table_args__ = (
+        Index("ix_evaluation_cache_last_used_at", "last_used_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cache_key = Column(String(64), unique=True, nullable=False)  # sha256(Transkript + Prompt-Version + Modell)
+    model = Column(String(100), nullable=True)
+    prompt_version = Column(String(50), nullable=True)
+    evaluation_data = Column(Text, nullable=False)  # JSON als Text gespeichert
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+class InterviewAnalytics(Base):
+    """Vorberechnete Kennzahlen pro Abschlusstag, Position und Empfehlung.
+
+    Wird in derselben Transaktion wie die Session fortgeschrieben
+    (services/analytics.py); hist_k zählt Scores in [k, k+1), hist_9 inkl. 10.
+    """
+    __tablename__ = "interview_analytics"
+    __table_args__ = (
+        UniqueConstraint("day", "position", "recommendation", name="uq_interview_analytics_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    position = Column(String(100), nullable=False)
+    recommendation = Column(String(50), nullable=False)
+    interviews = Column(Integer, nullable=False, default=0)
+    score_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sq_sum = Column(Float, nullable=False, default=0.0)
+    hist_0 = Column(Integer, nullable=False, default=0)
+    hist_1 = Column(Integer, nullable=False, default=0)
+    hist_2 = Column(Integer, nullable=False, default=0)
+    hist_3 = Column(Integer, nullable=False, default=0)
+    hist_4 = Column(Integer, nullable=False, default=0)
+    hist_5 = Column(Integer, nullable=False, default=0)
+    hist_6 = Column(Integer, nullable=False, default=0)
+    hist_7 = Column(Integer, nullable=False, default=0)
+    hist_8 = Column(Integer, nullable=False, default=0)
+    hist_9 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ProcessedCall(Base):
+    """Dedupe-Marker für call-ended Webhooks (ein Eintrag pro Vapi-Call).
+
+    ``processing`` solange ein Worker den Call bearbeitet, danach ``done``
+    bzw. ``failed`` (darf erneut zugestellt werden), siehe services/webhook_dedupe.py.
+    """
+    __tablename__ = "processed_calls"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    call_id = Column(String(255), unique=True, nullable=False)
+    status = Column(String(20), nullable=False, default="processing")
+    attempts = Column(Integer, nullable=False, default=1)
+    claimed_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+class ProcessingJob(Base):
+    """Dauerhafte Job-Queue für die Hintergrundverarbeitung (services/job_queue.py).
+
+    ``queued`` -> ``running`` (Lease bis ``locked_until``) -> ``done``; bei
+    Fehlern zurück nach ``queued`` mit späterem ``available_at``, nach
+    ``max_attempts`` Versuchen ``dead``.
+    """
+    __tablename__ = "processing_jobs"
+    __table_args__ = (
+        # Claim: fällige Jobs bzw. abgelaufene Leases
+        Index("ix_processing_jobs_status_available_at", "status", "available_at"),
+        Index("ix_processing_jobs_status_locked_until", "status", "locked_until"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON als Text gespeichert
+    dedupe_key = Column(String(255), unique=True, nullable=True)
+    status = Column(String(20), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    lease_token = Column(String(32), nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+# Startwerte für Spalten, die ensure_columns() nachträglich anlegt
+COLUMN_BACKFILLS = {
+    ("interview_sessions", "updated_at"): "COALESCE(completed_at, created_at)",
+}
+
+def sqlite_db_path() -> str:
+    """Pfad der SQLite-Datei (``SQLITE_DB_PATH`` oder data/interview_agent.db)"""
+    default_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'interview_agent.db')
+    return os.path.abspath(os.getenv('SQLITE_DB_PATH', default_path))
+
+def is_tuned_sqlite() -> bool:
+    """Opt-in für das Concurrency-Profil (WAL, Pragmas, Connection-Pool)"""
+    return os.getenv('SQLITE_TUNED', '0').lower() in {'1', 'true', 'yes'}
+
+def _apply_tuned_pragmas(dbapi_connection, connection_record):
+    """Wird bei jedem neuen SQLite-Connect ausgeführt"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))}")
+        cursor.execute(f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))}")
+        # Negativer Wert = Größe in KiB statt in Pages
+        cursor.execute(f"PRAGMA cache_size=-{int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+# Ein Schreib-Lock pro Datenbankdatei und Prozess, geteilt von DatabaseManager und
+# AsyncDatabaseManager - sonst schreiben Sync- und Async-Pfad der FastAPI-App parallel
+_write_locks: Dict[str, threading.Lock] = {}
+_write_locks_guard = threading.Lock()
+
+def shared_write_lock(database: Optional[str]) -> threading.Lock:
+    key = os.path.abspath(database) if database and database != ":memory:" else (database or "")
+    with _write_locks_guard:
+        return _write_locks.setdefault(key, threading.Lock())
+
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, db_url: Optional[str] = None, tuned: Optional[bool] = None):
         # SQLite für Demo/Test (einfach und problemlos)
-        db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'interview_agent.db')
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        if db_url is None:
+            db_path = sqlite_db_path()
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            db_url = f"sqlite:///{db_path}"
         
-        db_url = f"sqlite:///{db_path}"
-        self.engine = create_engine(db_url, echo=False)
+        self.tuned = is_tuned_sqlite() if tuned is None else tuned
+        if self.tuned:
+            # WAL: Leser blockieren nie auf Schreiber; Connections bleiben im Pool warm
+            self.engine = create_engine(
+                db_url,
+                echo=False,
+                poolclass=QueuePool,
+                # Gesamtbudget auf die Server-Prozesse verteilt (WEB_CONCURRENCY)
+                pool_size=per_worker('SQLITE_POOL_SIZE', 8, minimum=2),
+                max_overflow=per_worker('SQLITE_POOL_OVERFLOW', 8, minimum=2),
+                connect_args={
+                    "check_same_thread": False,
+                    "timeout": int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')) / 1000,
+                },
+            )
+            event.listen(self.engine, "connect", _apply_tuned_pragmas)
+        else:
+            self.engine = create_engine(db_url, echo=False)
         self.SessionLocal = sessionmaker(bind=self.engine)
+        # SQLite erlaubt nur einen Schreiber - Commits laufen seriell statt in "database is locked"
+        self._write_lock = shared_write_lock(self.engine.url.database)
         
     def create_tables(self):
         Base.metadata.create_all(self.engine)
+        self.ensure_columns()
+        self.ensure_indexes()
+
+    def ensure_columns(self):
+        """Ergänzt neu deklarierte Spalten auf bestehenden Tabellen (nullable, per ALTER TABLE)"""
+        inspector = inspect(self.engine)
+        added = []
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                if not inspector.has_table(table.name):
+                    continue
+                existing = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+                    if backfill:
+                        conn.execute(text(f"UPDATE {table.name} SET {column.name} = {backfill}"))
+                    added.append(f"{table.name}.{column.name}")
+        return added
+
+    def ensure_indexes(self):
+        """Legt fehlende Indizes auf bestehenden Tabellen an (ohne Rebuild)"""
+        inspector = inspect(self.engine)
+        created = []
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(self.engine)
+                    created.append(index.name)
+        return created
         
     def get_session(self):
-        return self.SessionLocal()
\ No newline at end of file
+        return self.SessionLocal()
+
+    @contextmanager
+    def write_session(self):
+        """Session für Schreibzugriffe: serialisiert, Commit am Ende, Rollback bei Fehlern"""
+        with self._write_lock:
+            session = self.SessionLocal()
+            try:
+                yield session
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+class AsyncDatabaseManager:
+    """Async-Zugriff (aiosqlite) auf dieselbe Datenbank für die FastAPI-App"""
+
+    def __init__(self, db_url: Optional[str] = None, tuned: Optional[bool] = None):
+        if db_url is None:
+            db_path = sqlite_db_path()
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            db_url = f"sqlite+aiosqlite:///{db_path}"
+        
+        self.tuned = is_tuned_sqlite() if tuned is None else tuned
+        connect_args = {}
+        if self.tuned:
+            connect_args["timeout"] = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')) / 1000
+        self.engine = create_async_engine(db_url, echo=False, connect_args=connect_args)
+        if self.tuned:
+            event.listen(self.engine.sync_engine, "connect", _apply_tuned_pragmas)
+        self.SessionLocal = sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        # Derselbe Lock wie beim DatabaseManager auf diese Datei (Sync-Schreiber laufen per to_thread)
+        self._write_lock = shared_write_lock(self.engine.url.database)
+        # Async-Schreiber stellen sich zuerst hier an, damit höchstens ein Executor-Thread auf den Lock wartet
+        self._write_gate: Optional[asyncio.Lock] = None
+
+    def get_session(self) -> AsyncSession:
+        return self.SessionLocal()
+
+    @asynccontextmanager
+    async def write_session(self):
+        """Async-Session für Schreibzugriffe: serialisiert (auch mit den Sync-Schreibern), Commit am Ende, Rollback bei Fehlern"""
+        if self._write_gate is None:
+            self._write_gate = asyncio.Lock()
+        async with self._write_gate:
+            await self._acquire_write_lock()
+        try:
+            session = self.SessionLocal()
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
+        finally:
+            self._write_lock.release()
+
+    async def _acquire_write_lock(self):
+        """Wartet im Executor auf den Thread-Lock, ohne den Event-Loop zu blockieren"""
+        if self._write_lock.acquire(blocking=False):
+            return
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._write_lock.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # Der Thread bekommt den Lock trotzdem - dann sofort wieder freigeben
+            acquire.add_done_callback(
+                lambda done: self._write_lock.release() if not done.cancelled() and done.exception() is None else None
+            )
+            raise
+
+    async def dispose(self):
+        await self.engine.dispose()
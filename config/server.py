@@ -0,0 +1,74 @@
+"""
+Server-Modus - Worker-Anzahl, Ressourcen pro Worker und einmaliges Schema-Setup im Pre-Fork-Betrieb
+"""
+
+import math
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Optional
+
+# Setzt der gunicorn-Master nach dem Schema-Setup; die geforkten Worker erben die Variable
+SCHEMA_READY_ENV = "INTERVIEW_SCHEMA_READY"
+
+
+def worker_count() -> int:
+    """Anzahl Server-Prozesse (``WEB_CONCURRENCY`` wie bei gunicorn/uvicorn, Standard 1)"""
+    try:
+        return max(1, int(os.getenv('WEB_CONCURRENCY', '1')))
+    except ValueError:
+        return 1
+
+
+def per_worker(name: str, total: int, minimum: int = 1) -> int:
+    """Wert aus ``name`` (gilt pro Prozess) oder ``total`` gleichmäßig auf alle Worker verteilt.
+
+    So bleiben z.B. parallele LLM-Calls oder Datenbank-Connections insgesamt
+    gleich, egal mit wie vielen Workern der Server läuft.
+    """
+    value = os.getenv(name)
+    if value:
+        return int(value)
+    return max(minimum, math.ceil(total / worker_count()))
+
+
+def schema_ready() -> bool:
+    return os.getenv(SCHEMA_READY_ENV) == "1"
+
+
+def mark_schema_ready():
+    os.environ[SCHEMA_READY_ENV] = "1"
+
+
+@contextmanager
+def startup_lock(path: Optional[str] = None):
+    """Dateilock über alle Prozesse eines Hosts (ohne fcntl, z.B. Windows, ohne Lock)"""
+    path = path or os.getenv('STARTUP_LOCK_PATH', os.path.join(tempfile.gettempdir(), "interview_agent_startup.lock"))
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def prepare_database(db_manager) -> bool:
+    """Schema anlegen/ergänzen und Kennzahlen-Backfill, ohne dass Worker parallel DDL ausführen.
+
+    Hat der gunicorn-Master (gunicorn.conf.py) das bereits erledigt, passiert
+    nichts; sonst (z.B. ``uvicorn --workers``) laufen gleichzeitig startende
+    Worker über den Dateilock nacheinander durch - alle Schritte sind idempotent.
+    """
+    if schema_ready():
+        return False
+    from services.analytics import ensure_analytics
+
+    with startup_lock():
+        db_manager.create_tables()
+        ensure_analytics(db_manager)
+    return True
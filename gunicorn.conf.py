@@ -0,0 +1,65 @@
+"""
+Gunicorn-Konfiguration für den Multi-Prozess-Betrieb (Pre-Fork)
+
+    gunicorn -c gunicorn.conf.py app_flask:app
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker main:app
+    WEB_CONCURRENCY=8 gunicorn -c gunicorn.conf.py app_flask:app
+
+- Der Master legt Schema und Kennzahlen einmal an, bevor er forkt; die
+  Worker überspringen das (config/server.py, INTERVIEW_SCHEMA_READY).
+- Die App wird erst im Worker importiert (kein preload_app): API-Clients,
+  HTTP-Pools, Datenbank-Connections, Worker-Pool und Job-Poller gehören
+  damit jeweils einem Prozess und werden nicht über den Fork geteilt.
+- WEB_CONCURRENCY (Standard: Anzahl Kerne) wird an die Worker vererbt; die
+  Pools verteilen ihr Gesamtbudget darauf (PROCESSING_WORKERS, HTTP_POOL_SIZE,
+  SQLITE_POOL_SIZE, DB_POOL_SIZE - explizit gesetzt gelten sie pro Worker).
+- Hintergrundjobs koordiniert die Datenbank-Queue (services/job_queue.py):
+  jeder Worker beansprucht nur freie Jobs, abgestürzte übernimmt ein anderer.
+- Dashboard-Events (/events): jeder Worker speist seine Streams über den
+  Change-Feed (services/change_feed.py) aus der Datenbank, sieht also auch
+  Änderungen anderer Worker und von scripts/job_worker.py.
+- Limit bei Flask (gthread): ein offener SSE-Stream belegt einen Thread für
+  seine gesamte Dauer. Pro Worker sind deshalb höchstens die Hälfte der
+  Threads als Streams zugelassen (EVENT_MAX_SUBSCRIBERS), weitere Dashboards
+  bekommen 503 und fragen /interviews/changes periodisch ab. Für viele
+  gleichzeitige Dashboards die FastAPI-App mit UvicornWorker betreiben -
+  dort kostet ein Stream keinen Thread.
+"""
+
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+workers = int(os.getenv("WEB_CONCURRENCY") or multiprocessing.cpu_count())
+os.environ["WEB_CONCURRENCY"] = str(workers)
+# Flask ist synchron: ein paar Threads pro Worker für langsame Clients (SSE, Polling)
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', '8000')}"
+preload_app = False
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Mehrere Prozesse schreiben in dieselbe SQLite-Datei: WAL und Busy-Timeout
+os.environ.setdefault("SQLITE_TUNED", "true")
+
+
+def on_starting(server):
+    """Einmaliges Schema-Setup im Master, bevor die Worker starten"""
+    from config.database_sqlite import DatabaseManager
+    from config.server import mark_schema_ready, prepare_database
+
+    # gthread: SSE-Streams dürfen nicht alle Threads belegen (siehe oben); asynchrone Worker brauchen das nicht
+    if server.cfg.worker_class_str == "gthread":
+        os.environ.setdefault("EVENT_MAX_SUBSCRIBERS", str(max(1, server.cfg.threads // 2)))
+
+    db_manager = DatabaseManager()
+    prepare_database(db_manager)
+    # Keine Connection des Masters in die geforkten Worker mitnehmen
+    db_manager.engine.dispose()
+    mark_schema_ready()
+    server.log.info("Schema bereit, starte %s Worker", workers)
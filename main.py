@@ -1,14 +1,41 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
+import asyncio
 import os
 from dotenv import load_dotenv
+from sqlalchemy import select
 
-from config.database_sqlite import DatabaseManager, InterviewSession
-from services.vapi_client import VapiClient
-from services.evaluation_service import InterviewEvaluator
-from services.slack_notifier import SlackNotifier
-from services.demo_service import DemoVapiClient, DemoSlackNotifier, DemoEvaluator, is_demo_mode
+from config.database_sqlite import AsyncDatabaseManager, DatabaseManager, InterviewSession
+from config.server import prepare_database
+from services.vapi_client import AsyncVapiClient
+from services.evaluation_service import AsyncInterviewEvaluator
+from services.slack_notifier import AsyncSlackNotifier
+from services.gemini_service import AsyncGeminiEvaluator
+from services.demo_service import AsyncDemoVapiClient, AsyncDemoSlackNotifier, AsyncDemoEvaluator, is_demo_mode
+from services.worker_pool import AsyncProcessingPool
+from services.job_queue import JOB_PROCESS_CALL, AsyncJobWorker, JobQueue, run_in_process
+from services.assistant_registry import AssistantRegistry
+from services.http_transport import get_shared_async_transport
+from services.interview_queries import alist_changes, alist_interviews, serialize_interview
+from services.change_feed import ChangeFeed
+from services.event_bus import EventBus, format_sse
+from services.metrics import metrics
+from services.webhook_dedupe import CLAIMED, WebhookDedupe
+from services.analytics import (
+    aapply_analytics_delta, analytics_contribution, build_analytics_query, summarize_analytics
+)
+from services.config_service import config_service
+from services.scoring import scoring_engine
+from services.evaluation_cache import AsyncCachedEvaluator, EvaluationCache
+from services.transcript_preprocessor import AsyncPreprocessingEvaluator
+from services.map_reduce_evaluator import AsyncMapReduceEvaluator, is_map_reduce_mode
+from services.transcript_utils import (
+    TRANSCRIPT_FORMATS, TranscriptCache, etag_matches, iter_transcript, json_document, row_version, transcript_entry,
+    transcript_query, transcript_version_query
+)
 
 load_dotenv()
 def build_transcript_url(call_id: str) -> str:
@@ -16,22 +43,56 @@ def build_transcript_url(call_id: str) -> str:
     if not base:
         port = os.getenv("API_PORT", "8000")
         base = f"http://localhost:{port}"
-    return f"{base.rstrip('/')}/interviews/{call_id}/transcript"
+    # Slack-Links öffnen die lesbare Textansicht
+    return f"{base.rstrip('/')}/interviews/{call_id}/transcript?format=text"
 
 app = FastAPI(title="AI Interview Agent", version="1.0.0")
+# Sync-Manager nur für Schema-Setup und seltene Zugriffe, Requests nutzen die Async-Sessions
 db_manager = DatabaseManager()
+async_db_manager = AsyncDatabaseManager()
+processing_pool = AsyncProcessingPool()
+# Hintergrundjobs liegen in processing_jobs und überstehen Neustarts; der Pool führt sie aus
+job_queue = JobQueue(db_manager)
+job_worker = AsyncJobWorker(job_queue, processing_pool, {
+    JOB_PROCESS_CALL: lambda job: process_claimed_call(job.payload["call_id"], job.final_attempt),
+})
 
-# Demo-Modus oder echte API-Clients je nach Konfiguration
-if is_demo_mode():
+# Demo-Modus, Gemini oder echte API-Clients je nach Konfiguration (alle async, blockieren den Event-Loop nicht)
+has_gemini = os.getenv('OPENAI_API_KEY', '').startswith('AIzaSy')
+if is_demo_mode() and not has_gemini:
     print("[INFO] Running in DEMO MODE - using simulated services")
-    vapi_client = DemoVapiClient()
-    evaluator = DemoEvaluator()
-    slack_notifier = DemoSlackNotifier()
+    vapi_client = AsyncDemoVapiClient()
+    evaluator = AsyncDemoEvaluator()
+    slack_notifier = AsyncDemoSlackNotifier()
+elif has_gemini:
+    print("[INFO] Running in GEMINI MODE - using Gemini AI for evaluation")
+    vapi_client = AsyncDemoVapiClient()  # VAPI bleibt Demo
+    evaluator = AsyncGeminiEvaluator()
+    slack_notifier = AsyncDemoSlackNotifier()  # Slack bleibt Demo
 else:
     print("[INFO] Running in PRODUCTION MODE - using real APIs")
-    vapi_client = VapiClient()
-    evaluator = InterviewEvaluator()
-    slack_notifier = SlackNotifier()
+    vapi_client = AsyncVapiClient()
+    evaluator = AsyncInterviewEvaluator()
+    slack_notifier = AsyncSlackNotifier()
+
+# system_config (Schwellen, Interviewdauer, Gewichte, Assistant-ID) über den gecachten Config-Service
+config_service.bind(db_manager)
+assistant_registry = AssistantRegistry(vapi_client, config_service)
+evaluation_cache = EvaluationCache(db_manager)
+transcript_cache = TranscriptCache()
+event_bus = EventBus()
+# Änderungen aus anderen Prozessen (Pre-Fork, scripts/job_worker.py) über die Datenbank nachliefern
+change_feed = ChangeFeed(db_manager, event_bus)
+# Vapi stellt call-ended ggf. mehrfach zu: jeder Call wird nur einmal bewertet
+webhook_dedupe = WebhookDedupe(db_manager)
+# Vorverarbeitung vor dem LLM, optional Map-Reduce über die Interview-Abschnitte,
+# Cache davor (Key enthält Token-Budget und Modus)
+preprocessing_evaluator = AsyncPreprocessingEvaluator(evaluator)
+evaluator = preprocessing_evaluator
+map_reduce_evaluator = None
+if is_map_reduce_mode():
+    map_reduce_evaluator = evaluator = AsyncMapReduceEvaluator(evaluator)
+evaluator = AsyncCachedEvaluator(evaluator, evaluation_cache)
 
 class StartInterviewRequest(BaseModel):
     candidate_phone: str
@@ -44,21 +105,34 @@ class WebhookPayload(BaseModel):
 @app.on_event("startup")
 async def startup():
     """Initialisiert Datenbank beim Start"""
-    db_manager.create_tables()
+    # Schema und Kennzahlen-Backfill; mit mehreren Workern nur einmal bzw. nacheinander (config/server.py)
+    prepare_database(db_manager)
+    processing_pool.start()
+    # Jobs im App-Prozess abarbeiten (JOB_WORKER_IN_PROCESS=false: nur scripts/job_worker.py)
+    if run_in_process():
+        job_worker.start()
+    change_feed.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await asyncio.to_thread(change_feed.stop)
+    # Laufende Jobs nicht abwarten: ihre Lease läuft ab und ein anderer Worker übernimmt
+    await job_worker.stop(wait=False)
+    await processing_pool.stop()
+    await async_db_manager.dispose()
 
 @app.post("/start-interview")
 async def start_interview(request: StartInterviewRequest):
     """Startet ein Interview mit einem Kandidaten"""
     try:
-        # Erstelle Assistant (oder verwende bestehenden)
-        assistant = vapi_client.create_assistant()
-        assistant_id = assistant.get('id')
+        # Verwende bestehenden Assistant (wird nur bei Konfigurationsänderung neu erstellt)
+        assistant_id = await assistant_registry.aget_assistant_id()
         
         if not assistant_id:
             raise HTTPException(status_code=500, detail="Failed to create assistant")
         
         # Starte Anruf
-        call_result = vapi_client.initiate_call(
+        call_result = await vapi_client.initiate_call(
             phone_number=request.candidate_phone,
             assistant_id=assistant_id
         )
@@ -68,17 +142,17 @@ async def start_interview(request: StartInterviewRequest):
             raise HTTPException(status_code=500, detail="Failed to initiate call")
         
         # Speichere Session in DB
-        db_session = db_manager.get_session()
-        try:
+        async with async_db_manager.write_session() as db_session:
             interview_session = InterviewSession(
                 vapi_call_id=call_id,
                 candidate_phone=request.candidate_phone,
+                position=request.position,
                 status="in_progress"
             )
             db_session.add(interview_session)
-            db_session.commit()
-        finally:
-            db_session.close()
+            await db_session.flush()
+            event_data = serialize_interview(interview_session)
+        event_bus.publish("interview.created", event_data)
         
         return {
             "success": True,
@@ -90,116 +164,228 @@ async def start_interview(request: StartInterviewRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/webhook/vapi")
-async def vapi_webhook(payload: WebhookPayload, background_tasks: BackgroundTasks):
+async def vapi_webhook(payload: WebhookPayload):
     """Webhook für Vapi Events"""
     
     if payload.type == "call-ended":
         call_id = payload.call.get('id')
-        background_tasks.add_task(process_completed_call, call_id)
+        if call_id:
+            state = await webhook_dedupe.aclaim(call_id)
+            if state != CLAIMED:
+                # Duplikat: läuft schon oder ist erledigt - sofort bestätigen
+                return {"status": "duplicate", "state": state}
+            try:
+                await job_queue.aenqueue(JOB_PROCESS_CALL, {"call_id": call_id}, dedupe_key=call_id)
+            except Exception as e:
+                await webhook_dedupe.afinish(call_id, succeeded=False)
+                # 503 damit Vapi den Webhook erneut zustellt
+                raise HTTPException(status_code=503, detail=f"Could not queue call: {e}")
+            webhook_dedupe.handoff(call_id)
+            job_worker.notify()
         
     return {"status": "received"}
 
-async def process_completed_call(call_id: str):
-    """Verarbeitet abgeschlossenen Anruf"""
+async def process_claimed_call(call_id: str, final_attempt: bool = True) -> bool:
+    """Job-Handler: verarbeitet den Call und setzt bzw. gibt den Dedupe-Marker frei"""
+    succeeded = False
+    try:
+        succeeded = await process_completed_call(call_id, final_attempt)
+    finally:
+        await webhook_dedupe.afinish(call_id, succeeded)
+    return succeeded
+
+async def process_completed_call(call_id: str, final_attempt: bool = True) -> bool:
+    """Verarbeitet abgeschlossenen Anruf (Worker-Task im Event-Loop, alle I/O-Calls async).
+
+    Gibt False zurück, wenn ein erneuter Versuch sinnvoll ist; Slack-Fehlermeldungen
+    nur beim letzten Versuch (``final_attempt``).
+    """
     try:
-        call_details = vapi_client.get_call_details(call_id)
+        call_details = await vapi_client.get_call_details(call_id)
         transcript = call_details.get('transcript', '')
         recording_url = call_details.get('recording_url')
 
         if not transcript:
-            slack_notifier.send_error_notification(
-                "Kein Transkript verfuegbar", call_id
-            )
-            return
+            if final_attempt:
+                await slack_notifier.send_error_notification(
+                    "Kein Transkript verfuegbar", call_id
+                )
+            return False
 
-        evaluation = evaluator.evaluate_interview(transcript)
-        overall_score = evaluator.calculate_overall_score(
-            evaluation.get('einzelbewertungen', {})
-        )
+        evaluation = await evaluator.evaluate_interview(transcript)
+        if evaluation.get('error'):
+            # LLM/Parser-Fehler nicht als Bewertung speichern - die Job-Queue versucht es später erneut
+            print(f"[WARN] Bewertung für {call_id} fehlgeschlagen: {evaluation['error']}")
+            if final_attempt:
+                await slack_notifier.send_error_notification(
+                    f"Bewertung fehlgeschlagen: {evaluation['error']}", call_id
+                )
+            return False
+        # system_config ggf. im Thread nachladen; Score und Slack-Channel lesen dann nur den Cache
+        await config_service.arefresh()
         recommendation = evaluation.get('gesamtbewertung', {}).get('empfehlung')
         next_steps = evaluation.get('naechste_schritte')
         transcript_url = build_transcript_url(call_id)
 
-        db_session = db_manager.get_session()
-        try:
-            session = db_session.query(InterviewSession).filter_by(
-                vapi_call_id=call_id
-            ).first()
+        candidate_phone = None
+        event_data = None
+        async with async_db_manager.write_session() as db_session:
+            result = await db_session.execute(
+                select(InterviewSession).filter_by(vapi_call_id=call_id)
+            )
+            session = result.scalars().first()
 
             if session:
+                before = analytics_contribution(session)
                 session.status = "completed"
                 session.transcript = transcript
-                session.evaluation_score = overall_score
+                # Gewichtung hängt von der Position der Session ab
+                session.evaluation_score = evaluator.calculate_overall_score(
+                    evaluation.get('einzelbewertungen', {}), session.position
+                )
                 session.set_evaluation_data(evaluation)
                 session.recommendation = recommendation
                 session.next_steps = next_steps
                 session.recording_url = recording_url
                 session.completed_at = datetime.utcnow()
-                db_session.commit()
+                # Kennzahlen in derselben Transaktion fortschreiben
+                await aapply_analytics_delta(db_session, before, analytics_contribution(session))
+                candidate_phone = session.candidate_phone
+                event_data = serialize_interview(session)
 
-                slack_notifier.send_interview_result(
-                    evaluation=evaluation,
-                    candidate_phone=session.candidate_phone,
-                    call_id=call_id,
-                    transcript_url=transcript_url,
-                )
+        # Transkript wurde ggf. überschrieben (Neuverarbeitung)
+        transcript_cache.invalidate(call_id)
+        if event_data:
+            event_bus.publish("interview.updated", event_data)
 
-        finally:
-            db_session.close()
+        # Slack erst nach dem Commit, damit der Schreib-Lock nicht auf Slack wartet
+        if candidate_phone:
+            await slack_notifier.send_interview_result(
+                evaluation=evaluation,
+                candidate_phone=candidate_phone,
+                call_id=call_id,
+                transcript_url=transcript_url,
+            )
+        return True
 
     except Exception as e:
-        slack_notifier.send_error_notification(
-            f"Processing failed: {str(e)}", call_id
-        )
+        print(f"[ERROR] Verarbeitung von {call_id} fehlgeschlagen: {e}")
+        if final_attempt:
+            await slack_notifier.send_error_notification(
+                f"Processing failed: {str(e)}", call_id
+            )
+        return False
 
 @app.get("/interviews")
-async def get_interviews():
-    """Liste aller Interviews"""
-    db_session = db_manager.get_session()
+async def get_interviews(
+    response: Response,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    before_created_at: Optional[str] = None,
+    before_id: Optional[int] = None,
+    status: Optional[str] = None,
+    position: Optional[str] = None,
+    recommendation: Optional[str] = None,
+):
+    """Liste der Interviews (Keyset-Pagination, nächste Seite im X-Next-Cursor Header)"""
+    async with async_db_manager.get_session() as db_session:
+        try:
+            items, next_cursor = await alist_interviews(
+                db_session,
+                limit=limit,
+                after_id=after_id,
+                before_created_at=before_created_at,
+                before_id=before_id,
+                status=status,
+                position=position,
+                recommendation=recommendation,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+@app.get("/interviews/changes")
+async def get_interview_changes(
+    updated_after: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    """Delta-Sync: neue/geänderte Interviews seit dem Cursor (updated_after + after_id)"""
+    async with async_db_manager.get_session() as db_session:
+        try:
+            return await alist_changes(db_session, updated_after=updated_after, after_id=after_id, limit=limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/analytics")
+async def get_analytics(position: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None):
+    """Score-Verteilung und Einladungs-/Absagequoten pro Position und Tag"""
     try:
-        sessions = db_session.query(InterviewSession).all()
-        return [
-            {
-                "id": s.id,
-                "candidate_phone": s.candidate_phone,
-                "status": s.status,
-                "score": s.evaluation_score,
-                "created_at": s.created_at,
-                "completed_at": s.completed_at
-            }
-            for s in sessions
-        ]
-    finally:
-        db_session.close()
+        query = build_analytics_query(position, since, until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    async with async_db_manager.get_session() as db_session:
+        rows = (await db_session.execute(query)).fetchall()
+    return summarize_analytics(rows)
 
 @app.get("/interviews/{call_id}/transcript")
-async def get_interview_transcript(call_id: str):
-    db_session = db_manager.get_session()
-    try:
-        session = db_session.query(InterviewSession).filter_by(
-            vapi_call_id=call_id
-        ).first()
-        if not session:
+async def get_interview_transcript(call_id: str, request: Request, format: str = "json"):
+    """Transkript als JSON (Standard) oder gestreamt per ?format=text|ndjson, mit ETag"""
+    if format not in TRANSCRIPT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(TRANSCRIPT_FORMATS)}")
+
+    # Wiederholte Aufrufe (Slack-Links) kommen aus dem LRU; geprüft wird nur updated_at
+    async with async_db_manager.get_session() as db_session:
+        version = row_version((await db_session.execute(transcript_version_query(call_id))).scalar())
+        entry = transcript_cache.get(call_id, version)
+        row = (await db_session.execute(transcript_query(call_id))).first() if entry is None else None
+    if entry is None:
+        if not row:
             raise HTTPException(status_code=404, detail="Interview not found")
-        if not session.transcript:
+        if not row.transcript:
             raise HTTPException(status_code=404, detail="Transcript not available")
-        return {
-            "call_id": session.vapi_call_id,
-            "candidate_phone": session.candidate_phone,
-            "transcript": session.transcript,
-            "recording_url": session.recording_url,
-            "completed_at": session.completed_at,
-        }
-    finally:
-        db_session.close()
+        entry = transcript_entry(row)
+        if row.status == "completed":
+            transcript_cache.put(call_id, entry)
+
+    headers = {"ETag": entry["etag"], "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    if format == "json":
+        return JSONResponse(json_document(entry), headers=headers)
+    return StreamingResponse(iter_transcript(entry, format), media_type=TRANSCRIPT_FORMATS[format], headers=headers)
+
+@app.get("/events")
+async def interview_events(request: Request):
+    """Server-Sent Events mit Session-Änderungen für das Dashboard"""
+    subscription = event_bus.subscribe_async(request.headers.get("last-event-id"))
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many event streams")
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=event_bus.keepalive_seconds)
+                yield format_sse(event) if event else ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.post("/demo/complete-interview")
-async def demo_complete_interview(call_id: str, background_tasks: BackgroundTasks):
+async def demo_complete_interview(call_id: str):
     """Demo-Endpoint um ein Interview manuell als abgeschlossen zu markieren"""
     if not is_demo_mode():
         raise HTTPException(status_code=400, detail="Only available in demo mode")
     
-    background_tasks.add_task(process_completed_call, call_id)
+    # Manueller Trigger: eigener Job ohne Dedupe-Key
+    await job_queue.aenqueue(JOB_PROCESS_CALL, {"call_id": call_id})
+    job_worker.notify()
     return {"message": f"Interview {call_id} wird verarbeitet"}
 
 @app.get("/status")
@@ -209,7 +395,21 @@ async def get_system_status():
         "status": "healthy",
         "mode": "demo" if is_demo_mode() else "production",
         "database": "SQLite" if is_demo_mode() else "MySQL",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "processing": processing_pool.stats(),
+        "jobs": job_worker.stats(),
+        "http": get_shared_async_transport().stats(),
+        "evaluation_cache": evaluation_cache.stats(),
+        "preprocessing": preprocessing_evaluator.stats(),
+        "map_reduce": map_reduce_evaluator.stats() if map_reduce_evaluator else None,
+        "metrics": metrics.snapshot(),
+        "scoring": scoring_engine.stats(),
+        "config": config_service.stats(),
+        "transcript_cache": transcript_cache.stats(),
+        "events": event_bus.stats(),
+        "change_feed": change_feed.stats(),
+        "webhook_dedupe": webhook_dedupe.stats(),
+        "slack_delivery": slack_notifier.delivery_stats()
     }
 
 @app.get("/health")
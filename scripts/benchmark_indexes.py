@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Index Benchmark - Misst die Interview-Abfragen vor und nach ensure_indexes()
+
+Legt eine temporäre SQLite-Datenbank mit N Sessions an (Standard: 100.000),
+entfernt die deklarierten Indizes, misst die API-Abfragen, legt die Indizes
+per ensure_indexes() nachträglich an und misst erneut.
+
+    python scripts/benchmark_indexes.py --rows 100000 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from config.database_sqlite import DatabaseManager, InterviewSession
+from services.interview_queries import list_interviews
+
+POSITIONS = ["Software Developer", "Data Engineer", "Product Manager", "DevOps Engineer", "Designer"]
+RECOMMENDATIONS = ["EINLADEN", "ABLEHNEN", "UNENTSCHIEDEN"]
+STATUSES = ["completed"] * 8 + ["in_progress", "failed"]
+
+
+def populate(db_manager: DatabaseManager, rows: int, batch_size: int = 5000):
+    """Schreibt synthetische Sessions (ohne Transkript) in Batches"""
+    start = datetime.utcnow() - timedelta(days=365)
+    with db_manager.engine.begin() as conn:
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for i in range(offset, min(rows, offset + batch_size)):
+                created_at = start + timedelta(seconds=i * 300)
+                batch.append({
+                    "vapi_call_id": f"bench_call_{i}",
+                    "candidate_phone": f"+49{100000000 + i}",
+                    "position": random.choice(POSITIONS),
+                    "status": random.choice(STATUSES),
+                    "evaluation_score": round(random.uniform(1, 10), 2),
+                    "recommendation": random.choice(RECOMMENDATIONS),
+                    "created_at": created_at,
+                    "completed_at": created_at + timedelta(minutes=25),
+                })
+            conn.execute(InterviewSession.__table__.insert(), batch)
+
+
+def drop_declared_indexes(db_manager: DatabaseManager):
+    with db_manager.engine.begin() as conn:
+        for index in InterviewSession.__table__.indexes:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+
+def build_queries(rows: int):
+    phone = f"+49{100000000 + rows // 2}"
+    return {
+        "list_first_page": lambda s: list_interviews(s, limit=50),
+        "filter_status": lambda s: list_interviews(s, limit=50, status="failed"),
+        "filter_position": lambda s: list_interviews(s, limit=50, position="Designer"),
+        "filter_recommendation": lambda s: list_interviews(s, limit=50, recommendation="EINLADEN"),
+        "candidate_lookup": lambda s: s.query(InterviewSession.id).filter(
+            InterviewSession.candidate_phone == phone
+        ).all(),
+        "count_by_status": lambda s: s.query(InterviewSession.id).filter(
+            InterviewSession.status == "in_progress"
+        ).count(),
+    }
+
+
+def measure(db_manager: DatabaseManager, queries, repeat: int):
+    results = {}
+    for name, query in queries.items():
+        timings = []
+        for _ in range(repeat):
+            session = db_manager.get_session()
+            try:
+                started = time.perf_counter()
+                query(session)
+                timings.append((time.perf_counter() - started) * 1000)
+            finally:
+                session.close()
+        timings.sort()
+        results[name] = {
+            "median_ms": round(timings[len(timings) // 2], 3),
+            "max_ms": round(timings[-1], 3),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark InterviewSession indexes")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        db_manager.create_tables()
+        drop_declared_indexes(db_manager)
+
+        print(f"[INFO] Populating {args.rows} interview sessions...")
+        populate(db_manager, args.rows)
+        queries = build_queries(args.rows)
+
+        print("[INFO] Measuring without indexes...")
+        before = measure(db_manager, queries, args.repeat)
+
+        started = time.perf_counter()
+        created = db_manager.ensure_indexes()
+        index_build_ms = round((time.perf_counter() - started) * 1000, 1)
+        print(f"[INFO] Created {len(created)} indexes in {index_build_ms} ms")
+
+        print("[INFO] Measuring with indexes...")
+        after = measure(db_manager, queries, args.repeat)
+        db_manager.engine.dispose()
+
+    report = {
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "index_build_ms": index_build_ms,
+        "queries": {
+            name: {
+                "before": before[name],
+                "after": after[name],
+                "speedup": round(before[name]["median_ms"] / max(after[name]["median_ms"], 0.001), 1),
+            }
+            for name in queries
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
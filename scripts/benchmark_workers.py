@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Benchmark Workers - Requests/s einer Lese-Route mit 1, 2, 4, ... Server-Prozessen
+
+Startet die App pro Worker-Anzahl als eigenen Server (gunicorn mit
+gunicorn.conf.py, ohne gunicorn ``uvicorn --workers``) im Demo-Modus auf
+einer temporären, vorbefüllten SQLite-Datenbank und feuert für --duration
+Sekunden Requests aus mehreren Client-Prozessen ab (eigene Prozesse, damit
+der Lastgenerator nicht am GIL hängt).
+
+    python scripts/benchmark_workers.py --workers 1,2,4,8
+    python scripts/benchmark_workers.py --server uvicorn --app fastapi --path /interviews?limit=50
+    python scripts/benchmark_workers.py --workers 1,4 --duration 20 --output workers.json
+
+Auswertung: ``speedup`` ist rps gegenüber der ersten Worker-Anzahl. Ein
+Prozess nutzt wegen des GIL höchstens einen Kern; solange Worker- plus
+Client-Prozesse freie Kerne finden, sollte der Durchsatz nahezu linear
+steigen und darüber abflachen (``cpu_count`` steht im Report). Auf einer
+Maschine mit einem Kern ist keine Skalierung zu erwarten - dann misst das
+Skript nur den Overhead zusätzlicher Prozesse.
+
+Bisherige Messung (gunicorn 26.2, Flask, /analytics, 2000 Sessions,
+4 Clients, 8 s pro Stufe) - nur auf einer Maschine mit EINEM Kern:
+
+    workers   rps     p50 ms   p95 ms   speedup
+    1         151.9   25.7     43.0     1.00
+    2         144.5   25.2     53.4     0.95
+    4         148.9   26.2     42.3     0.98
+
+Der Durchsatz bleibt hier erwartungsgemäß flach. Eine Skalierung der
+Requests/s mit der Worker-Anzahl ist damit NICHT nachgewiesen; dafür steht
+ein Lauf auf einer Maschine mit mehreren Kernen noch aus
+(``--workers 1,2,4,8 --output workers.json``).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import requests
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-Rank-Perzentil"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return round(ordered[min(rank, len(ordered)) - 1], 2)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_database(db_path: str, sessions: int):
+    """Abgeschlossene Demo-Sessions über 30 Tage plus Kennzahlen"""
+    os.environ["SQLITE_DB_PATH"] = db_path
+    from config.database_sqlite import DatabaseManager, InterviewSession
+    from services.analytics import rebuild_analytics
+
+    db_manager = DatabaseManager()
+    db_manager.create_tables()
+    now = datetime.utcnow()
+    recommendations = ("EINLADEN", "UNENTSCHIEDEN", "ABLEHNEN")
+    positions = ("Software Developer", "Data Scientist", "Product Manager")
+    with db_manager.write_session() as db_session:
+        db_session.bulk_save_objects([
+            InterviewSession(
+                vapi_call_id=f"bench_{index}",
+                candidate_phone=f"+4915{index:08d}",
+                position=positions[index % len(positions)],
+                status="completed",
+                evaluation_score=round(3 + (index * 37 % 70) / 10, 2),
+                recommendation=recommendations[index % len(recommendations)],
+                created_at=now - timedelta(days=index % 30, minutes=30),
+                completed_at=now - timedelta(days=index % 30),
+            )
+            for index in range(sessions)
+        ])
+    rebuild_analytics(db_manager)
+    db_manager.engine.dispose()
+
+
+def start_server(server: str, app: str, workers: int, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    if server == "gunicorn":
+        command = [
+            sys.executable, "-m", "gunicorn", "-c", os.path.join(ROOT, "gunicorn.conf.py"),
+            "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+        ]
+        if app == "fastapi":
+            command += ["-k", "uvicorn.workers.UvicornWorker", "main:app"]
+        else:
+            command += ["app_flask:app"]
+    else:
+        module = "main:app" if app == "fastapi" else "app_flask:app"
+        command = [sys.executable, "-m", "uvicorn", module, "--host", "127.0.0.1", "--port", str(port),
+                   "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+        if app == "flask":
+            command += ["--interface", "wsgi"]
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+
+
+def wait_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/status", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server unter {base_url} nicht erreichbar")
+
+
+def stop_server(process: subprocess.Popen):
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+
+def client_loop(args) -> Dict[str, Any]:
+    """Ein Client-Prozess: sequentielle Requests über eine Keep-Alive-Session bis zum Ende der Messung"""
+    url, duration, warmup = args
+    session = requests.Session()
+    latencies: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+    while True:
+        sent = time.perf_counter()
+        if sent >= deadline:
+            break
+        try:
+            ok = session.get(url, timeout=30).status_code == 200
+        except requests.RequestException:
+            ok = False
+        if sent >= measure_from:
+            if ok:
+                latencies.append((time.perf_counter() - sent) * 1000)
+            else:
+                errors += 1
+    return {"latencies": latencies, "errors": errors}
+
+
+def run_level(args, workers: int, env: Dict[str, str]) -> Dict[str, Any]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_server(args.server, args.app, workers, port, {**env, "WEB_CONCURRENCY": str(workers)})
+    try:
+        wait_ready(base_url)
+        jobs = [(f"{base_url}{args.path}", args.duration, args.warmup)] * args.clients
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(client_loop, jobs)
+    finally:
+        stop_server(process)
+
+    latencies = [value for result in results for value in result["latencies"]]
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": sum(result["errors"] for result in results),
+        "rps": round(len(latencies) / args.duration, 1),
+        "latency_ms": {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95), "p99": percentile(latencies, 99)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure requests/s against the number of server processes")
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn"],
+                        default="gunicorn" if shutil.which("gunicorn") else "uvicorn")
+    parser.add_argument("--app", choices=["flask", "fastapi"], default="flask")
+    parser.add_argument("--workers", default="1,2,4", help="Kommagetrennte Worker-Anzahlen")
+    parser.add_argument("--path", default="/analytics", help="Gemessene Route (GET)")
+    parser.add_argument("--clients", type=int, default=max(2, multiprocessing.cpu_count()),
+                        help="Client-Prozesse (je eine Verbindung)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Messdauer pro Stufe in Sekunden")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--sessions", type=int, default=5000, help="Vorbefüllte Sessions")
+    parser.add_argument("--output", help="JSON-Report in Datei schreiben")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        db_path = os.path.join(db_dir, "benchmark.db")
+        seed_database(db_path, args.sessions)
+        env = {
+            **os.environ,
+            # Demo-Services erzwingen - auch wenn .env echte Keys enthält
+            "VAPI_API_KEY": "demo_benchmark",
+            "OPENAI_API_KEY": "demo_benchmark",
+            "SLACK_BOT_TOKEN": "",
+            "SQLITE_DB_PATH": db_path,
+            "SQLITE_TUNED": "true",
+            "STARTUP_LOCK_PATH": os.path.join(db_dir, "startup.lock"),
+            "PYTHONPATH": ROOT,
+        }
+        levels = [run_level(args, int(value), env) for value in args.workers.split(",") if value.strip()]
+
+    baseline = levels[0]["rps"] or None
+    for level in levels:
+        level["speedup"] = round(level["rps"] / baseline, 2) if baseline else None
+    report = {
+        "server": args.server,
+        "app": args.app,
+        "path": args.path,
+        "cpu_count": multiprocessing.cpu_count(),
+        "clients": args.clients,
+        "duration_s": args.duration,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "levels": levels,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Compress Transcripts - Backfill für komprimierte transcript/evaluation_data
+
+Bestehende Zeilen liegen noch als unkomprimierter TEXT in der Datenbank
+(werden weiterhin gelesen). Dieses Script schreibt sie in Batches über
+CompressedText neu und berichtet die Größenreduktion.
+
+    python scripts/compress_transcripts.py --dry-run
+    python scripts/compress_transcripts.py --batch-size 500 --vacuum
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select, text, update
+
+from config.database_sqlite import DatabaseManager, InterviewSession, compress_text
+
+COLUMNS = ("transcript", "evaluation_data")
+
+
+def column_bytes(conn) -> dict:
+    """Gespeicherte Bytes pro Spalte (BLOB-Länge, unabhängig vom Format)"""
+    table = InterviewSession.__table__
+    sizes = {}
+    for name in COLUMNS:
+        sizes[name] = conn.execute(
+            select(func.coalesce(func.sum(func.length(text(f"CAST({name} AS BLOB)"))), 0)).select_from(table)
+        ).scalar()
+    return sizes
+
+
+def file_bytes(conn) -> int:
+    return conn.execute(text("PRAGMA page_count")).scalar() * conn.execute(text("PRAGMA page_size")).scalar()
+
+
+def backfill(db_manager: DatabaseManager, batch_size: int, dry_run: bool):
+    """Komprimiert alle noch als TEXT gespeicherten Werte (Keyset über id).
+
+    Gibt (umgeschriebene Zeilen, eingesparte Bytes) zurück - bei ``dry_run``
+    die erwartete Einsparung.
+    """
+    table = InterviewSession.__table__
+    last_id = 0
+    rewritten = 0
+    saved = 0
+
+    while True:
+        with db_manager.engine.begin() as conn:
+            # Rohwerte ohne TypeDecorator lesen, damit typeof() und Inhalt zusammenpassen
+            rows = conn.execute(
+                text(
+                    "SELECT id, transcript, evaluation_data FROM interview_sessions "
+                    "WHERE id > :last_id AND (typeof(transcript) = 'text' OR typeof(evaluation_data) = 'text') "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).fetchall()
+            if not rows:
+                break
+
+            for row in rows:
+                last_id = row.id
+                values = {}
+                for name in COLUMNS:
+                    value = getattr(row, name)
+                    if not isinstance(value, str):
+                        continue
+                    compressed = compress_text(value)
+                    # Zu kurze Werte bleiben TEXT
+                    if not isinstance(compressed, str):
+                        values[name] = value
+                        saved += len(value.encode("utf-8")) - len(compressed)
+                if values:
+                    rewritten += 1
+                    if not dry_run:
+                        # updated_at beibehalten - reine Speicheränderung, kein Delta für Sync-Clients
+                        conn.execute(
+                            update(table).where(table.c.id == row.id).values(updated_at=table.c.updated_at, **values)
+                        )
+
+    return rewritten, saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress stored transcripts and evaluations")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Nur zählen, nichts schreiben")
+    parser.add_argument("--vacuum", action="store_true", help="Datei nach dem Backfill mit VACUUM verkleinern")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    db_manager.create_tables()
+
+    with db_manager.engine.connect() as conn:
+        before = column_bytes(conn)
+        before_file = file_bytes(conn)
+
+    rewritten, saved = backfill(db_manager, args.batch_size, args.dry_run)
+
+    if args.vacuum and not args.dry_run:
+        with db_manager.engine.connect() as conn:
+            conn.execute(text("VACUUM"))
+
+    with db_manager.engine.connect() as conn:
+        after = column_bytes(conn)
+        after_file = file_bytes(conn)
+
+    report = {
+        "dry_run": args.dry_run,
+        "rows_rewritten": rewritten,
+        "bytes_saved": saved,
+        "columns": {
+            name: {
+                "bytes_before": before[name],
+                "bytes_after": after[name],
+                "reduction": round(1 - after[name] / before[name], 3) if before[name] else 0.0,
+            }
+            for name in COLUMNS
+        },
+        "file_bytes_before": before_file,
+        "file_bytes_after": after_file,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
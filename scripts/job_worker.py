@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Job Worker - Arbeitet processing_jobs außerhalb der Web-Prozesse ab
+
+Mehrere Worker-Prozesse (auch auf mehreren Hosts mit MySQL) können die
+Queue parallel leeren; Jobs eines abgestürzten Workers werden nach Ablauf
+der Lease (JOB_VISIBILITY_TIMEOUT_SECONDS) von einem anderen übernommen.
+Verwendet dieselbe Verarbeitung wie die Flask-App (app_flask.py).
+
+    python scripts/job_worker.py --workers 8
+    JOB_WORKER_IN_PROCESS=false python app_flask.py   # Web-Prozess nimmt dann nur noch an
+    python scripts/job_worker.py --stats              # Jobs pro Status ausgeben
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued background jobs")
+    parser.add_argument("--workers", type=int, help="Parallele Jobs (Standard PROCESSING_WORKERS bzw. 4)")
+    parser.add_argument("--purge-days", type=int, default=int(os.getenv('JOB_RETENTION_DAYS', '14')),
+                        help="Erledigte Jobs älter als N Tage beim Start löschen (0 = nie)")
+    parser.add_argument("--stats", action="store_true", help="Nur Jobs pro Status ausgeben")
+    args = parser.parse_args()
+
+    if args.workers:
+        os.environ['PROCESSING_WORKERS'] = str(args.workers)
+    # Den Worker startet dieses Skript selbst (nicht schon beim Import, z.B. bei --stats)
+    os.environ['JOB_WORKER_IN_PROCESS'] = 'false'
+
+    # Import baut Clients, Evaluator-Kette und Datenbank wie im Web-Prozess auf
+    import app_flask
+
+    job_queue = app_flask.job_queue
+    if args.stats:
+        print(json.dumps(job_queue.counts(), indent=2))
+        return
+    if args.purge_days > 0:
+        purged = job_queue.purge_finished(args.purge_days)
+        if purged:
+            print(f"[INFO] {purged} erledigte Jobs gelöscht")
+
+    job_worker = app_flask.job_worker
+    job_worker.start()
+    print(f"[START] Job-Worker {job_worker.worker_id} ({app_flask.processing_pool.workers} parallel)")
+
+    stopping = threading.Event()
+
+    def request_stop(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    while not stopping.wait(60):
+        print(f"[INFO] {json.dumps(job_queue.counts())}")
+
+    print("[STOP] Keine neuen Jobs mehr, warte auf laufende ...")
+    job_worker.stop(wait=True)
+    print(json.dumps(job_worker.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Load Test - Parallele Interview-Flows gegen die Flask- oder FastAPI-App
+
+Jeder Flow ruft POST /start-interview und POST /webhook/vapi (call-ended) auf
+und pollt danach bis das Interview abgeschlossen ist (Transkript verfügbar).
+Gemessen wird die Latenz vom Webhook bis status=completed sowie der Durchsatz.
+
+Ohne --base-url wird die gewählte App im Prozess mit den Demo-Services
+(DemoVapiClient, DemoEvaluator, DemoSlackNotifier) und einer temporären
+SQLite-Datenbank gestartet:
+
+    python scripts/load_test.py --app flask --flows 200 --concurrency 20
+    python scripts/load_test.py --app fastapi --flows 200 --concurrency 20 --output load.json
+    python scripts/load_test.py --base-url http://127.0.0.1:8000 --flows 50
+
+Das Ergebnis ist JSON (stdout oder --output), damit es zwischen Releases
+verglichen werden kann.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-Rank-Perzentil"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return round(ordered[min(rank, len(ordered)) - 1], 2)
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": round(max(values), 2) if values else None,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_in_process(app_name: str, db_dir: str) -> str:
+    """Startet die App im Demo-Modus in einem Hintergrund-Thread und gibt die Base-URL zurück."""
+    # Demo-Services erzwingen - auch wenn .env echte Keys enthält
+    os.environ["VAPI_API_KEY"] = "demo_loadtest"
+    os.environ["OPENAI_API_KEY"] = "demo_loadtest"
+    os.environ["SLACK_BOT_TOKEN"] = ""
+    os.environ["SQLITE_DB_PATH"] = os.path.join(db_dir, "load_test.db")
+    port = _free_port()
+
+    if app_name == "flask":
+        from werkzeug.serving import make_server
+        import app_flask
+
+        server = make_server("127.0.0.1", port, app_flask.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    else:
+        import uvicorn
+        import main
+
+        server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+        threading.Thread(target=server.run, daemon=True).start()
+        while not server.started:
+            time.sleep(0.05)
+
+    return f"http://127.0.0.1:{port}"
+
+
+class FlowRunner:
+    def __init__(self, base_url: str, concurrency: int, poll_interval: float, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def run_flow(self, index: int) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"ok": False}
+        try:
+            started = time.perf_counter()
+            response = self.session.post(
+                f"{self.base_url}/start-interview",
+                json={"candidate_phone": f"+4915{index:08d}", "position": "Load Test"},
+                timeout=30,
+            )
+            result["start_ms"] = (time.perf_counter() - started) * 1000
+            if response.status_code != 200:
+                result["error"] = f"start-interview HTTP {response.status_code}"
+                return result
+            call_id = response.json()["call_id"]
+
+            webhook_sent = time.perf_counter()
+            response = self.session.post(
+                f"{self.base_url}/webhook/vapi",
+                json={"type": "call-ended", "call": {"id": call_id}},
+                timeout=30,
+            )
+            result["webhook_ms"] = (time.perf_counter() - webhook_sent) * 1000
+            if response.status_code != 200:
+                result["error"] = f"webhook HTTP {response.status_code}"
+                return result
+
+            # Transkript ist erst nach dem Commit mit status=completed verfügbar
+            deadline = webhook_sent + self.timeout
+            while time.perf_counter() < deadline:
+                response = self.session.get(f"{self.base_url}/interviews/{call_id}/transcript", timeout=30)
+                if response.status_code == 200:
+                    result["completion_ms"] = (time.perf_counter() - webhook_sent) * 1000
+                    result["ok"] = True
+                    return result
+                time.sleep(self.poll_interval)
+
+            result["error"] = "timeout"
+            return result
+
+        except Exception as exc:
+            result["error"] = str(exc)
+            return result
+
+
+def run_load_test(base_url: str, flows: int, concurrency: int, poll_interval: float, timeout: float) -> Dict[str, Any]:
+    runner = FlowRunner(base_url, concurrency, poll_interval, timeout)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(runner.run_flow, range(flows)))
+    duration = time.perf_counter() - started
+
+    completed = [r for r in results if r["ok"]]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if not r["ok"]:
+            errors[r.get("error", "unknown")] = errors.get(r.get("error", "unknown"), 0) + 1
+
+    return {
+        "flows": flows,
+        "concurrency": concurrency,
+        "completed": len(completed),
+        "failed": flows - len(completed),
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "throughput_flows_per_s": round(len(completed) / duration, 2) if duration else None,
+        "start_interview_ms": summarize([r["start_ms"] for r in results if "start_ms" in r]),
+        "webhook_ack_ms": summarize([r["webhook_ms"] for r in results if "webhook_ms" in r]),
+        "webhook_to_completed_ms": summarize([r["completion_ms"] for r in completed]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the interview pipeline")
+    parser.add_argument("--app", choices=["flask", "fastapi"], default="flask",
+                        help="App die im Prozess gestartet wird (ignoriert mit --base-url)")
+    parser.add_argument("--base-url", help="Laufenden Server testen statt die App im Prozess zu starten")
+    parser.add_argument("--flows", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Max. Sekunden vom Webhook bis completed")
+    parser.add_argument("--output", help="JSON-Report in Datei schreiben")
+    parser.add_argument("--verbose", action="store_true", help="Server-Ausgaben nicht unterdrücken")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        # Demo-Services schreiben pro Call auf stdout - das gehört nicht in den Report
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        if not args.verbose:
+            logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        with quiet:
+            base_url = args.base_url or start_in_process(args.app, db_dir)
+            report = run_load_test(base_url, args.flows, args.concurrency, args.poll_interval, args.timeout)
+
+    report = {
+        "target": args.base_url or f"in-process:{args.app}",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        **report,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    print(output)
+    sys.exit(0 if report["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
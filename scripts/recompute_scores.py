@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Recompute Scores - evaluation_score aller Sessions nach Gewichtungsänderungen neu berechnen
+
+Die gespeicherten Einzelbewertungen bleiben unverändert (kein LLM-Call);
+berechnet wird nur der gewichtete Gesamtscore, vektorisiert pro Batch.
+
+    python scripts/recompute_scores.py --dry-run
+    python scripts/recompute_scores.py --profile "Data Scientist" \\
+        --weights '{"fachkompetenz": 0.4, "problemloesung": 0.3, "kommunikation": 0.1, "motivation": 0.1, "cultural_fit": 0.1}'
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database_sqlite import DatabaseManager
+from services.config_service import ConfigService
+from services.scoring import DEFAULT_PROFILE, DIMENSIONS, ScoringEngine, recompute_all_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute evaluation_score from stored evaluations")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="Position, deren Gewichte --weights setzt")
+    parser.add_argument("--weights", help="JSON: Dimension -> Gewicht (wird vor dem Neuberechnen gespeichert, nicht bei --dry-run)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Nur zählen, nichts schreiben")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+    db_manager.create_tables()
+    engine = ScoringEngine(ConfigService(db_manager))
+    if args.weights and not args.dry_run:
+        engine.set_profile(args.profile, json.loads(args.weights))
+
+    report = recompute_all_scores(db_manager, engine, args.batch_size, args.dry_run)
+    report["profiles"] = {
+        name: {dimension: round(float(weight), 4) for dimension, weight in zip(DIMENSIONS, vector)}
+        for name, vector in engine.profiles().items()
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Reevaluate Sessions - Gespeicherte Transkripte neu bewerten (z.B. nach Prompt- oder Gewichtungsänderungen)
+
+Die Sessions werden per Keyset über die id in Batches gelesen, parallel
+(--concurrency) und durch einen Token-Bucket gedrosselt (--rate Bewertungen
+pro Minute) bewertet und pro Batch in einer Transaktion geschrieben. Nach
+jedem Batch wird der Fortschritt in die Checkpoint-Datei geschrieben; ein
+abgebrochener Lauf setzt dort wieder auf.
+
+    python scripts/reevaluate_sessions.py --position "Software Developer" --since 2024-01-01
+    python scripts/reevaluate_sessions.py --recommendation UNENTSCHIEDEN --rate 30 --concurrency 4
+    python scripts/reevaluate_sessions.py --ids 12,15,19 --dry-run
+    python scripts/reevaluate_sessions.py --reset   # Checkpoint verwerfen, von vorne beginnen
+
+Der Evaluator wird wie in den Apps gewählt (Demo, Gemini oder OpenAI inkl.
+Vorverarbeitung und ggf. Map-Reduce). Der Evaluation-Cache wird genutzt,
+damit reine Gewichtungsänderungen keine LLM-Calls kosten (--no-cache
+erzwingt neue Bewertungen). Fehlgeschlagene Bewertungen überschreiben die
+gespeicherte Bewertung nicht.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+
+from config.database_sqlite import DatabaseManager, InterviewSession
+from services.analytics import analytics_contribution, apply_analytics_delta
+from services.config_service import config_service
+
+DEFAULT_CHECKPOINT = "reevaluate_checkpoint.json"
+# Wie viele fehlgeschlagene ids im Checkpoint gehalten werden
+MAX_FAILED_IDS = 500
+
+
+class TokenBucket:
+    """Einfacher Token-Bucket (thread-safe): ``rate`` Tokens pro Sekunde, höchstens ``burst`` auf Vorrat."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def build_evaluator(db_manager: DatabaseManager, use_cache: bool):
+    """Gleiche Auswahl und Wrapper-Kette wie app_flask.py"""
+    from services.demo_service import DemoEvaluator, is_demo_mode
+    from services.evaluation_cache import CachedEvaluator, EvaluationCache
+    from services.map_reduce_evaluator import MapReduceEvaluator, is_map_reduce_mode
+    from services.transcript_preprocessor import PreprocessingEvaluator
+
+    has_gemini = os.getenv('OPENAI_API_KEY', '').startswith('AIzaSy')
+    if is_demo_mode() and not has_gemini:
+        evaluator = DemoEvaluator()
+    elif has_gemini:
+        from services.gemini_service import GeminiEvaluator
+        evaluator = GeminiEvaluator()
+    else:
+        from services.evaluation_service import InterviewEvaluator
+        evaluator = InterviewEvaluator()
+
+    evaluator = PreprocessingEvaluator(evaluator)
+    if is_map_reduce_mode():
+        evaluator = MapReduceEvaluator(evaluator)
+    if use_cache:
+        evaluator = CachedEvaluator(evaluator, EvaluationCache(db_manager))
+    return evaluator
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def build_filters(args) -> Dict[str, Any]:
+    """Filter als JSON-fähiges Dict (Teil des Checkpoints)"""
+    return {
+        "status": args.status,
+        "position": args.position,
+        "recommendation": args.recommendation,
+        "since": args.since,
+        "until": args.until,
+        "ids": sorted(int(value) for value in args.ids.split(",") if value.strip()) if args.ids else None,
+    }
+
+
+def build_query(filters: Dict[str, Any], last_id: int, batch_size: int):
+    table = InterviewSession.__table__
+    query = (
+        select(table.c.id, table.c.vapi_call_id, table.c.transcript)
+        .where(table.c.id > last_id, table.c.transcript.isnot(None))
+        .order_by(table.c.id)
+        .limit(batch_size)
+    )
+    if filters["status"]:
+        query = query.where(table.c.status == filters["status"])
+    if filters["position"]:
+        query = query.where(table.c.position == filters["position"])
+    if filters["recommendation"]:
+        query = query.where(table.c.recommendation == filters["recommendation"])
+    if filters["since"]:
+        query = query.where(table.c.created_at >= parse_date(filters["since"]))
+    if filters["until"]:
+        query = query.where(table.c.created_at < parse_date(filters["until"]))
+    if filters["ids"]:
+        query = query.where(table.c.id.in_(filters["ids"]))
+    return query
+
+
+def load_checkpoint(path: str, filters: Dict[str, Any], reset: bool) -> Dict[str, Any]:
+    fresh = {
+        "filters": filters,
+        "last_id": 0,
+        "processed": 0,
+        "updated": 0,
+        "failed": 0,
+        "failed_ids": [],
+        "done": False,
+        "started_at": datetime.utcnow().isoformat(),
+    }
+    if reset or not os.path.exists(path):
+        return fresh
+    with open(path, encoding="utf-8") as handle:
+        checkpoint = json.load(handle)
+    if checkpoint.get("filters") != filters:
+        raise SystemExit(
+            f"Checkpoint {path} gehört zu anderen Filtern ({checkpoint.get('filters')}) - "
+            "mit --reset neu beginnen oder --checkpoint ändern"
+        )
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    """Atomar schreiben, damit ein Abbruch keinen halben Checkpoint hinterlässt"""
+    checkpoint["updated_at"] = datetime.utcnow().isoformat()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(checkpoint, handle, indent=2)
+    os.replace(tmp_path, path)
+
+
+def evaluate_row(evaluator, bucket: TokenBucket, row) -> Dict[str, Any]:
+    bucket.acquire()
+    try:
+        evaluation = evaluator.evaluate_interview(row.transcript)
+    except Exception as exc:
+        evaluation = {"error": f"Bewertung fehlgeschlagen: {exc}"}
+    return evaluation
+
+
+def write_batch(db_manager: DatabaseManager, evaluator, results: Dict[int, Dict[str, Any]]):
+    """Schreibt alle erfolgreichen Bewertungen eines Batches in einer Transaktion"""
+    with db_manager.write_session() as db_session:
+        sessions = db_session.query(InterviewSession).filter(InterviewSession.id.in_(list(results))).all()
+        for session in sessions:
+            evaluation = results[session.id]
+            before = analytics_contribution(session)
+            session.evaluation_score = evaluator.calculate_overall_score(
+                evaluation.get('einzelbewertungen', {}), session.position
+            )
+            session.set_evaluation_data(evaluation)
+            session.recommendation = evaluation.get('gesamtbewertung', {}).get('empfehlung')
+            session.next_steps = evaluation.get('naechste_schritte')
+            apply_analytics_delta(db_session, before, analytics_contribution(session))
+
+
+def run(args) -> Dict[str, Any]:
+    filters = build_filters(args)
+    checkpoint = load_checkpoint(args.checkpoint, filters, args.reset)
+    if checkpoint["done"]:
+        print(f"[INFO] Checkpoint {args.checkpoint} ist bereits abgeschlossen (--reset für einen neuen Lauf)")
+        return checkpoint
+
+    db_manager = DatabaseManager()
+    db_manager.create_tables()
+    config_service.bind(db_manager)
+    evaluator = build_evaluator(db_manager, use_cache=not args.no_cache)
+    bucket = TokenBucket(args.rate / 60.0, burst=args.concurrency)
+    started = time.perf_counter()
+    run_processed = 0
+
+    with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="reevaluate") as executor:
+        while args.limit is None or run_processed < args.limit:
+            batch_size = args.batch_size if args.limit is None else min(args.batch_size, args.limit - run_processed)
+            db_session = db_manager.get_session()
+            try:
+                rows = db_session.execute(build_query(filters, checkpoint["last_id"], batch_size)).fetchall()
+            finally:
+                db_session.close()
+            if not rows:
+                checkpoint["done"] = True
+                break
+
+            evaluations = list(executor.map(lambda row: evaluate_row(evaluator, bucket, row), rows))
+            results: Dict[int, Dict[str, Any]] = {}
+            failed_ids: List[int] = []
+            for row, evaluation in zip(rows, evaluations):
+                if not evaluation or evaluation.get("error"):
+                    failed_ids.append(row.id)
+                else:
+                    results[row.id] = evaluation
+
+            if results and not args.dry_run:
+                write_batch(db_manager, evaluator, results)
+
+            run_processed += len(rows)
+            checkpoint["last_id"] = rows[-1].id
+            checkpoint["processed"] += len(rows)
+            checkpoint["updated"] += len(results)
+            checkpoint["failed"] += len(failed_ids)
+            checkpoint["failed_ids"] = (checkpoint["failed_ids"] + failed_ids)[-MAX_FAILED_IDS:]
+            if not args.dry_run:
+                save_checkpoint(args.checkpoint, checkpoint)
+
+            elapsed = time.perf_counter() - started
+            print(f"[INFO] bis id {checkpoint['last_id']}: {checkpoint['processed']} verarbeitet, "
+                  f"{checkpoint['failed']} fehlgeschlagen ({run_processed / elapsed:.1f}/s)")
+
+    if not args.dry_run:
+        save_checkpoint(args.checkpoint, checkpoint)
+    elapsed = time.perf_counter() - started
+    return {
+        **checkpoint,
+        "dry_run": args.dry_run,
+        "run_processed": run_processed,
+        "elapsed_s": round(elapsed, 2),
+        "per_second": round(run_processed / elapsed, 2) if elapsed else None,
+    }
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Re-evaluate stored interview transcripts")
+    parser.add_argument("--status", default="completed", help="Nur Sessions mit diesem Status (leer = alle)")
+    parser.add_argument("--position")
+    parser.add_argument("--recommendation", help="z.B. UNENTSCHIEDEN, um Parsing-Fallbacks nachzuholen")
+    parser.add_argument("--since", help="created_at ab (ISO-Datum)")
+    parser.add_argument("--until", help="created_at vor (ISO-Datum)")
+    parser.add_argument("--ids", help="Kommagetrennte Session-ids")
+    parser.add_argument("--limit", type=int, help="Höchstens so viele Sessions in diesem Lauf")
+    parser.add_argument("--batch-size", type=int, default=50, help="Sessions pro Transaktion/Checkpoint")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=60.0, help="Bewertungen pro Minute (0 = unbegrenzt)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--reset", action="store_true", help="Vorhandenen Checkpoint ignorieren")
+    parser.add_argument("--no-cache", action="store_true", help="Evaluation-Cache umgehen")
+    parser.add_argument("--dry-run", action="store_true", help="Bewerten, aber nichts schreiben")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
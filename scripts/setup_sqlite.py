@@ -26,6 +26,12 @@ def setup_database():
         Base.metadata.create_all(db_manager.engine)
         print("[SUCCESS] Tables created successfully")
         
+        # Spalten und Indizes für bestehende Tabellen nachziehen
+        for column_name in db_manager.ensure_columns():
+            print(f"  [OK] Added column: {column_name}")
+        for index_name in db_manager.ensure_indexes():
+            print(f"  [OK] Added index: {index_name}")
+        
         # Basiskonfiguration einfügen
         print("[INFO] Setting up initial configuration...")
         session = db_manager.get_session()
@@ -48,6 +54,11 @@ def setup_database():
                     "value": "4.0",
                     "description": "Unter dieser Punktzahl wird abgelehnt"
                 },
+                {
+                    "key": "scoring_weights",
+                    "value": '{"default": {"cultural_fit": 0.15, "fachkompetenz": 0.3, "kommunikation": 0.25, "motivation": 0.2, "problemloesung": 0.1}}',
+                    "description": "Gewichtungsprofile für den Gesamtscore (JSON: Position -> Dimension -> Gewicht)"
+                },
                 {
                     "key": "default_position",
                     "value": "Software Developer",
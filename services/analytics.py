@@ -0,0 +1,228 @@
+"""
+Analytics - Inkrementell gepflegte Kennzahlen (interview_analytics) und /analytics-Auswertung
+"""
+
+import math
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, case, delete, func, insert, select
+
+from config.database_sqlite import InterviewAnalytics, InterviewSession
+
+HISTOGRAM_BUCKETS = 10
+HISTOGRAM_COLUMNS = tuple(f"hist_{bucket}" for bucket in range(HISTOGRAM_BUCKETS))
+COUNTER_COLUMNS = ("interviews", "score_count", "score_sum", "score_sq_sum") + HISTOGRAM_COLUMNS
+# Zeilen ohne Position/Empfehlung landen in einem eigenen Bucket (Teil des Unique-Keys, darf nicht NULL sein)
+UNKNOWN = "UNBEKANNT"
+
+
+def histogram_bucket(score: float) -> int:
+    """Bucket k deckt [k, k+1) ab, Scores ab 9 (inkl. 10) landen in hist_9"""
+    return min(HISTOGRAM_BUCKETS - 1, max(0, int(math.floor(score))))
+
+
+def analytics_contribution(session) -> Optional[Dict[str, Any]]:
+    """Was eine Session zu ``interview_analytics`` beiträgt (nur abgeschlossene Sessions).
+
+    Vor und nach einer Änderung aufrufen und beide Werte an
+    ``apply_analytics_delta`` übergeben.
+    """
+    if session.status != "completed" or session.completed_at is None:
+        return None
+    return {
+        "day": session.completed_at.date(),
+        "position": session.position or UNKNOWN,
+        "recommendation": session.recommendation or UNKNOWN,
+        "score": session.evaluation_score,
+    }
+
+
+def _upsert_statement(dialect_name: str, contribution: Dict[str, Any], sign: int):
+    """Atomares ``counter = counter + x`` per Upsert (kein Read-Modify-Write, auch über Prozesse hinweg)"""
+    table = InterviewAnalytics.__table__
+    score = contribution["score"]
+    increments = {"interviews": sign}
+    if score is not None:
+        increments.update({
+            "score_count": sign,
+            "score_sum": sign * score,
+            "score_sq_sum": sign * score * score,
+            HISTOGRAM_COLUMNS[histogram_bucket(score)]: sign,
+        })
+    now = datetime.utcnow()
+    values = {
+        "day": contribution["day"],
+        "position": contribution["position"],
+        "recommendation": contribution["recommendation"],
+        **{name: 0 for name in COUNTER_COLUMNS},
+        **increments,
+        "updated_at": now,
+    }
+    updates = {name: table.c[name] + amount for name, amount in increments.items()}
+    updates["updated_at"] = now
+
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        return mysql_insert(table).values(**values).on_duplicate_key_update(updates)
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    return sqlite_insert(table).values(**values).on_conflict_do_update(
+        index_elements=["day", "position", "recommendation"], set_=updates
+    )
+
+
+def _delta_statements(db_session, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+    if before == after:
+        return []
+    dialect_name = db_session.get_bind().dialect.name
+    statements = []
+    if before:
+        statements.append(_upsert_statement(dialect_name, before, -1))
+    if after:
+        statements.append(_upsert_statement(dialect_name, after, 1))
+    return statements
+
+
+def apply_analytics_delta(db_session, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+    """Schreibt die Änderung in der Transaktion von ``db_session`` fort (alter Beitrag raus, neuer rein)."""
+    for statement in _delta_statements(db_session, before, after):
+        db_session.execute(statement)
+
+
+async def aapply_analytics_delta(db_session, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+    for statement in _delta_statements(db_session, before, after):
+        await db_session.execute(statement)
+
+
+def rebuild_analytics(db_manager) -> int:
+    """Baut ``interview_analytics`` komplett aus ``interview_sessions`` neu auf (eine Transaktion).
+
+    Nötig nach Massenänderungen an Scores (z.B. ``recompute_all_scores``)
+    oder als Reparatur; gibt die Anzahl der Kennzahl-Zeilen zurück.
+    """
+    sessions = InterviewSession.__table__
+    analytics = InterviewAnalytics.__table__
+    score = sessions.c.evaluation_score
+    scored = score.isnot(None)
+
+    def counted(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    histogram = []
+    for bucket in range(HISTOGRAM_BUCKETS):
+        # Gleiche Grenzen wie histogram_bucket: alles unter 1 in hist_0, ab 9 in hist_9
+        if bucket == 0:
+            condition = and_(scored, score < 1)
+        elif bucket == HISTOGRAM_BUCKETS - 1:
+            condition = and_(scored, score >= bucket)
+        else:
+            condition = and_(scored, score >= bucket, score < bucket + 1)
+        histogram.append(counted(condition))
+
+    day = func.date(sessions.c.completed_at)
+    position = func.coalesce(sessions.c.position, UNKNOWN)
+    recommendation = func.coalesce(sessions.c.recommendation, UNKNOWN)
+    aggregate = (
+        select(
+            day, position, recommendation,
+            func.count(),
+            counted(scored),
+            func.coalesce(func.sum(score), 0.0),
+            func.coalesce(func.sum(score * score), 0.0),
+            *histogram,
+            func.max(sessions.c.updated_at),
+        )
+        .where(sessions.c.status == "completed", sessions.c.completed_at.isnot(None))
+        .group_by(day, position, recommendation)
+    )
+
+    with db_manager.write_session() as db_session:
+        db_session.execute(delete(analytics))
+        db_session.execute(
+            insert(analytics).from_select(
+                ["day", "position", "recommendation", *COUNTER_COLUMNS, "updated_at"], aggregate
+            )
+        )
+        return db_session.execute(select(func.count()).select_from(analytics)).scalar()
+
+
+def ensure_analytics(db_manager) -> Optional[int]:
+    """Einmaliger Backfill beim Start: leere Tabelle, aber schon abgeschlossene Sessions vorhanden"""
+    db_session = db_manager.get_session()
+    try:
+        if db_session.query(InterviewAnalytics.id).first() is not None:
+            return None
+        has_completed = db_session.query(InterviewSession.id).filter(
+            InterviewSession.status == "completed", InterviewSession.completed_at.isnot(None)
+        ).first() is not None
+    finally:
+        db_session.close()
+    return rebuild_analytics(db_manager) if has_completed else None
+
+
+def _parse_day(value: Any, name: str) -> Optional[date]:
+    if value in (None, ""):
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO-8601 date")
+
+
+def build_analytics_query(position: Any = None, since: Any = None, until: Any = None):
+    """Kennzahl-Zeilen im Zeitraum [since, until] (Abschlusstag, inklusive)"""
+    query = select(InterviewAnalytics.__table__)
+    since_day = _parse_day(since, "since")
+    until_day = _parse_day(until, "until")
+    if position:
+        query = query.where(InterviewAnalytics.position == position)
+    if since_day:
+        query = query.where(InterviewAnalytics.day >= since_day)
+    if until_day:
+        query = query.where(InterviewAnalytics.day <= until_day)
+    return query.order_by(InterviewAnalytics.day)
+
+
+def _empty_group() -> Dict[str, Any]:
+    return {**{name: 0 for name in COUNTER_COLUMNS}, "recommendations": {}}
+
+
+def _add(group: Dict[str, Any], row):
+    for name in COUNTER_COLUMNS:
+        group[name] += getattr(row, name) or 0
+    if row.interviews:
+        group["recommendations"][row.recommendation] = group["recommendations"].get(row.recommendation, 0) + row.interviews
+
+
+def _finish(group: Dict[str, Any]) -> Dict[str, Any]:
+    interviews, count = group["interviews"], group["score_count"]
+    mean = group["score_sum"] / count if count else None
+    variance = max(0.0, group["score_sq_sum"] / count - mean * mean) if count else None
+    recommendations = {key: value for key, value in sorted(group["recommendations"].items()) if value}
+    return {
+        "interviews": interviews,
+        "scored": count,
+        "avg_score": round(mean, 2) if mean is not None else None,
+        "stddev_score": round(math.sqrt(variance), 2) if variance is not None else None,
+        "recommendations": recommendations,
+        "invite_rate": round(recommendations.get("EINLADEN", 0) / interviews, 3) if interviews else None,
+        "reject_rate": round(recommendations.get("ABLEHNEN", 0) / interviews, 3) if interviews else None,
+        "histogram": [group[name] for name in HISTOGRAM_COLUMNS],
+    }
+
+
+def summarize_analytics(rows: List[Any]) -> Dict[str, Any]:
+    """Fasst die (wenigen) Kennzahl-Zeilen zu Gesamt-, Positions- und Tageswerten zusammen."""
+    total = _empty_group()
+    positions: Dict[str, Dict[str, Any]] = {}
+    days: Dict[date, Dict[str, Any]] = {}
+    for row in rows:
+        _add(total, row)
+        _add(positions.setdefault(row.position, _empty_group()), row)
+        _add(days.setdefault(row.day, _empty_group()), row)
+    return {
+        "histogram_buckets": [f"{bucket}-{bucket + 1}" for bucket in range(HISTOGRAM_BUCKETS)],
+        "total": _finish(total),
+        "positions": [{"position": name, **_finish(group)} for name, group in sorted(positions.items())],
+        "days": [{"day": day.isoformat(), **_finish(group)} for day, group in sorted(days.items())],
+    }
@@ -0,0 +1,105 @@
+"""
+Assistant Registry - Wiederverwendung von Vapi-Assistenten
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+
+def assistant_config_hash(assistant_config: Dict[str, Any]) -> str:
+    """Stabiler Hash über die Assistant-Konfiguration (Modell, Stimme, System-Message, ...)"""
+    canonical = json.dumps(assistant_config, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AssistantRegistry:
+    """Liefert die Assistant-ID zur aktuellen Konfiguration.
+
+    Ein Assistent wird nur angelegt, wenn sich der Konfigurations-Hash
+    geändert hat. ID und Hash liegen in ``system_config`` und zusätzlich
+    im Prozess-Cache, sodass der Hot-Path keinen Vapi-Call braucht. Der
+    Prozess-Cache ist nach dem Hash geschlüsselt: ändert sich die
+    Konfiguration (nach Ablauf der Config-TTL), greift automatisch der neue
+    Hash - eine explizite Invalidierung ist nicht nötig.
+    """
+
+    CONFIG_KEY_ID = "vapi_assistant_id"
+    CONFIG_KEY_HASH = "vapi_assistant_config_hash"
+
+    def __init__(self, vapi_client, config):
+        self.vapi_client = vapi_client
+        self.config = config
+        self._cache: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    def get_assistant_id(self) -> Optional[str]:
+        """Gibt die Assistant-ID zurück und legt den Assistenten bei Bedarf an."""
+        assistant_config = self.vapi_client.build_assistant_config()
+        config_hash = assistant_config_hash(assistant_config)
+
+        assistant_id = self._cache.get(config_hash)
+        if assistant_id:
+            return assistant_id
+
+        with self._lock:
+            # Ein anderer Thread kann den Assistenten inzwischen angelegt haben
+            assistant_id = self._cache.get(config_hash)
+            if assistant_id:
+                return assistant_id
+
+            assistant_id = self._load(config_hash)
+            if not assistant_id:
+                assistant = self.vapi_client.create_assistant(assistant_config)
+                assistant_id = assistant.get('id')
+                if not assistant_id:
+                    return None
+                self._store(config_hash, assistant_id)
+
+            self._cache.clear()
+            self._cache[config_hash] = assistant_id
+            return assistant_id
+
+    async def aget_assistant_id(self) -> Optional[str]:
+        """Async-Variante für ``AsyncVapiClient``; DB-Zugriffe laufen im Thread."""
+        # build_assistant_config liest system_config (Interviewdauer) - ggf. im Thread nachladen
+        await self.config.arefresh()
+        assistant_config = self.vapi_client.build_assistant_config()
+        config_hash = assistant_config_hash(assistant_config)
+
+        assistant_id = self._cache.get(config_hash)
+        if assistant_id:
+            return assistant_id
+
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            assistant_id = self._cache.get(config_hash)
+            if assistant_id:
+                return assistant_id
+
+            assistant_id = await asyncio.to_thread(self._load, config_hash)
+            if not assistant_id:
+                assistant = await self.vapi_client.create_assistant(assistant_config)
+                assistant_id = assistant.get('id')
+                if not assistant_id:
+                    return None
+                await asyncio.to_thread(self._store, config_hash, assistant_id)
+
+            self._cache.clear()
+            self._cache[config_hash] = assistant_id
+            return assistant_id
+
+    def _load(self, config_hash: str) -> Optional[str]:
+        # Nur bei Cache-Miss: frisch lesen, damit ein anderer Worker-Prozess
+        # nicht wegen eines veralteten Config-Caches einen zweiten Assistenten anlegt
+        self.config.invalidate()
+        if self.config.get(self.CONFIG_KEY_HASH) == config_hash:
+            return self.config.get(self.CONFIG_KEY_ID)
+        return None
+
+    def _store(self, config_hash: str, assistant_id: str):
+        self.config.set_many({self.CONFIG_KEY_ID: assistant_id, self.CONFIG_KEY_HASH: config_hash})
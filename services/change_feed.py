@@ -0,0 +1,111 @@
+"""
+Change Feed - Speist den EventBus aus der Datenbank, damit Dashboards Änderungen aller Prozesse sehen
+"""
+
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl
+
+from services.interview_queries import CHANGES_LOOKBACK, list_changes
+
+
+class ChangeFeed:
+    """Liest ``/interviews/changes`` (``list_changes``) periodisch und veröffentlicht jede neue
+    Änderung als ``interview.updated`` auf dem lokalen ``EventBus``.
+
+    Der ``EventBus`` ist pro Prozess: im Pre-Fork-Betrieb oder mit
+    ``scripts/job_worker.py`` wird ``interview.updated`` nur im Prozess
+    veröffentlicht, der den Job bearbeitet hat. Über die Datenbank erreicht
+    jede Änderung nach spätestens ``EVENT_FEED_INTERVAL_SECONDS`` (Standard 2)
+    auch die Streams aller anderen Worker. Gepollt wird nur, solange
+    Streams offen sind; Zeilen aus dem Überlappungsfenster des Cursors werden
+    per ``(id, updated_at)`` nur einmal veröffentlicht. Dass lokal bereits
+    veröffentlichte Änderungen noch einmal kommen, ist gewollt - das
+    Dashboard übernimmt Events idempotent.
+    """
+
+    def __init__(self, db_manager, event_bus, interval: Optional[float] = None):
+        self.db_manager = db_manager
+        self.event_bus = event_bus
+        self.interval = interval or float(os.getenv('EVENT_FEED_INTERVAL_SECONDS', '2'))
+        self._cursor: Optional[Dict[str, str]] = None
+        self._seen: Dict[int, str] = {}
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._polls = 0
+        self._published = 0
+        self._errors = 0
+
+    def start(self):
+        """Startet den Poller (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            if not self.event_bus.stats()["subscribers"]:
+                # Ohne Zuhörer nicht pollen; neue Streams laden die Liste ohnehin selbst
+                self._cursor = None
+                self._seen.clear()
+                continue
+            try:
+                self.poll()
+            except Exception as exc:
+                with self._lock:
+                    self._errors += 1
+                print(f"[ERROR] Change-Feed: {exc}")
+
+    def poll(self) -> int:
+        """Eine Runde: alle Seiten seit dem Cursor lesen und veröffentlichen."""
+        if self._cursor is None:
+            self._cursor = {"updated_after": (datetime.utcnow() - CHANGES_LOOKBACK).isoformat()}
+        published = 0
+        db_session = self.db_manager.get_session()
+        try:
+            while True:
+                page = list_changes(db_session, limit=200, **self._cursor)
+                for item in page["items"]:
+                    if self._seen.get(item["id"]) == item["updated_at"]:
+                        continue
+                    self._seen[item["id"]] = item["updated_at"]
+                    self.event_bus.publish("interview.updated", item)
+                    published += 1
+                if page["next_cursor"]:
+                    self._cursor = dict(parse_qsl(page["next_cursor"]))
+                if not page["has_more"]:
+                    break
+        finally:
+            db_session.close()
+        self._prune_seen()
+        with self._lock:
+            self._polls += 1
+            self._published += published
+        return published
+
+    def _prune_seen(self):
+        # Nur Einträge im Überlappungsfenster können erneut gelesen werden
+        horizon = self._cursor["updated_after"]
+        self._seen = {key: value for key, value in self._seen.items() if value >= horizon}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None,
+                "interval_s": self.interval,
+                "polls": self._polls,
+                "published": self._published,
+                "errors": self._errors,
+            }
@@ -0,0 +1,192 @@
+"""
+Config Service - Typisierter, prozesslokal gecachter Zugriff auf ``system_config``
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from config.database_sqlite import SystemConfig
+
+
+class ConfigField(NamedTuple):
+    parse: Callable[[str], Any]
+    default: Any
+    description: str
+
+
+def _json_dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+# Bekannte Keys mit Typ und Standardwert (greift, wenn der Eintrag fehlt oder ungültig ist)
+CONFIG_FIELDS: Dict[str, ConfigField] = {
+    "interview_duration_minutes": ConfigField(int, 30, "Standard-Interviewdauer in Minuten"),
+    "evaluation_threshold_invite": ConfigField(float, 7.0, "Mindestpunktzahl für Einladung zur nächsten Runde"),
+    "evaluation_threshold_reject": ConfigField(float, 4.0, "Unter dieser Punktzahl wird abgelehnt"),
+    "default_position": ConfigField(str, "Software Developer", "Standard-Position für neue Bewerbungen"),
+    "vapi_assistant_id": ConfigField(str, None, "Vapi Assistant ID für Interviews"),
+    "vapi_assistant_config_hash": ConfigField(str, None, "Hash der Konfiguration zu vapi_assistant_id"),
+    "slack_channel": ConfigField(str, None, "Slack-Channel für Ergebnisse (leer = SLACK_CHANNEL)"),
+    "scoring_weights": ConfigField(
+        json.loads, {}, "Gewichtungsprofile für den Gesamtscore (JSON: Position -> Dimension -> Gewicht)"
+    ),
+}
+
+
+class ConfigService:
+    """Liest alle ``system_config``-Einträge mit einer Query und hält sie im Prozess.
+
+    Nach ``CONFIG_CACHE_TTL_SECONDS`` (Standard 30) wird neu geladen, damit
+    Änderungen anderer Prozesse ankommen; ``set`` schreibt und invalidiert
+    sofort. Ohne Datenbank gelten die Standardwerte aus ``CONFIG_FIELDS``.
+    """
+
+    def __init__(self, db_manager=None, ttl_seconds: Optional[float] = None):
+        self.db_manager = db_manager
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('CONFIG_CACHE_TTL_SECONDS', '30'))
+        self._lock = threading.Lock()
+        self._values: Dict[str, str] = {}
+        self._parsed: Dict[str, Any] = {}
+        self._loaded_at: Optional[float] = None
+        self._version = 0
+        self._hits = 0
+        self._loads = 0
+        self._load_errors = 0
+
+    def bind(self, db_manager):
+        """Datenbank setzen (die Services nutzen die globale Instanz, die Apps binden sie)."""
+        self.db_manager = db_manager
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    @property
+    def version(self) -> int:
+        """Steigt bei jedem Neuladen - für abgeleitete Caches (z.B. Scoring-Profile)."""
+        return self._version
+
+    def _is_stale(self) -> bool:
+        return self.db_manager is not None and (
+            self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+        )
+
+    def _read_all(self) -> Dict[str, str]:
+        db_session = self.db_manager.get_session()
+        try:
+            return {row.key: row.value for row in db_session.query(SystemConfig.key, SystemConfig.value)}
+        finally:
+            db_session.close()
+
+    def refresh(self):
+        """Lädt neu, falls veraltet; nur ein Thread liest, die anderen warten auf das Ergebnis."""
+        if not self._is_stale():
+            return
+        with self._lock:
+            if not self._is_stale():
+                return
+            try:
+                values = self._read_all()
+            except Exception as exc:
+                # Letzten Stand behalten und erst nach Ablauf der TTL erneut versuchen
+                print(f"[WARN] system_config konnte nicht geladen werden: {exc}")
+                self._load_errors += 1
+                self._loaded_at = time.monotonic()
+                return
+            self._values = values
+            self._parsed = {}
+            self._loaded_at = time.monotonic()
+            self._version += 1
+            self._loads += 1
+
+    async def arefresh(self):
+        """Für die FastAPI-App: Neuladen im Thread statt im Event-Loop."""
+        if self._is_stale():
+            await asyncio.to_thread(self.refresh)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Typisierter Wert (laut ``CONFIG_FIELDS``), sonst ``default`` bzw. Standardwert."""
+        self.refresh()
+        field = CONFIG_FIELDS.get(key)
+        fallback = default if default is not None else (field.default if field else None)
+        with self._lock:
+            self._hits += 1
+            if key in self._parsed:
+                return self._parsed[key]
+            raw = self._values.get(key)
+        if raw is None or raw == "":
+            return fallback
+        try:
+            value = field.parse(raw) if field else raw
+        except (TypeError, ValueError) as exc:
+            print(f"[WARN] Ungültiger Wert für {key}: {raw!r} ({exc})")
+            value = fallback
+            if default is not None:
+                return value
+        with self._lock:
+            self._parsed[key] = value
+        return value
+
+    @property
+    def interview_duration_minutes(self) -> int:
+        return self.get("interview_duration_minutes")
+
+    @property
+    def evaluation_threshold_invite(self) -> float:
+        return self.get("evaluation_threshold_invite")
+
+    @property
+    def evaluation_threshold_reject(self) -> float:
+        return self.get("evaluation_threshold_reject")
+
+    def recommendation_for(self, score: float) -> str:
+        """Empfehlung aus dem Gesamtscore anhand der konfigurierten Schwellen"""
+        if score >= self.evaluation_threshold_invite:
+            return "EINLADEN"
+        if score <= self.evaluation_threshold_reject:
+            return "ABLEHNEN"
+        return "UNENTSCHIEDEN"
+
+    def set_many(self, values: Dict[str, Any]):
+        """Schreibt mehrere Keys in einer Transaktion und invalidiert den Cache."""
+        with self.db_manager.write_session() as db_session:
+            rows = {
+                row.key: row
+                for row in db_session.query(SystemConfig).filter(SystemConfig.key.in_(list(values)))
+            }
+            for key, value in values.items():
+                if isinstance(value, (dict, list)):
+                    value = _json_dumps(value)
+                value = None if value is None else str(value)
+                row = rows.get(key)
+                if row:
+                    row.value = value
+                    row.updated_at = datetime.utcnow()
+                else:
+                    field = CONFIG_FIELDS.get(key)
+                    db_session.add(SystemConfig(key=key, value=value, description=field.description if field else None))
+        self.invalidate()
+
+    def set(self, key: str, value: Any):
+        self.set_many({key: value})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "keys": len(self._values),
+                "hits": self._hits,
+                "loads": self._loads,
+                "load_errors": self._load_errors,
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+# Globale Instanz für Evaluatoren, Vapi-Client, Notifier und Registry; die Apps binden sie an ihre Datenbank
+config_service = ConfigService()
@@ -2,18 +2,32 @@
 Demo Service - Simuliert API-Calls für Testzwecke ohne echte API-Keys
 """
 
+import asyncio
 import random
 import time
+import uuid
 import json
 from typing import Dict, Any, Optional
 
+from services.config_service import config_service
+from services.scoring import scoring_engine
+
 class DemoVapiClient:
     """Demo-Version des Vapi Clients für Tests ohne echte API-Keys"""
     
     def __init__(self):
         self.demo_mode = True
         
-    def create_assistant(self) -> Dict[str, Any]:
+    def build_assistant_config(self) -> Dict[str, Any]:
+        """Demo-Konfiguration (stabil, damit die Assistant-Registry greift)"""
+        return {
+            "name": "HR Interview Agent (Demo)",
+            "model": {"provider": "demo", "model": "demo"},
+            "voice": {"provider": "demo", "voiceId": "demo"},
+            "systemMessage": "Demo-Interview"
+        }
+
+    def create_assistant(self, assistant_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Simuliert Assistant-Erstellung"""
         return {
             "id": f"demo_assistant_{random.randint(1000, 9999)}",
@@ -23,7 +37,8 @@ class DemoVapiClient:
     
     def initiate_call(self, phone_number: str, assistant_id: str) -> Dict[str, Any]:
         """Simuliert Call-Start"""
-        call_id = f"demo_call_{random.randint(10000, 99999)}"
+        # Eindeutig auch bei vielen parallelen Calls (nur Ziffern, siehe get_call_details)
+        call_id = f"demo_call_{uuid.uuid4().int % 10**12:012d}"
         
         print(f"[DEMO] Würde Anruf starten an: {phone_number}")
         print(f"[DEMO] Assistant ID: {assistant_id}")
@@ -133,15 +148,22 @@ class DemoSlackNotifier:
 
         if slack_token.startswith('xoxb-'):
             from slack_sdk import WebClient
+            from .slack_delivery import delivery_queue_from_env
             self.client = WebClient(token=slack_token)
-            self.channel = os.getenv('SLACK_CHANNEL', 'bewerber')
+            self.default_channel = os.getenv('SLACK_CHANNEL', 'bewerber')
             self.use_real_slack = True
+            self.delivery = delivery_queue_from_env(self.client)
             print('[INFO] Using REAL Slack notifications')
         else:
             self.use_real_slack = False
-            self.channel = os.getenv('SLACK_CHANNEL', 'bewerber')
+            self.delivery = None
+            self.default_channel = os.getenv('SLACK_CHANNEL', 'bewerber')
             print('[INFO] Using simulated Slack notifications')
 
+    def _resolve_channel(self) -> str:
+        """Beim Senden: ``slack_channel`` aus system_config, sonst ``default_channel``"""
+        return config_service.get("slack_channel") or self.default_channel
+
     def send_interview_result(
         self,
         evaluation: Dict[str, Any],
@@ -153,12 +175,15 @@ class DemoSlackNotifier:
         from .slack_notifier import build_interview_payload
 
         payload = build_interview_payload(evaluation, candidate_phone, call_id, transcript_url)
+        channel = self._resolve_channel()
 
         if self.use_real_slack:
-            return self._send_real_slack_message(payload)
+            if self.delivery:
+                return {'queued': self.delivery.enqueue_result(channel, payload, candidate_phone, call_id, transcript_url)}
+            return self._send_real_slack_message(channel, payload)
 
         print('\n[DEMO] Slack-Nachricht (Simulation):')
-        print(f'Kanal: #{self.channel}')
+        print(f'Kanal: #{channel}')
         print(f'Kandidat: {candidate_phone}')
         print(f'Empfehlung: {payload["empfehlung"]} ({payload["score"]}/10)')
         for block in payload['blocks']:
@@ -168,15 +193,15 @@ class DemoSlackNotifier:
                     print(text.get('text', ''))
         return {'ts': f'demo_message_{random.randint(1000, 9999)}'}
 
-    def _send_real_slack_message(self, payload: Dict[str, Any]):
+    def _send_real_slack_message(self, channel: str, payload: Dict[str, Any]):
         """Sendet echte Slack-Nachricht."""
         try:
             response = self.client.chat_postMessage(
-                channel=self.channel,
+                channel=channel,
                 blocks=payload['blocks'],
                 attachments=[{'color': payload['color'], 'fallback': f"Interview Result: {payload['empfehlung']}"}],
             )
-            print(f'[SUCCESS] Slack message sent to #{self.channel}')
+            print(f'[SUCCESS] Slack message sent to #{channel}')
             return response
 
         except Exception as exc:
@@ -186,11 +211,13 @@ class DemoSlackNotifier:
     def send_error_notification(self, error_message: str, call_id: str = None):
         """Sendet Fehler-Benachrichtigung."""
         if self.use_real_slack:
+            text = f"FEHLER: Interview System Error\n{error_message}\nCall ID: {call_id or 'Unknown'}"
+            channel = self._resolve_channel()
+            if self.delivery:
+                self.delivery.enqueue_message(channel, text=text)
+                return
             try:
-                self.client.chat_postMessage(
-                    channel=self.channel,
-                    text=f"FEHLER: Interview System Error\n{error_message}\nCall ID: {call_id or 'Unknown'}",
-                )
+                self.client.chat_postMessage(channel=channel, text=text)
             except Exception as exc:
                 print(f'[ERROR] Slack error notification failed: {exc}')
         else:
@@ -198,9 +225,15 @@ class DemoSlackNotifier:
             print(f'Error: {error_message}')
             print(f"Call ID: {call_id or 'Unknown'}")
 
+    def delivery_stats(self) -> Optional[Dict[str, Any]]:
+        return self.delivery.stats() if self.delivery else None
+
 class DemoEvaluator:
     """Demo-Version des Interview Evaluators"""
     
+    MODEL = "demo"
+    PROMPT_VERSION = "1"
+    
     def __init__(self):
         self.demo_mode = True
     
@@ -231,13 +264,8 @@ class DemoEvaluator:
         
         gesamt_score = sum(scores) / len(scores)
         
-        # Empfehlung ableiten
-        if gesamt_score >= 7:
-            empfehlung = "EINLADEN"
-        elif gesamt_score <= 4:
-            empfehlung = "ABLEHNEN"
-        else:
-            empfehlung = "UNENTSCHIEDEN"
+        # Empfehlung ableiten (Schwellen aus system_config)
+        empfehlung = config_service.recommendation_for(gesamt_score)
         
         return {
             "gesamtbewertung": {
@@ -272,22 +300,45 @@ class DemoEvaluator:
             "naechste_schritte": f"{'Einladung zur nächsten Runde' if empfehlung == 'EINLADEN' else 'Weitere Überlegung nötig' if empfehlung == 'UNENTSCHIEDEN' else 'Absage'}"
         }
     
-    def calculate_overall_score(self, einzelbewertungen: Dict) -> float:
+    def calculate_overall_score(self, einzelbewertungen: Dict, position: Optional[str] = None) -> float:
         """Berechnet Gesamtscore"""
-        weights = {
-            "kommunikation": 0.25,
-            "fachkompetenz": 0.30,
-            "motivation": 0.20,
-            "cultural_fit": 0.15,
-            "problemloesung": 0.10
-        }
-        
-        weighted_score = sum(
-            einzelbewertungen.get(key, {}).get("score", 0) * weight
-            for key, weight in weights.items()
+        return scoring_engine.score(einzelbewertungen, position)
+
+class AsyncDemoVapiClient(DemoVapiClient):
+    """Async-Schnittstelle des Demo-Vapi-Clients für die FastAPI-App"""
+
+    async def create_assistant(self, assistant_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return super().create_assistant(assistant_config)
+
+    async def initiate_call(self, phone_number: str, assistant_id: str) -> Dict[str, Any]:
+        return super().initiate_call(phone_number, assistant_id)
+
+    async def get_call_details(self, call_id: str) -> Dict[str, Any]:
+        return super().get_call_details(call_id)
+
+class AsyncDemoSlackNotifier(DemoSlackNotifier):
+    """Async-Schnittstelle des Demo-Notifiers (echter Slack-Call läuft im Thread)"""
+
+    async def send_interview_result(
+        self,
+        evaluation: Dict[str, Any],
+        candidate_phone: str,
+        call_id: str,
+        transcript_url: Optional[str] = None,
+    ):
+        return await asyncio.to_thread(
+            super().send_interview_result, evaluation, candidate_phone, call_id, transcript_url
         )
-        
-        return round(weighted_score, 2)
+
+    async def send_error_notification(self, error_message: str, call_id: str = None):
+        return await asyncio.to_thread(super().send_error_notification, error_message, call_id)
+
+class AsyncDemoEvaluator(DemoEvaluator):
+    """Async-Schnittstelle des Demo-Evaluators"""
+
+    async def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
+        await config_service.arefresh()
+        return super().evaluate_interview(transcript)
 
 def is_demo_mode() -> bool:
     """Prüft ob Demo-Modus aktiv ist"""
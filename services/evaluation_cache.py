@@ -0,0 +1,175 @@
+"""
+Evaluation Cache - Persistenter Cache für LLM-Bewertungen
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from config.database_sqlite import EvaluationCacheEntry
+
+
+def evaluation_cache_key(transcript: str, prompt_version: str, model: str) -> str:
+    """Hash über Transkript, Prompt-Version und Modell"""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, transcript):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class EvaluationCache:
+    """Bewertungen in der Tabelle ``evaluation_cache``.
+
+    Einträge verfallen nach ``ttl_seconds``; über ``max_entries`` hinaus
+    werden die am längsten nicht genutzten Einträge gelöscht.
+    """
+
+    def __init__(self, db_manager, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None,
+                 evict_every: int = 100):
+        self.db_manager = db_manager
+        self.ttl = timedelta(seconds=ttl_seconds or int(os.getenv('EVALUATION_CACHE_TTL_SECONDS', str(30 * 24 * 3600))))
+        self.max_entries = max_entries or int(os.getenv('EVALUATION_CACHE_MAX_ENTRIES', '10000'))
+        self.evict_every = evict_every
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        with self.db_manager.write_session() as db_session:
+            entry = db_session.query(EvaluationCacheEntry).filter_by(cache_key=cache_key).first()
+            if entry and entry.created_at and entry.created_at < now - self.ttl:
+                db_session.delete(entry)
+                entry = None
+            if entry is None:
+                with self._lock:
+                    self._misses += 1
+                return None
+
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_used_at = now
+            evaluation = json.loads(entry.evaluation_data)
+
+        with self._lock:
+            self._hits += 1
+        return evaluation
+
+    def put(self, cache_key: str, evaluation: Dict[str, Any], model: str, prompt_version: str):
+        now = datetime.utcnow()
+        with self.db_manager.write_session() as db_session:
+            entry = db_session.query(EvaluationCacheEntry).filter_by(cache_key=cache_key).first()
+            if entry is None:
+                entry = EvaluationCacheEntry(cache_key=cache_key, hit_count=0, created_at=now)
+                db_session.add(entry)
+            entry.model = model
+            entry.prompt_version = prompt_version
+            entry.evaluation_data = json.dumps(evaluation, ensure_ascii=False)
+            entry.created_at = now
+            entry.last_used_at = now
+
+        with self._lock:
+            self._stores += 1
+            run_eviction = self._stores % self.evict_every == 0
+        if run_eviction:
+            self.evict()
+
+    def evict(self) -> int:
+        """Löscht abgelaufene Einträge und trimmt auf ``max_entries`` (LRU)."""
+        removed = 0
+        with self.db_manager.write_session() as db_session:
+            removed += db_session.query(EvaluationCacheEntry).filter(
+                EvaluationCacheEntry.created_at < datetime.utcnow() - self.ttl
+            ).delete(synchronize_session=False)
+
+            overflow = db_session.query(EvaluationCacheEntry).count() - self.max_entries
+            if overflow > 0:
+                stale_ids = [
+                    row.id for row in db_session.query(EvaluationCacheEntry.id)
+                    .order_by(EvaluationCacheEntry.last_used_at.asc())
+                    .limit(overflow)
+                ]
+                removed += db_session.query(EvaluationCacheEntry).filter(
+                    EvaluationCacheEntry.id.in_(stale_ids)
+                ).delete(synchronize_session=False)
+
+        with self._lock:
+            self._evictions += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "stores": self._stores,
+                "evictions": self._evictions,
+            }
+
+
+class CachedEvaluator:
+    """Wrapper um einen Evaluator: identische Transkripte kosten nur einen Lookup.
+
+    Fehlerergebnisse (``error`` im Resultat) werden nicht gecacht.
+    """
+
+    def __init__(self, evaluator, cache: EvaluationCache):
+        self.evaluator = evaluator
+        self.cache = cache
+        self.model = getattr(evaluator, "MODEL", type(evaluator).__name__)
+        self.prompt_version = str(getattr(evaluator, "PROMPT_VERSION", "1"))
+
+    def __getattr__(self, name):
+        return getattr(self.evaluator, name)
+
+    def cache_key(self, transcript: str) -> str:
+        return evaluation_cache_key(transcript, self.prompt_version, self.model)
+
+    def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
+        cache_key = self.cache_key(transcript)
+        cached = self._lookup(cache_key)
+        if cached is not None:
+            return cached
+
+        evaluation = self.evaluator.evaluate_interview(transcript)
+        self._store(cache_key, evaluation)
+        return evaluation
+
+    def _lookup(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.cache.get(cache_key)
+        except Exception as exc:
+            # Cache-Probleme dürfen die Bewertung nie verhindern
+            print(f"[WARN] Evaluation cache lookup failed: {exc}")
+            return None
+
+    def _store(self, cache_key: str, evaluation: Dict[str, Any]):
+        if not evaluation or evaluation.get("error"):
+            return
+        try:
+            self.cache.put(cache_key, evaluation, self.model, self.prompt_version)
+        except Exception as exc:
+            print(f"[WARN] Evaluation cache store failed: {exc}")
+
+
+class AsyncCachedEvaluator(CachedEvaluator):
+    """Async-Variante für die FastAPI-App; Cache-Zugriffe laufen im Thread."""
+
+    async def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
+        cache_key = self.cache_key(transcript)
+        cached = await asyncio.to_thread(self._lookup, cache_key)
+        if cached is not None:
+            return cached
+
+        evaluation = await self.evaluator.evaluate_interview(transcript)
+        await asyncio.to_thread(self._store, cache_key, evaluation)
+        return evaluation
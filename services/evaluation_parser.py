@@ -0,0 +1,190 @@
+"""
+Evaluation Parser - Toleranter JSON-Parser für LLM-Bewertungen
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, Tuple
+
+from services.metrics import metrics
+from services.scoring import DIMENSIONS
+
+FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"', "‟": '"'})
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+PARSE_FAILURE_ERROR = "JSON-Parsing fehlgeschlagen"
+RECOMMENDATIONS = ("EINLADEN", "ABLEHNEN", "UNENTSCHIEDEN")
+# Wird beim Retry an den Prompt gehängt
+STRICT_JSON_INSTRUCTION = (
+    "\n\nWICHTIG: Antworte ausschließlich mit dem JSON-Objekt - ohne Markdown, "
+    "ohne Codeblock und ohne Text davor oder danach."
+)
+
+
+def structured_output_enabled() -> bool:
+    """``EVALUATION_STRUCTURED_OUTPUT``: JSON-Modus des Providers nutzen (Standard an)"""
+    return os.getenv('EVALUATION_STRUCTURED_OUTPUT', '1').lower() not in ('0', 'false', 'no')
+
+
+def parse_retries() -> int:
+    """``EVALUATION_PARSE_RETRIES``: erneute LLM-Calls bei unbrauchbarem JSON (Standard 1)"""
+    return int(os.getenv('EVALUATION_PARSE_RETRIES', '1'))
+
+
+class EvaluationParseError(ValueError):
+    """Antwort enthält kein verwertbares Bewertungs-JSON."""
+
+
+def _extract_object(text: str) -> Tuple[str, bool]:
+    """Schneidet das erste JSON-Objekt aus ``text`` aus.
+
+    Zählt Klammern außerhalb von Strings; bricht die Antwort ab (``max_tokens``),
+    werden offene Strings und Klammern geschlossen. Gibt (Objekt, abgeschnitten?) zurück.
+    """
+    start = text.find("{")
+    if start < 0:
+        raise EvaluationParseError("Kein JSON-Objekt in der Antwort")
+
+    stack = []
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return text[start:index + 1], False
+
+    # Abgeschnittene Antwort vervollständigen
+    candidate = text[start:].rstrip()
+    if in_string:
+        candidate += '"'
+    candidate = candidate.rstrip().rstrip(",:")
+    return candidate + "".join(reversed(stack)), True
+
+
+def _replace_python_literals(candidate: str) -> str:
+    """True/False/None außerhalb von Strings durch JSON-Literale ersetzen"""
+    parts = re.split(r'("(?:[^"\\]|\\.)*")', candidate)
+    for index in range(0, len(parts), 2):
+        parts[index] = re.sub(r"\b(True|False|None)\b", lambda match: PYTHON_LITERALS[match.group(1)], parts[index])
+    return "".join(parts)
+
+
+def repair_json_object(text: str) -> Tuple[Dict[str, Any], bool]:
+    """Parst ein JSON-Objekt aus einer LLM-Antwort. Gibt (Objekt, repariert?) zurück.
+
+    Schneller Pfad ist ``json.loads``; danach Markdown-Fences, umgebender
+    Text, typografische Anführungszeichen, Python-Literale und abschließende
+    Kommas. Wirft ``EvaluationParseError`` - auch bei abgeschnittenen
+    Antworten (``max_tokens``): deren Werte können mitten im Wort enden,
+    der Aufrufer soll dann mit striktem JSON neu anfragen.
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise EvaluationParseError("Leere Antwort")
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, dict):
+            return parsed, False
+    except ValueError:
+        pass
+
+    fenced = FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1)
+    candidate, truncated = _extract_object(text)
+    if truncated:
+        raise EvaluationParseError("Antwort abgeschnitten")
+
+    repairs = (
+        lambda value: value,
+        lambda value: value.translate(SMART_QUOTES),
+        _replace_python_literals,
+        lambda value: TRAILING_COMMA_PATTERN.sub(r"\1", value),
+    )
+    for repair in repairs:
+        candidate = repair(candidate)
+        try:
+            # strict=False erlaubt Zeilenumbrüche in Strings
+            parsed = json.loads(candidate, strict=False)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed, True
+    raise EvaluationParseError("JSON konnte nicht repariert werden")
+
+
+def _is_score(value: Any) -> bool:
+    # Wie services.scoring: alles, was float() versteht (auch "7")
+    if value is None or isinstance(value, bool):
+        return False
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def validate_evaluation(evaluation: Dict[str, Any]):
+    """Prüft das Bewertungsschema: gültige Empfehlung, Gesamtscore und alle Einzelbewertungen mit Score.
+
+    Wirft ``EvaluationParseError``.
+    """
+    gesamt = evaluation.get("gesamtbewertung")
+    if not isinstance(gesamt, dict):
+        raise EvaluationParseError("gesamtbewertung fehlt")
+    if gesamt.get("empfehlung") not in RECOMMENDATIONS:
+        raise EvaluationParseError(f"Ungültige Empfehlung: {gesamt.get('empfehlung')!r}")
+    if not _is_score(gesamt.get("score")):
+        raise EvaluationParseError("gesamtbewertung.score fehlt")
+    einzel = evaluation.get("einzelbewertungen")
+    if not isinstance(einzel, dict):
+        raise EvaluationParseError("einzelbewertungen fehlt")
+    missing = [
+        dimension for dimension in DIMENSIONS
+        if not isinstance(einzel.get(dimension), dict) or not _is_score(einzel[dimension].get("score"))
+    ]
+    if missing:
+        raise EvaluationParseError(f"Einzelbewertungen unvollständig: {', '.join(missing)}")
+
+
+def parse_evaluation(text: str, source: str = "evaluation") -> Dict[str, Any]:
+    """Bewertungs-JSON aus einer Modellantwort; zählt direkte, reparierte und
+    fehlgeschlagene Parses unter ``<source>.parse.*``."""
+    try:
+        evaluation, repaired = repair_json_object(text)
+        validate_evaluation(evaluation)
+    except EvaluationParseError:
+        metrics.increment(f"{source}.parse.failed")
+        raise
+    metrics.increment(f"{source}.parse.{'repaired' if repaired else 'direct'}")
+    return evaluation
+
+
+def parse_failure_result(text: str) -> Dict[str, Any]:
+    """Bisheriges Fallback-Ergebnis, wenn auch nach Retries kein JSON vorliegt"""
+    return {
+        "gesamtbewertung": {"score": 5, "empfehlung": "UNENTSCHIEDEN"},
+        "zusammenfassung": text,
+        "error": PARSE_FAILURE_ERROR,
+    }
+
+
+def is_parse_failure(result: Dict[str, Any]) -> bool:
+    return result.get("error") == PARSE_FAILURE_ERROR
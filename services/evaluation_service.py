@@ -1,10 +1,27 @@
 import openai
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from services.evaluation_parser import (
+    STRICT_JSON_INSTRUCTION,
+    EvaluationParseError,
+    parse_evaluation,
+    parse_failure_result,
+    parse_retries,
+    structured_output_enabled,
+)
+from services.metrics import metrics
+from services.scoring import scoring_engine
 
 class InterviewEvaluator:
+    MODEL = "gpt-4-turbo"
+    PROMPT_VERSION = "1"  # Bei Prompt-Änderungen erhöhen (Teil des Cache-Keys)
+    SYSTEM_PROMPT = "Du bist ein erfahrener HR-Experte, der Interview-Transkripte bewertet."
+
     def __init__(self):
         openai.api_key = os.getenv('OPENAI_API_KEY')
+        self.structured_output = structured_output_enabled()
+        self.parse_retries = parse_retries()
     
     def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
         """
@@ -17,8 +34,39 @@ class InterviewEvaluator:
         4. Cultural Fit (1-10)
         5. Problemlösungsfähigkeit (1-10)
         """
-        
-        prompt = f"""
+        try:
+            evaluation_text = ""
+            for attempt in range(self.parse_retries + 1):
+                response = openai.chat.completions.create(**self._build_request(transcript, strict=attempt > 0))
+                evaluation_text = response.choices[0].message.content
+                try:
+                    return parse_evaluation(evaluation_text, "openai")
+                except EvaluationParseError:
+                    if attempt < self.parse_retries:
+                        metrics.increment("openai.parse.retry")
+            return parse_failure_result(evaluation_text)
+                
+        except Exception as e:
+            return self._error_result(e)
+
+    def _build_request(self, transcript: str, strict: bool = False) -> Dict[str, Any]:
+        prompt = self._build_prompt(transcript)
+        request = {
+            "model": self.MODEL,
+            "messages": [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt + STRICT_JSON_INSTRUCTION if strict else prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 1500
+        }
+        if self.structured_output:
+            # JSON-Modus: die API liefert garantiert ein syntaktisch gültiges Objekt
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def _build_prompt(self, transcript: str) -> str:
+        return f"""
 Analysiere das folgende Interview-Transkript und erstelle eine strukturierte Bewertung:
 
 TRANSKRIPT:
@@ -62,51 +110,43 @@ Erstelle eine Bewertung im folgenden JSON-Format:
 Bewerte objektiv und fair. Berücksichtige deutsche Arbeitskultur und -standards. Gebe auch eine ausfürhliche Angabe wieso du was bewertet hast.
 """
 
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        return {
+            "error": f"Bewertung fehlgeschlagen: {str(error)}",
+            "gesamtbewertung": {"score": 0, "empfehlung": "FEHLER"}
+        }
+    
+    def calculate_overall_score(self, einzelbewertungen: Dict, position: Optional[str] = None) -> float:
+        """Berechnet Gesamtscore aus Einzelbewertungen mit Gewichtung (Profil je Position, services.scoring)"""
+        return scoring_engine.score(einzelbewertungen, position)
+
+
+class AsyncInterviewEvaluator(InterviewEvaluator):
+    """Async-Variante: blockiert den Event-Loop während des LLM-Calls nicht"""
+
+    def __init__(self):
+        super().__init__()
+        self._client = None
+
+    @property
+    def client(self) -> "openai.AsyncOpenAI":
+        # Lazy, damit der Import ohne API-Key nicht scheitert
+        if self._client is None:
+            self._client = openai.AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        return self._client
+
+    async def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
         try:
-            response = openai.chat.completions.create(
-                model="gpt-4-turbo",
-                messages=[
-                    {"role": "system", "content": "Du bist ein erfahrener HR-Experte, der Interview-Transkripte bewertet."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1500
-            )
-            
-            evaluation_text = response.choices[0].message.content
-            
-            # JSON parsen (vereinfacht - in Produktion robuster implementieren)
-            import json
-            try:
-                evaluation_data = json.loads(evaluation_text)
-                return evaluation_data
-            except:
-                # Fallback falls JSON-Parsing fehlschlägt
-                return {
-                    "gesamtbewertung": {"score": 5, "empfehlung": "UNENTSCHIEDEN"},
-                    "zusammenfassung": evaluation_text,
-                    "error": "JSON-Parsing fehlgeschlagen"
-                }
-                
+            evaluation_text = ""
+            for attempt in range(self.parse_retries + 1):
+                response = await self.client.chat.completions.create(**self._build_request(transcript, strict=attempt > 0))
+                evaluation_text = response.choices[0].message.content
+                try:
+                    return parse_evaluation(evaluation_text, "openai")
+                except EvaluationParseError:
+                    if attempt < self.parse_retries:
+                        metrics.increment("openai.parse.retry")
+            return parse_failure_result(evaluation_text)
+
         except Exception as e:
-            return {
-                "error": f"Bewertung fehlgeschlagen: {str(e)}",
-                "gesamtbewertung": {"score": 0, "empfehlung": "FEHLER"}
-            }
-    
-    def calculate_overall_score(self, einzelbewertungen: Dict) -> float:
-        """Berechnet Gesamtscore aus Einzelbewertungen mit Gewichtung"""
-        weights = {
-            "kommunikation": 0.25,
-            "fachkompetenz": 0.30,
-            "motivation": 0.20,
-            "cultural_fit": 0.15,
-            "problemloesung": 0.10
-        }
-        
-        weighted_score = sum(
-            einzelbewertungen.get(key, {}).get("score", 0) * weight
-            for key, weight in weights.items()
-        )
-        
-        return round(weighted_score, 2)
\ No newline at end of file
+            return self._error_result(e)
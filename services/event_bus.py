@@ -0,0 +1,173 @@
+"""
+Event Bus - In-Process Pub/Sub für Server-Sent Events ans Dashboard
+"""
+
+import asyncio
+import json
+import os
+import queue
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+# Wird gesendet, wenn ein Client Events verpasst hat - das Dashboard lädt dann die Liste neu
+RESYNC_EVENT = "resync"
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Ein Event im text/event-stream Format"""
+    lines = []
+    if event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event.get('data'), ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class _Subscription:
+    """Begrenzte Queue pro Client. Läuft sie über (langsamer Client), wird sie
+    geleert und durch ein ``resync``-Event ersetzt statt den Publisher zu blockieren."""
+
+    def __init__(self, bus: "EventBus", queue_size: int):
+        self.bus = bus
+        self.queue_size = queue_size
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+    def _resync_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        self.bus._record_resync()
+        return {"id": event["id"], "type": RESYNC_EVENT, "data": None}
+
+
+class Subscription(_Subscription):
+    """Synchrone Subscription (Flask, ein Thread pro Stream)."""
+
+    def __init__(self, bus: "EventBus", queue_size: int):
+        super().__init__(bus, queue_size)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+
+    def deliver(self, event: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(self._resync_event(event))
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Nächstes Event oder ``None`` nach ``timeout`` (Keepalive senden)."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription(_Subscription):
+    """Subscription für die FastAPI-App; ``deliver`` ist aus jedem Thread aufrufbar."""
+
+    def __init__(self, bus: "EventBus", queue_size: int, loop: asyncio.AbstractEventLoop):
+        super().__init__(bus, queue_size)
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, event: Dict[str, Any]):
+        self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(self._resync_event(event))
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """Verteilt Session-Änderungen an alle offenen Dashboard-Streams.
+
+    Die letzten ``history_size`` Events werden gehalten, damit ein
+    reconnectender ``EventSource`` über ``Last-Event-ID`` nachholen kann.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None, max_subscribers: Optional[int] = None,
+                 history_size: int = 200):
+        self.queue_size = queue_size or int(os.getenv('EVENT_QUEUE_SIZE', '100'))
+        self.max_subscribers = max_subscribers or int(os.getenv('EVENT_MAX_SUBSCRIBERS', '100'))
+        self.keepalive_seconds = float(os.getenv('EVENT_KEEPALIVE_SECONDS', '15'))
+
+        # Zustellung unter dem Lock hält die Reihenfolge pro Client (deliver blockiert nie)
+        self._lock = threading.RLock()
+        self._subscribers: List[_Subscription] = []
+        self._history: deque = deque(maxlen=history_size)
+        self._next_id = 1
+        self._published = 0
+        self._resyncs = 0
+
+    def publish(self, event_type: str, data: Any) -> int:
+        """Thread-safe; blockiert nie auf langsame Clients."""
+        with self._lock:
+            event = {"id": self._next_id, "type": event_type, "data": data}
+            self._next_id += 1
+            self._published += 1
+            self._history.append(event)
+            for subscriber in self._subscribers:
+                subscriber.deliver(event)
+        return event["id"]
+
+    def subscribe(self, last_event_id: Any = None) -> Optional[Subscription]:
+        """Sync-Subscription oder ``None``, wenn ``max_subscribers`` erreicht ist."""
+        return self._register(Subscription(self, self.queue_size), last_event_id)
+
+    def subscribe_async(self, last_event_id: Any = None) -> Optional[AsyncSubscription]:
+        """Async-Subscription im laufenden Event-Loop (oder ``None``, wenn voll)."""
+        return self._register(AsyncSubscription(self, self.queue_size, asyncio.get_running_loop()), last_event_id)
+
+    def _register(self, subscription, last_event_id):
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.append(subscription)
+            for event in self._missed_events(last_event_id):
+                subscription.deliver(event)
+        return subscription
+
+    def _missed_events(self, last_event_id) -> List[Dict[str, Any]]:
+        try:
+            last_id = int(last_event_id)
+        except (TypeError, ValueError):
+            return []
+        if last_id >= self._next_id - 1:
+            return []
+        if not self._history or last_id < self._history[0]["id"] - 1:
+            # Lücke größer als die History - Client muss neu laden
+            self._resyncs += 1
+            return [{"id": self._next_id - 1, "type": RESYNC_EVENT, "data": None}]
+        return [event for event in self._history if event["id"] > last_id]
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def _record_resync(self):
+        with self._lock:
+            self._resyncs += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "max_subscribers": self.max_subscribers,
+                "published": self._published,
+                "resyncs": self._resyncs,
+            }
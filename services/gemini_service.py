@@ -1,24 +1,101 @@
-﻿import json
+﻿import asyncio
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Any, Dict, Optional
 
 import google.generativeai as genai
 
+from config.server import per_worker
+from services.evaluation_parser import (
+    STRICT_JSON_INSTRUCTION,
+    EvaluationParseError,
+    is_parse_failure,
+    parse_evaluation,
+    parse_failure_result,
+    parse_retries,
+    structured_output_enabled,
+)
+from services.metrics import metrics
+from services.scoring import scoring_engine
+
+
+def hedge_delay_from_env() -> Optional[float]:
+    """``GEMINI_HEDGE_DELAY_SECONDS``: Verzögerung bis zum Start des Zweitmodells (leer = sequenzieller Fallback)"""
+    value = os.getenv("GEMINI_HEDGE_DELAY_SECONDS", "")
+    return float(value) if value else None
+
+
+# Fehlermeldungen, an denen ein abgelehnter JSON-Modus erkannt wird
+JSON_MODE_ERROR_MARKERS = ("response_mime_type", "mime type", "json mode")
+
+
+def json_generation_config():
+    """GenerationConfig mit JSON-Ausgabe oder ``None``, wenn das SDK
+    ``response_mime_type`` noch nicht kennt (google-generativeai < 0.5)."""
+    try:
+        return genai.GenerationConfig(response_mime_type="application/json")
+    except (TypeError, ValueError):
+        return None
+
 
 class GeminiEvaluator:
-    """Gemini-basierte Interviewbewertung mit Modell-Fallback."""
+    """Gemini-basierte Interviewbewertung mit Modell-Fallback.
+
+    Mit ``hedge_delay`` (Sekunden) wird das Zweitmodell gestartet, wenn das
+    erste nach dieser Zeit noch keine gültige Antwort geliefert hat; die erste
+    gültige JSON-Antwort gewinnt.
+
+    Kosten: Das synchrone SDK kann einen laufenden Call nicht abbrechen - der
+    langsamere Request läuft im Hedge-Pool zu Ende und wird bezahlt, sein
+    Ergebnis verworfen. Jeder ausgelöste Hedge (``gemini.hedge.fired``) kostet
+    hier also zwei Calls. ``AsyncGeminiEvaluator`` (FastAPI) bricht den
+    Verlierer dagegen ab.
+    """
 
     MODEL_CANDIDATES = (
         "gemini-1.5-pro",
         "gemini-1.5-flash",
     )
+    MODEL = "+".join(MODEL_CANDIDATES)
+    PROMPT_VERSION = "1"  # Bei Prompt-Änderungen erhöhen (Teil des Cache-Keys)
 
-    def __init__(self):
+    def __init__(self, hedge_delay: Optional[float] = None):
         genai.configure(api_key=os.getenv("OPENAI_API_KEY"))
         self._model_cache: Dict[str, Any] = {}
+        self.hedge_delay = hedge_delay if hedge_delay is not None else hedge_delay_from_env()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.hedge_delay is not None:
+            # Pro paralleler Bewertung (PROCESSING_WORKERS) ein Thread je Modell, auch für noch laufende Verlierer
+            max_workers = int(os.getenv('GEMINI_HEDGE_MAX_WORKERS') or
+                              per_worker('PROCESSING_WORKERS', 4) * len(self.MODEL_CANDIDATES))
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini-hedge")
+        self.generation_config = json_generation_config() if structured_output_enabled() else None
+        # Modelle, die den JSON-Modus abgelehnt haben, laufen ohne generation_config
+        self._plain_models: set = set()
+        self.parse_retries = parse_retries()
 
     def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
-        prompt = f"""
+        try:
+            prompt = self._build_prompt(transcript)
+            result = self._evaluate_prompt(prompt)
+            for _ in range(self.parse_retries):
+                if not is_parse_failure(result):
+                    break
+                metrics.increment("gemini.parse.retry")
+                result = self._evaluate_prompt(prompt + STRICT_JSON_INSTRUCTION)
+            return result
+
+        except Exception as exc:
+            return self._error_result(exc)
+
+    def _evaluate_prompt(self, prompt: str) -> Dict[str, Any]:
+        if self.hedge_delay is not None:
+            return self._evaluate_hedged(prompt)
+        return self._parse_response(self._generate_with_fallback(prompt))
+
+    def _build_prompt(self, transcript: str) -> str:
+        return f"""
 Analysiere das folgende Interview-Transkript und erstelle eine strukturierte Bewertung:
 
 TRANSKRIPT:
@@ -26,89 +103,244 @@ TRANSKRIPT:
 
 Erstelle eine Bewertung im folgenden JSON-Format:
 
-{
-    "gesamtbewertung": {
+{{
+    "gesamtbewertung": {{
         "score": [1-10],
         "empfehlung": "EINLADEN/ABLEHNEN/UNENTSCHIEDEN"
-    },
-    "einzelbewertungen": {
-        "kommunikation": {
+    }},
+    "einzelbewertungen": {{
+        "kommunikation": {{
             "score": [1-10],
             "kommentar": "..."
-        },
-        "fachkompetenz": {
+        }},
+        "fachkompetenz": {{
             "score": [1-10],
             "kommentar": "..."
-        },
-        "motivation": {
+        }},
+        "motivation": {{
             "score": [1-10],
             "kommentar": "..."
-        },
-        "cultural_fit": {
+        }},
+        "cultural_fit": {{
             "score": [1-10],
             "kommentar": "..."
-        },
-        "problemloesung": {
+        }},
+        "problemloesung": {{
             "score": [1-10],
             "kommentar": "..."
-        }
-    },
+        }}
+    }},
     "zusammenfassung": "Kurze Zusammenfassung der wichtigsten Punkte",
     "staerken": ["Stärke 1", "Stärke 2", "..."],
     "schwaechen": ["Schwäche 1", "Schwäche 2", "..."],
     "naechste_schritte": "Empfehlung für weiteres Vorgehen"
-}
+}}
 
 Bewerte objektiv und fair. Berücksichtige deutsche Arbeitskultur und -standards.
 """
 
+    def _parse_response(self, response) -> Dict[str, Any]:
+        evaluation_text = getattr(response, "text", "")
+        if not evaluation_text:
+            raise ValueError("Gemini response contained no text")
+
+        try:
+            return parse_evaluation(evaluation_text, "gemini")
+        except EvaluationParseError:
+            return parse_failure_result(evaluation_text)
+
+    def _error_result(self, exc: Exception) -> Dict[str, Any]:
+        return {
+            "error": f"Bewertung fehlgeschlagen: {exc}",
+            "gesamtbewertung": {"score": 0, "empfehlung": "FEHLER"},
+        }
+
+    def _get_model(self, model_name: str):
+        model = self._model_cache.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            self._model_cache[model_name] = model
+        return model
+
+    def _observe(self, model_name: str, started: float, outcome: str):
+        metrics.observe(f"gemini.{model_name}", (time.perf_counter() - started) * 1000)
+        metrics.increment(f"gemini.{model_name}.{outcome}")
+
+    def _generation_kwargs(self, model_name: str) -> Dict[str, Any]:
+        if self.generation_config is None or model_name in self._plain_models:
+            return {}
+        return {"generation_config": self.generation_config}
+
+    def _json_mode_rejected(self, model_name: str, exc: Exception) -> bool:
+        """Lehnt ein Modell ``response_mime_type`` ab, wird es ab jetzt ohne JSON-Modus aufgerufen."""
+        if model_name in self._plain_models or self.generation_config is None:
+            return False
+        message = str(exc).lower()
+        if not any(marker in message for marker in JSON_MODE_ERROR_MARKERS):
+            return False
+        self._plain_models.add(model_name)
+        metrics.increment(f"gemini.{model_name}.json_mode_unsupported")
+        return True
+
+    def _generate(self, model_name: str, prompt: str):
+        started = time.perf_counter()
         try:
-            response = self._generate_with_fallback(prompt)
-            evaluation_text = getattr(response, "text", "")
-            if not evaluation_text:
-                raise ValueError("Gemini response contained no text")
+            try:
+                response = self._get_model(model_name).generate_content(prompt, **self._generation_kwargs(model_name))
+            except Exception as exc:
+                if not self._json_mode_rejected(model_name, exc):
+                    raise
+                response = self._get_model(model_name).generate_content(prompt)
+        except Exception:
+            self._observe(model_name, started, "error")
+            self._model_cache.pop(model_name, None)
+            raise
+        self._observe(model_name, started, "ok")
+        return response
 
+    def _generate_with_fallback(self, prompt: str):
+        last_error: Optional[Exception] = None
+        for model_name in self.MODEL_CANDIDATES:
             try:
-                return json.loads(evaluation_text)
-            except json.JSONDecodeError:
-                return {
-                    "gesamtbewertung": {"score": 5, "empfehlung": "UNENTSCHIEDEN"},
-                    "zusammenfassung": evaluation_text,
-                    "error": "JSON-Parsing fehlgeschlagen",
-                }
+                return self._generate(model_name, prompt)
+            except Exception as exc:
+                last_error = exc
+        raise last_error if last_error else RuntimeError("Keine Gemini-Modelle verfügbar")
+
+    def _attempt(self, model_name: str, prompt: str) -> Dict[str, Any]:
+        """Ein Modell-Call inkl. Parsing (für Hedging: Gültigkeit = JSON ohne ``error``)"""
+        return self._parse_response(self._generate(model_name, prompt))
+
+    def _evaluate_hedged(self, prompt: str) -> Dict[str, Any]:
+        primary, *secondaries = self.MODEL_CANDIDATES
+        pending = {self._executor.submit(self._attempt, primary, prompt): primary}
+        fallback_result: Optional[Dict[str, Any]] = None
+        last_error: Optional[Exception] = None
+        deadline = time.monotonic() + self.hedge_delay
+
+        while pending or secondaries:
+            timeout = max(0.0, deadline - time.monotonic()) if secondaries else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                model_name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    last_error = exc
+                    continue
+                if "error" not in result:
+                    # Verlierer laufen im Thread zu Ende (sync SDK), das Ergebnis wird verworfen
+                    for other in pending:
+                        other.cancel()
+                    metrics.increment(f"gemini.hedge.won.{model_name}")
+                    return result
+                fallback_result = fallback_result or result
+
+            # Zweitmodell nach Ablauf der Verzögerung oder sofort, wenn alle laufenden gescheitert sind
+            if secondaries and (not pending or time.monotonic() >= deadline):
+                model_name = secondaries.pop(0)
+                pending[self._executor.submit(self._attempt, model_name, prompt)] = model_name
+                metrics.increment("gemini.hedge.fired")
+                deadline = time.monotonic() + self.hedge_delay
+
+        if fallback_result is not None:
+            return fallback_result
+        raise last_error if last_error else RuntimeError("Keine Gemini-Modelle verfügbar")
+
+    def calculate_overall_score(self, einzelbewertungen: Dict, position: Optional[str] = None) -> float:
+        return scoring_engine.score(einzelbewertungen, position)
+
+
+class AsyncGeminiEvaluator(GeminiEvaluator):
+    """Async-Variante über ``generate_content_async`` (kein blockierter Event-Loop)."""
+
+    async def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
+        try:
+            prompt = self._build_prompt(transcript)
+            result = await self._evaluate_prompt_async(prompt)
+            for _ in range(self.parse_retries):
+                if not is_parse_failure(result):
+                    break
+                metrics.increment("gemini.parse.retry")
+                result = await self._evaluate_prompt_async(prompt + STRICT_JSON_INSTRUCTION)
+            return result
 
         except Exception as exc:
-            return {
-                "error": f"Bewertung fehlgeschlagen: {exc}",
-                "gesamtbewertung": {"score": 0, "empfehlung": "FEHLER"},
-            }
+            return self._error_result(exc)
 
-    def _generate_with_fallback(self, prompt: str):
+    async def _evaluate_prompt_async(self, prompt: str) -> Dict[str, Any]:
+        if self.hedge_delay is not None:
+            return await self._evaluate_hedged_async(prompt)
+        return self._parse_response(await self._generate_with_fallback_async(prompt))
+
+    async def _generate_async(self, model_name: str, prompt: str):
+        started = time.perf_counter()
+        try:
+            try:
+                response = await self._get_model(model_name).generate_content_async(
+                    prompt, **self._generation_kwargs(model_name)
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if not self._json_mode_rejected(model_name, exc):
+                    raise
+                response = await self._get_model(model_name).generate_content_async(prompt)
+        except asyncio.CancelledError:
+            metrics.increment(f"gemini.{model_name}.cancelled")
+            raise
+        except Exception:
+            self._observe(model_name, started, "error")
+            self._model_cache.pop(model_name, None)
+            raise
+        self._observe(model_name, started, "ok")
+        return response
+
+    async def _generate_with_fallback_async(self, prompt: str):
         last_error: Optional[Exception] = None
         for model_name in self.MODEL_CANDIDATES:
             try:
-                model = self._model_cache.get(model_name)
-                if model is None:
-                    model = genai.GenerativeModel(model_name)
-                    self._model_cache[model_name] = model
-                return model.generate_content(prompt)
+                return await self._generate_async(model_name, prompt)
             except Exception as exc:
                 last_error = exc
-                self._model_cache.pop(model_name, None)
         raise last_error if last_error else RuntimeError("Keine Gemini-Modelle verfügbar")
 
-    def calculate_overall_score(self, einzelbewertungen: Dict) -> float:
-        weights = {
-            "kommunikation": 0.25,
-            "fachkompetenz": 0.30,
-            "motivation": 0.20,
-            "cultural_fit": 0.15,
-            "problemloesung": 0.10,
-        }
+    async def _attempt_async(self, model_name: str, prompt: str) -> Dict[str, Any]:
+        return self._parse_response(await self._generate_async(model_name, prompt))
 
-        weighted_score = sum(
-            einzelbewertungen.get(key, {}).get("score", 0) * weight
-            for key, weight in weights.items()
-        )
+    async def _evaluate_hedged_async(self, prompt: str) -> Dict[str, Any]:
+        primary, *secondaries = self.MODEL_CANDIDATES
+        pending = {asyncio.ensure_future(self._attempt_async(primary, prompt)): primary}
+        fallback_result: Optional[Dict[str, Any]] = None
+        last_error: Optional[Exception] = None
+        deadline = time.monotonic() + self.hedge_delay
 
-        return round(weighted_score, 2)
+        try:
+            while pending or secondaries:
+                timeout = max(0.0, deadline - time.monotonic()) if secondaries else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model_name = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as exc:
+                        last_error = exc
+                        continue
+                    if "error" not in result:
+                        metrics.increment(f"gemini.hedge.won.{model_name}")
+                        return result
+                    fallback_result = fallback_result or result
+
+                if secondaries and (not pending or time.monotonic() >= deadline):
+                    model_name = secondaries.pop(0)
+                    pending[asyncio.ensure_future(self._attempt_async(model_name, prompt))] = model_name
+                    metrics.increment("gemini.hedge.fired")
+                    deadline = time.monotonic() + self.hedge_delay
+        finally:
+            # Verlierer-Requests abbrechen
+            for task in pending:
+                task.cancel()
+
+        if fallback_result is not None:
+            return fallback_result
+        raise last_error if last_error else RuntimeError("Keine Gemini-Modelle verfügbar")
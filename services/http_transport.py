@@ -0,0 +1,290 @@
+"""
+HTTP Transport - Gepoolte Keep-Alive-Verbindungen mit Timeouts und Retries
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config.server import per_worker
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str], backoff_base: float, backoff_max: float) -> float:
+    """Wartezeit vor dem nächsten Versuch: Retry-After oder Full-Jitter-Backoff."""
+    delay = None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            delay = None
+    if delay is None:
+        # Full Jitter: zufällig zwischen 0 und exponentiellem Limit
+        delay = random.uniform(0, min(backoff_max, backoff_base * (2 ** attempt)))
+    return min(delay, backoff_max)
+
+
+def _counting_pool_classes(on_connect):
+    """urllib3-Pool-Klassen, die jeden echten Verbindungsaufbau melden."""
+
+    class CountingHTTPConnection(HTTPConnection):
+        def connect(self):
+            on_connect()
+            return super().connect()
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            on_connect()
+            return super().connect()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    return {"http": CountingHTTPConnectionPool, "https": CountingHTTPSConnectionPool}
+
+
+class HttpTransport:
+    """Geteilte ``requests.Session`` mit Connection-Pool.
+
+    Verbindungen werden über Requests hinweg wiederverwendet (kein TCP/TLS-
+    Handshake pro Call). 429/5xx und Verbindungsfehler werden mit
+    exponentiellem Backoff plus Jitter wiederholt, ``Retry-After`` wird
+    respektiert. Nicht-idempotente Requests (z.B. ``POST /call``) werden nur
+    bei 429 oder Connect-Timeout wiederholt, damit kein Anruf doppelt startet.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: float = 10.0,
+    ):
+        self.pool_size = pool_size or per_worker('HTTP_POOL_SIZE', 10, minimum=2)
+        self.connect_timeout = connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05'))
+        self.read_timeout = read_timeout or float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('HTTP_MAX_RETRIES', '3'))
+        self.backoff_base = backoff_base or float(os.getenv('HTTP_BACKOFF_BASE', '0.5'))
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        # Retries übernimmt request() selbst, damit Jitter und Zähler stimmen
+        self._adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=0,
+        )
+        self._adapter.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self._on_connect)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._errors = 0
+        self._connections = 0
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """Führt einen Request aus, mit Retries bei 429/5xx und Verbindungsfehlern."""
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_errors = (requests.ConnectionError, requests.Timeout) if idempotent else (requests.ConnectTimeout,)
+        retry_codes = RETRY_STATUS_CODES if idempotent else {429}
+
+        attempt = 0
+        while True:
+            with self._lock:
+                self._requests += 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except retry_errors:
+                if attempt >= self.max_retries:
+                    with self._lock:
+                        self._errors += 1
+                    raise
+                self._sleep_before_retry(attempt)
+                attempt += 1
+                continue
+
+            if response.status_code in retry_codes and attempt < self.max_retries:
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+                self._sleep_before_retry(attempt, retry_after)
+                attempt += 1
+                continue
+
+            return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def _on_connect(self):
+        with self._lock:
+            self._connections += 1
+
+    def _sleep_before_retry(self, attempt: int, retry_after: Optional[str] = None):
+        with self._lock:
+            self._retries += 1
+        time.sleep(_retry_delay(attempt, retry_after, self.backoff_base, self.backoff_max))
+
+    def stats(self) -> Dict[str, Any]:
+        """Request-/Retry-Zähler und Anteil wiederverwendeter Verbindungen."""
+        with self._lock:
+            requests_sent = self._requests - self._errors
+            return {
+                "pool_size": self.pool_size,
+                "requests": self._requests,
+                "retries": self._retries,
+                "errors": self._errors,
+                "connections_opened": self._connections,
+                "connection_reuse_rate": (
+                    round(max(0.0, 1 - self._connections / requests_sent), 3) if requests_sent else 0.0
+                ),
+            }
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncHttpTransport:
+    """Async-Gegenstück zu ``HttpTransport`` auf Basis von ``httpx.AsyncClient``.
+
+    Gleiche Pool-, Timeout- und Retry-Einstellungen; für Clients, die im
+    FastAPI-Event-Loop laufen.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: float = 10.0,
+    ):
+        self.pool_size = pool_size or per_worker('HTTP_POOL_SIZE', 10, minimum=2)
+        self.connect_timeout = connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05'))
+        self.read_timeout = read_timeout or float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('HTTP_MAX_RETRIES', '3'))
+        self.backoff_base = backoff_base or float(os.getenv('HTTP_BACKOFF_BASE', '0.5'))
+        self.backoff_max = backoff_max
+
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            ),
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+        )
+
+        self._requests = 0
+        self._retries = 0
+        self._errors = 0
+        self._connections = 0
+
+    async def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> httpx.Response:
+        """Führt einen Request aus, mit Retries bei 429/5xx und Verbindungsfehlern."""
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_errors = (httpx.TransportError,) if idempotent else (httpx.ConnectTimeout, httpx.ConnectError)
+        retry_codes = RETRY_STATUS_CODES if idempotent else {429}
+        # httpcore meldet über "trace", wann wirklich eine neue Verbindung aufgebaut wird
+        kwargs["extensions"] = {**(kwargs.get("extensions") or {}), "trace": self._trace}
+
+        attempt = 0
+        while True:
+            self._requests += 1
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except retry_errors:
+                if attempt >= self.max_retries:
+                    self._errors += 1
+                    raise
+                await self._sleep_before_retry(attempt)
+                attempt += 1
+                continue
+
+            if response.status_code in retry_codes and attempt < self.max_retries:
+                retry_after = response.headers.get("Retry-After")
+                await response.aclose()
+                await self._sleep_before_retry(attempt, retry_after)
+                attempt += 1
+                continue
+
+            return response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        if event_name == "connection.connect_tcp.started":
+            self._connections += 1
+
+    async def _sleep_before_retry(self, attempt: int, retry_after: Optional[str] = None):
+        self._retries += 1
+        await asyncio.sleep(_retry_delay(attempt, retry_after, self.backoff_base, self.backoff_max))
+
+    def stats(self) -> Dict[str, Any]:
+        """Gleiche Kennzahlen wie ``HttpTransport.stats``."""
+        requests_sent = self._requests - self._errors
+        return {
+            "pool_size": self.pool_size,
+            "requests": self._requests,
+            "retries": self._retries,
+            "errors": self._errors,
+            "connections_opened": self._connections,
+            "connection_reuse_rate": (
+                round(max(0.0, 1 - self._connections / requests_sent), 3) if requests_sent else 0.0
+            ),
+        }
+
+    async def close(self):
+        await self.client.aclose()
+
+
+_shared_transport: Optional[HttpTransport] = None
+_shared_async_transport: Optional[AsyncHttpTransport] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport() -> HttpTransport:
+    """Prozessweit geteilter Transport (ein Connection-Pool für alle Clients)."""
+    global _shared_transport
+    if _shared_transport is None:
+        with _shared_lock:
+            if _shared_transport is None:
+                _shared_transport = HttpTransport()
+    return _shared_transport
+
+
+def get_shared_async_transport() -> AsyncHttpTransport:
+    """Prozessweit geteilter Async-Transport (muss im Event-Loop benutzt werden)."""
+    global _shared_async_transport
+    if _shared_async_transport is None:
+        with _shared_lock:
+            if _shared_async_transport is None:
+                _shared_async_transport = AsyncHttpTransport()
+    return _shared_async_transport
@@ -0,0 +1,247 @@
+"""
+Interview Queries - Paginierte Listenabfragen auf InterviewSession
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from sqlalchemy import and_, or_, select
+
+from config.database_sqlite import InterviewSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# updated_at setzt die App vor dem Commit: so lange kann eine Änderung nach ihrem Zeitstempel sichtbar werden
+CHANGES_LOOKBACK = timedelta(seconds=float(os.getenv('CHANGES_LOOKBACK_SECONDS', '60')))
+
+# Nur die Listenspalten laden - transcript und evaluation_data bleiben in der DB
+LIST_COLUMNS = (
+    InterviewSession.id,
+    InterviewSession.candidate_phone,
+    InterviewSession.position,
+    InterviewSession.status,
+    InterviewSession.evaluation_score,
+    InterviewSession.created_at,
+    InterviewSession.completed_at,
+)
+
+# Delta-Sync: Listenspalten plus was ein Sync-Client zum Abgleich braucht
+CHANGE_COLUMNS = LIST_COLUMNS + (
+    InterviewSession.vapi_call_id,
+    InterviewSession.recommendation,
+    InterviewSession.updated_at,
+)
+
+
+def _parse_int(value: Any, name: str) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+
+def _parse_datetime(value: Any, name: str) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    if not isinstance(value, datetime):
+        text = str(value)
+        # Browser senden UTC mit "Z" (datetime.fromisoformat kann das erst ab Python 3.11)
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        try:
+            value = datetime.fromisoformat(text)
+        except ValueError:
+            raise ValueError(f"{name} must be an ISO-8601 timestamp")
+    # Die Datenbank speichert naive UTC-Zeitstempel (datetime.utcnow)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def serialize_interview(row) -> Dict[str, Any]:
+    """Listeneintrag aus einer Zeile oder einem InterviewSession-Objekt (auch für Events)"""
+    return {
+        "id": row.id,
+        "candidate_phone": row.candidate_phone,
+        "position": row.position,
+        "status": row.status,
+        "score": row.evaluation_score,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+    }
+
+
+def serialize_change(row) -> Dict[str, Any]:
+    return {
+        **serialize_interview(row),
+        "call_id": row.vapi_call_id,
+        "recommendation": row.recommendation,
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+    }
+
+
+def build_list_query(
+    limit: Any = None,
+    after_id: Any = None,
+    before_created_at: Any = None,
+    before_id: Any = None,
+    status: Optional[str] = None,
+    position: Optional[str] = None,
+    recommendation: Optional[str] = None,
+):
+    """Baut das Keyset-Select und eine Funktion, die aus den Zeilen die Seite macht.
+
+    Ohne ``after_id`` wird absteigend nach ``created_at`` geblättert
+    (Cursor: ``before_created_at`` + ``before_id``), mit ``after_id``
+    aufsteigend nach ``id`` für Syncs.
+
+    Wirft ``ValueError`` bei ungültigen Parametern.
+    """
+    limit = _parse_int(limit, "limit") or DEFAULT_PAGE_SIZE
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    limit = min(limit, MAX_PAGE_SIZE)
+    after_id = _parse_int(after_id, "after_id")
+    before_id = _parse_int(before_id, "before_id")
+    before_created_at = _parse_datetime(before_created_at, "before_created_at")
+
+    stmt = select(*LIST_COLUMNS)
+    if status:
+        stmt = stmt.where(InterviewSession.status == status)
+    if position:
+        stmt = stmt.where(InterviewSession.position == position)
+    if recommendation:
+        stmt = stmt.where(InterviewSession.recommendation == recommendation)
+
+    if after_id is not None:
+        stmt = stmt.where(InterviewSession.id > after_id).order_by(InterviewSession.id.asc())
+    else:
+        if before_created_at is not None:
+            if before_id is not None:
+                stmt = stmt.where(or_(
+                    InterviewSession.created_at < before_created_at,
+                    and_(InterviewSession.created_at == before_created_at, InterviewSession.id < before_id),
+                ))
+            else:
+                stmt = stmt.where(InterviewSession.created_at < before_created_at)
+        stmt = stmt.order_by(InterviewSession.created_at.desc(), InterviewSession.id.desc())
+
+    # Eine Zeile mehr laden um zu wissen, ob es eine nächste Seite gibt
+    stmt = stmt.limit(limit + 1)
+
+    def to_page(rows) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_params: Optional[Dict[str, Any]] = None
+        if has_more and rows:
+            last = rows[-1]
+            if after_id is not None:
+                next_params = {"after_id": last.id}
+            else:
+                next_params = {"before_created_at": last.created_at.isoformat(), "before_id": last.id}
+            next_params["limit"] = limit
+            for key, value in (("status", status), ("position", position), ("recommendation", recommendation)):
+                if value:
+                    next_params[key] = value
+
+        next_cursor = urlencode(next_params) if next_params else None
+        return [serialize_interview(row) for row in rows], next_cursor
+
+    return stmt, to_page
+
+
+def list_interviews(db_session, **params) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Keyset-paginierte Interviewliste plus Query-String der nächsten Seite
+    (``None`` auf der letzten Seite). Parameter siehe ``build_list_query``."""
+    stmt, to_page = build_list_query(**params)
+    return to_page(db_session.execute(stmt).all())
+
+
+async def alist_interviews(db_session, **params) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Async-Variante von ``list_interviews`` für eine ``AsyncSession``."""
+    stmt, to_page = build_list_query(**params)
+    result = await db_session.execute(stmt)
+    return to_page(result.all())
+
+
+def build_changes_query(updated_after: Any = None, after_id: Any = None, limit: Any = None,
+                        now: Optional[datetime] = None):
+    """Keyset über (updated_at, id) aufsteigend: neue und geänderte Sessions.
+
+    Ohne ``updated_after`` beginnt der Sync beim ältesten Eintrag. Der
+    zurückgegebene Cursor bleibt auch bei leerer Seite gültig und wird beim
+    nächsten Aufruf unverändert übergeben. Wirft ``ValueError`` bei
+    ungültigen Parametern.
+
+    ``updated_at`` entsteht vor dem Commit; eine langsame Transaktion kann
+    also nach einer bereits gelesenen, späteren Zeile sichtbar werden. Auf
+    der letzten Seite steht der Cursor deshalb höchstens auf
+    ``now - CHANGES_LOOKBACK_SECONDS``: der nächste Aufruf liest dieses
+    Fenster erneut, Clients übernehmen Einträge idempotent per ``id`` und
+    ``updated_at``. Volle Seiten blättern ohne Überlappung weiter, so endet
+    jeder Sync-Durchlauf mit ``has_more == False``.
+    """
+    limit = _parse_int(limit, "limit") or DEFAULT_PAGE_SIZE
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    limit = min(limit, MAX_PAGE_SIZE)
+    updated_after = _parse_datetime(updated_after, "updated_after")
+    after_id = _parse_int(after_id, "after_id")
+    if after_id is not None and updated_after is None:
+        raise ValueError("after_id requires updated_after")
+
+    stmt = select(*CHANGE_COLUMNS).where(InterviewSession.updated_at.isnot(None))
+    if updated_after is not None:
+        if after_id is not None:
+            stmt = stmt.where(or_(
+                InterviewSession.updated_at > updated_after,
+                and_(InterviewSession.updated_at == updated_after, InterviewSession.id > after_id),
+            ))
+        else:
+            stmt = stmt.where(InterviewSession.updated_at > updated_after)
+    stmt = stmt.order_by(InterviewSession.updated_at.asc(), InterviewSession.id.asc()).limit(limit + 1)
+
+    horizon = (now or datetime.utcnow()) - CHANGES_LOOKBACK
+
+    def to_page(rows) -> Dict[str, Any]:
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            cursor = {"updated_after": rows[-1].updated_at, "after_id": rows[-1].id}
+        elif updated_after is not None:
+            cursor = {"updated_after": updated_after}
+            if after_id is not None:
+                cursor["after_id"] = after_id
+        else:
+            cursor = None
+        if cursor and not has_more and cursor["updated_after"] > horizon:
+            # Letzte Seite: Überlappungsfenster beim nächsten Aufruf erneut lesen
+            cursor = {"updated_after": horizon}
+        if cursor:
+            cursor["updated_after"] = cursor["updated_after"].isoformat()
+        return {
+            "items": [serialize_change(row) for row in rows],
+            "next_cursor": urlencode(cursor) if cursor else None,
+            "has_more": has_more,
+        }
+
+    return stmt, to_page
+
+
+def list_changes(db_session, **params) -> Dict[str, Any]:
+    """Seite neuer/geänderter Sessions: ``{items, next_cursor, has_more}``."""
+    stmt, to_page = build_changes_query(**params)
+    return to_page(db_session.execute(stmt).all())
+
+
+async def alist_changes(db_session, **params) -> Dict[str, Any]:
+    """Async-Variante von ``list_changes`` für eine ``AsyncSession``."""
+    stmt, to_page = build_changes_query(**params)
+    result = await db_session.execute(stmt)
+    return to_page(result.all())
@@ -0,0 +1,440 @@
+"""
+Job Queue - Dauerhafte Hintergrundjobs in ``processing_jobs`` (überstehen Neustarts und Abstürze)
+"""
+
+import asyncio
+import json
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from config.database_sqlite import ProcessingJob
+
+# Verarbeitung eines abgeschlossenen Calls (Payload: {"call_id": ...})
+JOB_PROCESS_CALL = "process_completed_call"
+
+
+class ClaimedJob(NamedTuple):
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    lease_token: str
+
+    @property
+    def final_attempt(self) -> bool:
+        """Letzter Versuch - danach landet der Job in ``dead`` (z.B. erst dann Fehler melden)"""
+        return self.attempts >= self.max_attempts
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def run_in_process() -> bool:
+    """Ob die App selbst Jobs abarbeitet (sonst nur scripts/job_worker.py)"""
+    return os.getenv('JOB_WORKER_IN_PROCESS', 'true').lower() in ('1', 'true', 'yes')
+
+
+class JobQueue:
+    """Job-Queue mit Leases, Versuchszähler und exponentiellem Retry.
+
+    Ein Claim setzt ``running`` und eine Lease bis ``locked_until``
+    (``JOB_VISIBILITY_TIMEOUT_SECONDS``, Standard 600); läuft sie ab, ohne
+    dass der Job abgeschlossen wurde (Absturz, Neustart), wird er wieder
+    sichtbar. Fehlgeschlagene Jobs kommen nach ``JOB_RETRY_BASE_SECONDS``
+    * 2^(Versuch-1) (höchstens ``JOB_RETRY_MAX_SECONDS``) erneut dran, nach
+    ``JOB_MAX_ATTEMPTS`` Versuchen landen sie in ``dead``.
+
+    Auf MySQL holen sich mehrere Worker ihre Jobs mit
+    ``SELECT ... FOR UPDATE SKIP LOCKED``; SQLite kennt das nicht, dort
+    gewinnt beim Compare-and-Set-Update genau ein Worker.
+    """
+
+    def __init__(self, db_manager, visibility_timeout: Optional[int] = None, max_attempts: Optional[int] = None,
+                 retry_base_seconds: Optional[float] = None, retry_max_seconds: Optional[float] = None):
+        self.db_manager = db_manager
+        self.visibility_timeout = timedelta(
+            seconds=visibility_timeout or int(os.getenv('JOB_VISIBILITY_TIMEOUT_SECONDS', '600'))
+        )
+        self.max_attempts = max_attempts or int(os.getenv('JOB_MAX_ATTEMPTS', '5'))
+        self.retry_base_seconds = retry_base_seconds or float(os.getenv('JOB_RETRY_BASE_SECONDS', '30'))
+        self.retry_max_seconds = retry_max_seconds or float(os.getenv('JOB_RETRY_MAX_SECONDS', '3600'))
+
+        self._lock = threading.Lock()
+        self._enqueued = 0
+        self._deduplicated = 0
+        self._claimed = 0
+        self._reclaimed = 0
+        self._completed = 0
+        self._retried = 0
+        self._dead = 0
+        self._lease_lost = 0
+        self._released = 0
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def retry_delay(self, attempts: int) -> float:
+        return min(self.retry_max_seconds, self.retry_base_seconds * 2 ** max(0, attempts - 1))
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None) -> Tuple[int, bool]:
+        """Legt einen Job an; mit ``dedupe_key`` höchstens einen pro Key. Gibt (id, neu angelegt) zurück.
+
+        Ein Job, der mit dem Key schon in ``dead`` liegt, wird mit frischen
+        Versuchen neu eingereiht.
+        """
+        now = datetime.utcnow()
+        try:
+            with self.db_manager.write_session() as db_session:
+                job = ProcessingJob(
+                    kind=kind, payload=json.dumps(payload, ensure_ascii=False), dedupe_key=dedupe_key,
+                    status="queued", attempts=0, max_attempts=self.max_attempts, available_at=now,
+                )
+                db_session.add(job)
+                db_session.flush()
+                job_id = job.id
+            self._count("_enqueued")
+            return job_id, True
+        except IntegrityError:
+            if dedupe_key is None:
+                raise
+
+        with self.db_manager.write_session() as db_session:
+            job = db_session.query(ProcessingJob).filter_by(dedupe_key=dedupe_key).first()
+            if job.status != "dead":
+                self._count("_deduplicated")
+                return job.id, False
+            job.status = "queued"
+            job.attempts = 0
+            job.max_attempts = self.max_attempts
+            job.available_at = now
+            job.finished_at = None
+            job_id = job.id
+        self._count("_enqueued")
+        return job_id, True
+
+    def _claimable(self, now: datetime):
+        table = ProcessingJob.__table__
+        return or_(
+            and_(table.c.status == "queued", table.c.available_at <= now),
+            and_(table.c.status == "running", table.c.locked_until < now),
+        )
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[ClaimedJob]:
+        """Bis zu ``limit`` fällige Jobs (älteste zuerst) mit Lease für ``worker_id``."""
+        if limit <= 0:
+            return []
+        table = ProcessingJob.__table__
+        now = datetime.utcnow()
+        claimable = self._claimable(now)
+        claimed: List[ClaimedJob] = []
+
+        with self.db_manager.write_session() as db_session:
+            query = (
+                select(table.c.id, table.c.kind, table.c.payload, table.c.status, table.c.attempts, table.c.max_attempts)
+                .where(claimable)
+                .order_by(table.c.available_at, table.c.id)
+            )
+            if db_session.get_bind().dialect.name == "mysql":
+                # Gesperrte Zeilen gehören gerade einem anderen Worker - überspringen statt warten
+                candidates = db_session.execute(query.limit(limit).with_for_update(skip_locked=True)).fetchall()
+            else:
+                # Etwas mehr lesen, falls ein anderer Prozess einzelne Jobs schneller beansprucht
+                candidates = db_session.execute(query.limit(limit * 2)).fetchall()
+
+            for row in candidates:
+                if len(claimed) >= limit:
+                    break
+                attempts = row.attempts + 1
+                if attempts > row.max_attempts:
+                    # Lease mehrfach abgelaufen (Worker jeweils abgestürzt) - nicht endlos wiederholen
+                    result = db_session.execute(
+                        update(table).where(table.c.id == row.id, claimable).values(
+                            status="dead", last_error="Lease abgelaufen, keine Versuche mehr",
+                            lease_token=None, locked_until=None, finished_at=now, updated_at=now,
+                        )
+                    )
+                    self._count("_dead", result.rowcount)
+                    continue
+                token = uuid.uuid4().hex
+                result = db_session.execute(
+                    update(table).where(table.c.id == row.id, claimable).values(
+                        status="running", attempts=attempts, lease_token=token, locked_by=worker_id[:100],
+                        locked_until=now + self.visibility_timeout, updated_at=now,
+                    )
+                )
+                if result.rowcount:
+                    claimed.append(ClaimedJob(row.id, row.kind, json.loads(row.payload), attempts, row.max_attempts, token))
+                    if row.status == "running":
+                        self._count("_reclaimed")
+
+        self._count("_claimed", len(claimed))
+        return claimed
+
+    def _finish_lease(self, job: ClaimedJob, values: Dict[str, Any]) -> bool:
+        """Aktualisiert den Job nur, solange die Lease noch diesem Claim gehört"""
+        table = ProcessingJob.__table__
+        with self.db_manager.write_session() as db_session:
+            result = db_session.execute(
+                update(table)
+                .where(table.c.id == job.id, table.c.status == "running", table.c.lease_token == job.lease_token)
+                .values(lease_token=None, locked_until=None, updated_at=datetime.utcnow(), **values)
+            )
+        if not result.rowcount:
+            # Lease abgelaufen und von einem anderen Worker übernommen
+            self._count("_lease_lost")
+            return False
+        return True
+
+    def complete(self, job: ClaimedJob) -> bool:
+        if self._finish_lease(job, {"status": "done", "last_error": None, "finished_at": datetime.utcnow()}):
+            self._count("_completed")
+            return True
+        return False
+
+    def fail(self, job: ClaimedJob, error: str) -> Optional[str]:
+        """Nächster Versuch mit Backoff oder ``dead``; gibt den neuen Status zurück (None = Lease verloren)."""
+        now = datetime.utcnow()
+        if job.attempts >= job.max_attempts:
+            values = {"status": "dead", "finished_at": now}
+        else:
+            values = {"status": "queued", "available_at": now + timedelta(seconds=self.retry_delay(job.attempts))}
+        if not self._finish_lease(job, {**values, "last_error": error[:2000]}):
+            return None
+        self._count("_dead" if values["status"] == "dead" else "_retried")
+        return values["status"]
+
+    def release(self, job: ClaimedJob) -> bool:
+        """Beanspruchten, aber nicht gestarteten Job sofort zurückgeben (zählt nicht als Versuch)."""
+        if self._finish_lease(job, {"status": "queued", "attempts": job.attempts - 1, "available_at": datetime.utcnow()}):
+            self._count("_released")
+            return True
+        return False
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs pro Status (eine Aggregat-Query)"""
+        db_session = self.db_manager.get_session()
+        try:
+            rows = db_session.execute(
+                select(ProcessingJob.status, func.count()).group_by(ProcessingJob.status)
+            ).fetchall()
+        finally:
+            db_session.close()
+        return {status: count for status, count in rows}
+
+    def purge_finished(self, older_than_days: int) -> int:
+        """Löscht erledigte Jobs, die älter als ``older_than_days`` sind (``dead`` bleibt zur Analyse)"""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        with self.db_manager.write_session() as db_session:
+            return db_session.query(ProcessingJob).filter(
+                ProcessingJob.status == "done", ProcessingJob.finished_at < cutoff
+            ).delete(synchronize_session=False)
+
+    async def aenqueue(self, kind: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None) -> Tuple[int, bool]:
+        return await asyncio.to_thread(self.enqueue, kind, payload, dedupe_key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enqueued": self._enqueued,
+                "deduplicated": self._deduplicated,
+                "claimed": self._claimed,
+                "reclaimed": self._reclaimed,
+                "completed": self._completed,
+                "retried": self._retried,
+                "dead": self._dead,
+                "lease_lost": self._lease_lost,
+                "released": self._released,
+                "visibility_timeout_s": int(self.visibility_timeout.total_seconds()),
+                "max_attempts": self.max_attempts,
+            }
+
+
+class JobWorker:
+    """Holt Jobs aus der ``JobQueue`` und führt sie im ``ProcessingPool`` aus.
+
+    Ein Poller-Thread beansprucht nur so viele Jobs, wie der Pool freie
+    Worker hat; ``notify`` weckt ihn nach einem lokalen ``enqueue`` sofort,
+    sonst wird alle ``JOB_POLL_INTERVAL_SECONDS`` (Standard 1) gefragt.
+    Handler bekommen den ``ClaimedJob`` (Payload, Versuch) und geben False zurück (oder werfen),
+    wenn der Job erneut versucht werden soll.
+    """
+
+    def __init__(self, job_queue: JobQueue, pool, handlers: Dict[str, Callable[[ClaimedJob], Any]],
+                 worker_id: Optional[str] = None, poll_interval: Optional[float] = None):
+        self.job_queue = job_queue
+        self.pool = pool
+        self.handlers = handlers
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval or float(os.getenv('JOB_POLL_INTERVAL_SECONDS', '1'))
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._poll_errors = 0
+
+    def start(self):
+        """Startet den Poller (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._poll_loop, name="job-poller", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Keine neuen Jobs mehr beanspruchen; mit ``wait`` laufende Jobs abwarten."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if wait:
+            self.pool.join()
+
+    def notify(self):
+        self._wakeup.set()
+
+    def _poll_loop(self):
+        while not self._stopped.is_set():
+            claimed = 0
+            free = 0
+            try:
+                free = self.pool.free_slots()
+                if free:
+                    jobs = self.job_queue.claim(self.worker_id, free)
+                    for index, job in enumerate(jobs):
+                        if not self.pool.submit(self._run, job):
+                            # Pool-Queue voll: Rest sofort zurückgeben statt bis zum Lease-Ablauf zu blockieren
+                            for rejected in jobs[index:]:
+                                self.job_queue.release(rejected)
+                            break
+                        claimed += 1
+            except Exception as exc:
+                with self._lock:
+                    self._poll_errors += 1
+                print(f"[ERROR] Job-Poller: {exc}")
+            # Volle Batches sofort nachladen, sonst warten (oder per notify geweckt werden)
+            if not free or claimed < free:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def _run(self, job: ClaimedJob):
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"Kein Handler für Job-Typ {job.kind!r}")
+            succeeded = handler(job) is not False
+            error = "Handler meldet Fehlschlag"
+        except Exception as exc:
+            succeeded = False
+            error = f"{type(exc).__name__}: {exc}"
+        if succeeded:
+            self.job_queue.complete(job)
+        else:
+            self.job_queue.fail(job, error)
+        # Pool-Slot wird frei: gleich den nächsten Job holen
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            poll_errors = self._poll_errors
+        return {
+            "worker_id": self.worker_id,
+            "polling": self._thread is not None,
+            "poll_errors": poll_errors,
+            **self.job_queue.stats(),
+        }
+
+
+class AsyncJobWorker:
+    """Async-Gegenstück für die FastAPI-App: Poller-Task im Event-Loop,
+    Ausführung im ``AsyncProcessingPool``, Datenbankzugriffe der Queue im Thread."""
+
+    def __init__(self, job_queue: JobQueue, pool, handlers: Dict[str, Callable[[ClaimedJob], Any]],
+                 worker_id: Optional[str] = None, poll_interval: Optional[float] = None):
+        self.job_queue = job_queue
+        self.pool = pool
+        self.handlers = handlers
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval or float(os.getenv('JOB_POLL_INTERVAL_SECONDS', '1'))
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._poll_errors = 0
+
+    def start(self):
+        """Startet den Poller-Task im laufenden Event-Loop (idempotent)."""
+        if self._task is not None:
+            return
+        self.pool.start()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._poll_loop(), name="job-poller")
+
+    async def stop(self, wait: bool = True):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if wait:
+            await self.pool.join()
+
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _poll_loop(self):
+        while True:
+            claimed = 0
+            free = 0
+            try:
+                free = self.pool.free_slots()
+                if free:
+                    jobs = await asyncio.to_thread(self.job_queue.claim, self.worker_id, free)
+                    for index, job in enumerate(jobs):
+                        if not self.pool.submit(self._run, job):
+                            for rejected in jobs[index:]:
+                                await asyncio.to_thread(self.job_queue.release, rejected)
+                            break
+                        claimed += 1
+            except Exception as exc:
+                self._poll_errors += 1
+                print(f"[ERROR] Job-Poller: {exc}")
+            if not free or claimed < free:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def _run(self, job: ClaimedJob):
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"Kein Handler für Job-Typ {job.kind!r}")
+            succeeded = await handler(job) is not False
+            error = "Handler meldet Fehlschlag"
+        except Exception as exc:
+            succeeded = False
+            error = f"{type(exc).__name__}: {exc}"
+        if succeeded:
+            await asyncio.to_thread(self.job_queue.complete, job)
+        else:
+            await asyncio.to_thread(self.job_queue.fail, job, error)
+        self.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "polling": self._task is not None,
+            "poll_errors": self._poll_errors,
+            **self.job_queue.stats(),
+        }
@@ -0,0 +1,286 @@
+"""
+Map-Reduce Evaluator - Parallele Bewertung langer Transkripte nach Interview-Abschnitten
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from services.config_service import config_service
+from services.transcript_preprocessor import estimate_tokens
+from services.transcript_utils import split_turns
+
+# Abschnitte aus VapiClient._get_interview_instructions (Begrüßung zählt zum Werdegang,
+# Verabschiedung zu den Fragen des Kandidaten). Erkannt an Schlüsselwörtern in den Fragen
+# des Interviewers; Abschnitte laufen nur vorwärts.
+SECTIONS = [
+    ("werdegang", "Werdegang und Erfahrungen", ("vorstellen", "werdegang", "lebenslauf", "beruflich", "erfahrung")),
+    ("motivation", "Motivation und Ziele", ("motivation", "warum", "interessieren", "ziele", "wechsel")),
+    ("fachlich", "Fachliche Kompetenzen", ("fachlich", "technisch", "technologie", "projekt", "architektur", "methoden")),
+    ("fragen", "Fragen des Kandidaten", ("fragen an uns", "noch fragen", "fragen haben", "fragen für uns")),
+]
+
+# Welche Dimensionen ein Abschnitt besonders gut belegt (doppeltes Gewicht beim Zusammenführen)
+SECTION_DIMENSIONS = {
+    "werdegang": {"kommunikation", "fachkompetenz"},
+    "motivation": {"motivation", "cultural_fit"},
+    "fachlich": {"fachkompetenz", "problemloesung"},
+    "fragen": {"motivation", "cultural_fit"},
+}
+
+DIMENSIONS = ("kommunikation", "fachkompetenz", "motivation", "cultural_fit", "problemloesung")
+INTERVIEWER_SPEAKERS = {"ai", "assistant", "assistent", "bot", "interviewer"}
+
+
+def is_map_reduce_mode() -> bool:
+    return os.getenv('EVALUATION_MODE', 'single').lower() == 'map_reduce'
+
+
+def _render(turns: List[Dict[str, str]]) -> str:
+    return "\n".join(f"{turn['speaker']}: {turn['text']}" if turn["speaker"] else turn["text"] for turn in turns)
+
+
+def split_sections(transcript: str, min_tokens: int = 300, fallback_chunks: int = 4) -> List[Dict[str, Any]]:
+    """Teilt das Transkript entlang der Interview-Struktur.
+
+    Abschnitte unter ``min_tokens`` werden mit dem vorherigen zusammengelegt.
+    Wird keine Struktur erkannt, entstehen ``fallback_chunks`` gleich große
+    Teile (an Turn-Grenzen).
+    """
+    turns = split_turns(transcript)
+    if not turns:
+        return []
+
+    speakers = [turn["speaker"] for turn in turns if turn["speaker"]]
+    interviewer = next((s for s in speakers if s.lower() in INTERVIEWER_SPEAKERS), speakers[0] if speakers else "")
+
+    chunks: List[Dict[str, Any]] = [{"section": "werdegang", "turns": []}]
+    position = 0
+    for turn in turns:
+        if turn["speaker"] == interviewer:
+            text = turn["text"].lower()
+            for index in range(position + 1, len(SECTIONS)):
+                if any(keyword in text for keyword in SECTIONS[index][2]):
+                    position = index
+                    chunks.append({"section": SECTIONS[index][0], "turns": []})
+                    break
+        chunks[-1]["turns"].append(turn)
+
+    merged: List[Dict[str, Any]] = []
+    for chunk in chunks:
+        if not chunk["turns"]:
+            continue
+        if merged and estimate_tokens(_render(chunk["turns"])) < min_tokens:
+            merged[-1]["turns"].extend(chunk["turns"])
+        else:
+            merged.append(chunk)
+    if merged and len(merged) > 1 and estimate_tokens(_render(merged[0]["turns"])) < min_tokens:
+        merged[1]["turns"][:0] = merged.pop(0)["turns"]
+
+    if len(merged) < 2:
+        size = max(1, -(-len(turns) // fallback_chunks))
+        merged = [{"section": "teil", "turns": turns[start:start + size]} for start in range(0, len(turns), size)]
+
+    titles = {key: title for key, title, _ in SECTIONS}
+    return [
+        {
+            "section": chunk["section"],
+            "title": titles.get(chunk["section"], f"Teil {number}"),
+            "text": _render(chunk["turns"]),
+        }
+        for number, chunk in enumerate(merged, start=1)
+    ]
+
+
+def _chunk_transcript(chunk: Dict[str, Any], number: int, total: int) -> str:
+    return (
+        f"[Ausschnitt {number}/{total}: {chunk['title']} - bewerte nur, was dieser Ausschnitt zeigt]\n"
+        f"{chunk['text']}"
+    )
+
+
+def _chunk_error(error: Exception) -> Dict[str, Any]:
+    return {"error": f"Bewertung fehlgeschlagen: {error}", "gesamtbewertung": {"score": 0, "empfehlung": "FEHLER"}}
+
+
+def _is_usable(result: Dict[str, Any]) -> bool:
+    return bool(result) and isinstance(result.get("einzelbewertungen"), dict) and "error" not in result
+
+
+def merge_evaluations(chunks: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Führt Abschnittsbewertungen in das normale Bewertungsschema zusammen."""
+    usable = [(chunk, result) for chunk, result in zip(chunks, results) if _is_usable(result)]
+    if not usable:
+        return next((result for result in results if result), {})
+
+    einzelbewertungen = {}
+    for dimension in DIMENSIONS:
+        weighted, total_weight, comments = 0.0, 0.0, []
+        for chunk, result in usable:
+            entry = result["einzelbewertungen"].get(dimension) or {}
+            try:
+                score = float(entry.get("score"))
+            except (TypeError, ValueError):
+                continue
+            relevant = dimension in SECTION_DIMENSIONS.get(chunk["section"], set())
+            weight = 2.0 if relevant else 1.0
+            weighted += score * weight
+            total_weight += weight
+            if entry.get("kommentar") and (relevant or chunk["section"] == "teil"):
+                comments.append(f"{chunk['title']}: {entry['kommentar']}")
+        if total_weight:
+            einzelbewertungen[dimension] = {
+                "score": round(weighted / total_weight, 1),
+                "kommentar": " | ".join(comments),
+            }
+
+    scores = [entry["score"] for entry in einzelbewertungen.values()]
+    gesamt_score = round(sum(scores) / len(scores), 1) if scores else 0
+    # Schwellen aus system_config (evaluation_threshold_invite/_reject)
+    empfehlung = config_service.recommendation_for(gesamt_score)
+
+    def unique(key: str) -> List[str]:
+        seen: List[str] = []
+        for _, result in usable:
+            for item in result.get(key) or []:
+                if item not in seen:
+                    seen.append(item)
+        return seen
+
+    next_steps = [result.get("naechste_schritte") for _, result in usable if result.get("naechste_schritte")]
+    matching = [
+        result.get("naechste_schritte") for _, result in usable
+        if result.get("naechste_schritte") and (result.get("gesamtbewertung") or {}).get("empfehlung") == empfehlung
+    ]
+
+    merged = {
+        "gesamtbewertung": {"score": gesamt_score, "empfehlung": empfehlung},
+        "einzelbewertungen": einzelbewertungen,
+        "zusammenfassung": "\n".join(
+            f"{chunk['title']}: {result['zusammenfassung']}" for chunk, result in usable if result.get("zusammenfassung")
+        ),
+        "staerken": unique("staerken"),
+        "schwaechen": unique("schwaechen"),
+        "naechste_schritte": (matching or next_steps or [""])[0],
+        "map_reduce": {
+            "sections": [chunk["section"] for chunk in chunks],
+            "failed_sections": [chunk["section"] for chunk, result in zip(chunks, results) if not _is_usable(result)],
+        },
+    }
+
+    preprocessing = [result["preprocessing"] for _, result in usable if isinstance(result.get("preprocessing"), dict)]
+    if preprocessing:
+        merged["preprocessing"] = {
+            key: sum(stats.get(key, 0) for stats in preprocessing)
+            for key in ("original_tokens", "processed_tokens", "tokens_saved", "removed_turns")
+        }
+        merged["preprocessing"]["truncated"] = any(stats.get("truncated") for stats in preprocessing)
+    return merged
+
+
+class MapReduceEvaluator:
+    """Wrapper um einen Evaluator: lange Transkripte werden pro Interview-Abschnitt
+    parallel bewertet und zusammengeführt, kurze unverändert durchgereicht.
+
+    ``MAP_REDUCE_MIN_TOKENS`` (Standard 3000) ab wann gesplittet wird,
+    ``MAP_REDUCE_CONCURRENCY`` (Standard 8) parallele Abschnitts-Calls insgesamt.
+    """
+
+    def __init__(self, evaluator, min_tokens: Optional[int] = None, concurrency: Optional[int] = None):
+        self.evaluator = evaluator
+        self.min_tokens = min_tokens or int(os.getenv('MAP_REDUCE_MIN_TOKENS', '3000'))
+        self.concurrency = concurrency or int(os.getenv('MAP_REDUCE_CONCURRENCY', '8'))
+        self.MODEL = getattr(evaluator, "MODEL", type(evaluator).__name__)
+        self.PROMPT_VERSION = f"{getattr(evaluator, 'PROMPT_VERSION', '1')}+mr"
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._single = 0
+        self._split = 0
+        self._chunks = 0
+        self._failed_chunks = 0
+
+    def __getattr__(self, name):
+        return getattr(self.evaluator, name)
+
+    def plan(self, transcript: str) -> List[Dict[str, Any]]:
+        """Abschnitte für die Bewertung (leer = als Ganzes bewerten)."""
+        if estimate_tokens(transcript or "") < self.min_tokens:
+            return []
+        chunks = split_sections(transcript)
+        return chunks if len(chunks) > 1 else []
+
+    def _record(self, chunks: List[Dict[str, Any]], results: Optional[List[Dict[str, Any]]] = None):
+        with self._lock:
+            if not chunks:
+                self._single += 1
+                return
+            self._split += 1
+            self._chunks += len(chunks)
+            self._failed_chunks += sum(1 for result in results or [] if not _is_usable(result))
+
+    def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
+        chunks = self.plan(transcript)
+        if not chunks:
+            self._record(chunks)
+            return self.evaluator.evaluate_interview(transcript)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="map-reduce")
+        futures = [
+            self._executor.submit(self.evaluator.evaluate_interview, _chunk_transcript(chunk, number, len(chunks)))
+            for number, chunk in enumerate(chunks, start=1)
+        ]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                results.append(_chunk_error(exc))
+        self._record(chunks, results)
+        return merge_evaluations(chunks, results)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "min_tokens": self.min_tokens,
+                "single": self._single,
+                "split": self._split,
+                "chunks": self._chunks,
+                "failed_chunks": self._failed_chunks,
+            }
+
+
+class AsyncMapReduceEvaluator(MapReduceEvaluator):
+    """Async-Variante: Abschnitte laufen per ``asyncio.gather`` (begrenzt per Semaphore)."""
+
+    def __init__(self, evaluator, min_tokens: Optional[int] = None, concurrency: Optional[int] = None):
+        super().__init__(evaluator, min_tokens, concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _evaluate_chunk(self, text: str) -> Dict[str, Any]:
+        async with self._semaphore:
+            try:
+                return await self.evaluator.evaluate_interview(text)
+            except Exception as exc:
+                return _chunk_error(exc)
+
+    async def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
+        chunks = self.plan(transcript)
+        if not chunks:
+            self._record(chunks)
+            return await self.evaluator.evaluate_interview(transcript)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*[
+            self._evaluate_chunk(_chunk_transcript(chunk, number, len(chunks)))
+            for number, chunk in enumerate(chunks, start=1)
+        ])
+        self._record(chunks, results)
+        # Schwellen für die Empfehlung ggf. im Thread nachladen
+        await config_service.arefresh()
+        return merge_evaluations(chunks, list(results))
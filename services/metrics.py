@@ -0,0 +1,88 @@
+"""
+Metrics - Prozesslokale Zähler und Latenz-Histogramme für /status
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+# Bucket-Obergrenzen in Millisekunden (LLM-Calls: 100 ms bis 2 Minuten)
+DEFAULT_BUCKETS_MS = (100, 250, 500, 1000, 2000, 3000, 5000, 8000, 13000, 20000, 30000, 60000, 120000)
+
+
+class LatencyHistogram:
+    """Histogramm mit festen Buckets; Perzentile werden aus den Buckets geschätzt."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+            self._count += 1
+            self._sum += value_ms
+            self._max = max(self._max, value_ms)
+
+    def _percentile(self, pct: float) -> Optional[float]:
+        if not self._count:
+            return None
+        rank = pct / 100.0 * self._count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                # Obergrenze des Buckets, höchstens das beobachtete Maximum
+                bound = self.buckets[index] if index < len(self.buckets) else self._max
+                return round(min(bound, self._max), 1)
+        return round(self._max, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{int(bound)}" for bound in self.buckets] + ["le_inf"]
+            return {
+                "count": self._count,
+                "avg_ms": round(self._sum / self._count, 1) if self._count else None,
+                "p50_ms": self._percentile(50),
+                "p95_ms": self._percentile(95),
+                "p99_ms": self._percentile(99),
+                "max_ms": round(self._max, 1) if self._count else None,
+                "buckets": {label: count for label, count in zip(labels, self._counts) if count},
+            }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            return histogram
+
+    def observe(self, name: str, value_ms: float):
+        self.histogram(name).observe(value_ms)
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        return {
+            "counters": counters,
+            "latency": {name: histogram.snapshot() for name, histogram in sorted(histograms.items())},
+        }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,219 @@
+"""
+Scoring - Gewichteter Gesamtscore aus den Einzelbewertungen (vektorisiert mit NumPy)
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, select, update
+
+from config.database_sqlite import InterviewSession
+from services.config_service import ConfigService, config_service
+
+DIMENSIONS = ("kommunikation", "fachkompetenz", "motivation", "cultural_fit", "problemloesung")
+DEFAULT_WEIGHTS = {
+    "kommunikation": 0.25,
+    "fachkompetenz": 0.30,
+    "motivation": 0.20,
+    "cultural_fit": 0.15,
+    "problemloesung": 0.10,
+}
+# Profil, das für Positionen ohne eigenes Profil gilt
+DEFAULT_PROFILE = "default"
+CONFIG_KEY = "scoring_weights"
+
+
+def weight_vector(weights: Dict[str, Any]) -> np.ndarray:
+    """Gewichte in DIMENSIONS-Reihenfolge, normiert auf Summe 1 (Score bleibt auf der 1-10 Skala)"""
+    vector = np.array([float(weights.get(dimension, 0) or 0) for dimension in DIMENSIONS], dtype=float)
+    if (vector < 0).any() or vector.sum() <= 0:
+        raise ValueError(f"Ungültige Gewichte: {weights}")
+    return vector / vector.sum()
+
+
+def _score_value(entry: Any) -> float:
+    """Einzelscore; fehlende oder nicht numerische Werte zählen wie bisher als 0"""
+    value = entry.get("score", 0) if isinstance(entry, dict) else 0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def score_matrix(evaluations: Iterable[Optional[Dict[str, Any]]]) -> np.ndarray:
+    """(n, len(DIMENSIONS))-Matrix der Einzelscores aus ``einzelbewertungen``-Dicts"""
+    rows = [
+        [_score_value((einzelbewertungen or {}).get(dimension)) for dimension in DIMENSIONS]
+        for einzelbewertungen in evaluations
+    ]
+    return np.array(rows, dtype=float).reshape(len(rows), len(DIMENSIONS))
+
+
+class ScoringEngine:
+    """Gewichtungsprofile pro Position aus ``system_config`` (Key ``scoring_weights``).
+
+    Gelesen wird über den ``ConfigService`` (Cache mit TTL); die daraus
+    berechneten Gewichtsvektoren werden neu gebaut, sobald der Config-Cache
+    neu geladen wurde. Ohne Eintrag gelten die bisherigen Standardgewichte.
+    """
+
+    def __init__(self, config: Optional[ConfigService] = None):
+        self.config = config or config_service
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, np.ndarray] = {DEFAULT_PROFILE: weight_vector(DEFAULT_WEIGHTS)}
+        self._config_version: Optional[int] = None
+        self._rebuilds = 0
+        self._invalid_profiles = 0
+
+    def invalidate(self):
+        self.config.invalidate()
+
+    def _rebuild(self):
+        profiles = {DEFAULT_PROFILE: weight_vector(DEFAULT_WEIGHTS)}
+        invalid = 0
+        stored = self.config.get(CONFIG_KEY)
+        for name, weights in (stored if isinstance(stored, dict) else {}).items():
+            try:
+                profiles[name] = weight_vector(weights)
+            except (AttributeError, TypeError, ValueError) as exc:
+                print(f"[WARN] Gewichtungsprofil {name!r} ignoriert: {exc}")
+                invalid += 1
+        return profiles, invalid
+
+    def profiles(self) -> Dict[str, np.ndarray]:
+        self.config.refresh()
+        version = self.config.version
+        if version != self._config_version:
+            profiles, invalid = self._rebuild()
+            with self._lock:
+                self._profiles = profiles
+                self._config_version = version
+                self._rebuilds += 1
+                self._invalid_profiles = invalid
+        return self._profiles
+
+    async def arefresh(self):
+        """Für die FastAPI-App: lädt veraltete Konfiguration im Thread, damit ``score`` nicht blockiert."""
+        await self.config.arefresh()
+
+    def weights_for(self, position: Optional[str] = None) -> np.ndarray:
+        profiles = self.profiles()
+        return profiles.get(position or DEFAULT_PROFILE, profiles[DEFAULT_PROFILE])
+
+    def score(self, einzelbewertungen: Optional[Dict[str, Any]], position: Optional[str] = None) -> float:
+        return float(self.score_batch([einzelbewertungen], [position])[0])
+
+    def score_batch(self, evaluations: Sequence[Optional[Dict[str, Any]]],
+                    positions: Optional[Sequence[Optional[str]]] = None) -> np.ndarray:
+        """Gesamtscores für viele ``einzelbewertungen`` auf einmal (ein Matrixprodukt pro Aufruf)"""
+        scores = score_matrix(evaluations)
+        profiles = self.profiles()
+        default = profiles[DEFAULT_PROFILE]
+        if positions is None:
+            weights = np.broadcast_to(default, scores.shape)
+        else:
+            names = list(profiles)
+            table = np.stack([profiles[name] for name in names])
+            index = {name: number for number, name in enumerate(names)}
+            rows = np.fromiter(
+                (index.get(position or DEFAULT_PROFILE, index[DEFAULT_PROFILE]) for position in positions),
+                dtype=np.intp, count=len(positions),
+            )
+            weights = table[rows]
+        return np.round(np.einsum("ij,ij->i", scores, weights), 2)
+
+    def set_profile(self, position: str, weights: Dict[str, Any]):
+        """Speichert ein Profil (``default`` für alle Positionen ohne eigenes) in ``system_config``."""
+        weight_vector(weights)
+        self.config.invalidate()
+        stored = self.config.get(CONFIG_KEY)
+        stored = dict(stored) if isinstance(stored, dict) else {}
+        stored[position] = {dimension: weights.get(dimension, 0) for dimension in DIMENSIONS}
+        self.config.set(CONFIG_KEY, stored)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "profiles": sorted(self._profiles),
+                "rebuilds": self._rebuilds,
+                "invalid_profiles": self._invalid_profiles,
+            }
+
+
+# Globale Instanz für die Evaluatoren (liest über den globalen config_service)
+scoring_engine = ScoringEngine()
+
+
+def recompute_all_scores(db_manager, engine: Optional[ScoringEngine] = None, batch_size: int = 1000,
+                         dry_run: bool = False) -> Dict[str, Any]:
+    """Berechnet ``evaluation_score`` aller bewerteten Sessions neu (Keyset über id).
+
+    Pro Batch ein Matrixprodukt; geschrieben werden nur geänderte Scores
+    (``updated_at`` wird gesetzt, damit Delta-Sync-Clients die Änderung sehen).
+    """
+    engine = engine or scoring_engine
+    engine.invalidate()
+    table = InterviewSession.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(evaluation_score=bindparam("score"), updated_at=bindparam("now"))
+    )
+    last_id = 0
+    scanned = 0
+    changed = 0
+    started = time.perf_counter()
+
+    while True:
+        db_session = db_manager.get_session()
+        try:
+            rows = db_session.execute(
+                select(table.c.id, table.c.position, table.c.evaluation_data, table.c.evaluation_score)
+                .where(table.c.id > last_id, table.c.evaluation_data.isnot(None))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).fetchall()
+        finally:
+            db_session.close()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        scanned += len(rows)
+
+        evaluations: List[Optional[Dict[str, Any]]] = []
+        for row in rows:
+            try:
+                evaluations.append(json.loads(row.evaluation_data).get("einzelbewertungen"))
+            except (TypeError, ValueError, AttributeError):
+                evaluations.append(None)
+        scores = engine.score_batch(evaluations, [row.position for row in rows])
+        current = np.array([np.nan if row.evaluation_score is None else row.evaluation_score for row in rows])
+        # NaN (noch kein Score) gilt ebenfalls als geändert
+        updates = [
+            {"row_id": rows[index].id, "score": float(scores[index])}
+            for index in np.flatnonzero(~np.isclose(current, scores))
+        ]
+
+        if updates and not dry_run:
+            now = datetime.utcnow()
+            for params in updates:
+                params["now"] = now
+            with db_manager.write_session() as db_session:
+                db_session.execute(statement, updates)
+        changed += len(updates)
+
+    report = {
+        "scanned": scanned,
+        "changed": changed,
+        "dry_run": dry_run,
+    }
+    if changed and not dry_run:
+        # Summen/Histogramme in interview_analytics passen sonst nicht mehr zu den neuen Scores
+        from services.analytics import rebuild_analytics
+        report["analytics_rows"] = rebuild_analytics(db_manager)
+    report["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return report
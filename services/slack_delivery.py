@@ -0,0 +1,236 @@
+"""
+Slack Delivery - Rate-Limit-bewusste Zustell-Queue mit optionalem Digest
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from slack_sdk.errors import SlackApiError
+
+from config.server import worker_count
+
+# Slack erlaubt ca. eine Nachricht pro Sekunde und Channel
+DEFAULT_MIN_INTERVAL_SECONDS = 1.0
+# Slack akzeptiert max. 50 Blocks pro Nachricht (Header + Divider + Ergebnisse)
+MAX_DIGEST_RESULTS = 45
+
+
+def build_digest_payload(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fasst mehrere Interview-Ergebnisse zu einer Slack-Nachricht zusammen."""
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["empfehlung"]] = counts.get(result["empfehlung"], 0) + 1
+    summary = ", ".join(f"{name}: {count}" for name, count in sorted(counts.items()))
+
+    blocks: List[Dict[str, Any]] = [
+        {
+            "type": "header",
+            "text": {"type": "plain_text", "text": f"Interview-Digest - {len(results)} Ergebnisse"},
+        },
+        {"type": "context", "elements": [{"type": "mrkdwn", "text": summary}]},
+        {"type": "divider"},
+    ]
+    for result in results:
+        line = f"*{result['candidate_phone']}* - {result['empfehlung']} ({result['score']}/10) - Call `{result['call_id']}`"
+        if result.get("transcript_url"):
+            line += f" - <{result['transcript_url']}|Transkript>"
+        blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": line}})
+
+    return {
+        "blocks": blocks,
+        "text": f"Interview-Digest: {len(results)} Ergebnisse ({summary})",
+    }
+
+
+class SlackDeliveryQueue:
+    """Entkoppelt Slack-Zustellung von der Bewertungs-Pipeline.
+
+    Ein Hintergrund-Thread stellt zu und führt pro Channel eine eigene
+    Warteschlange mit Zeitplan: zwischen zwei Nachrichten liegt mindestens
+    ``min_interval``, bei 429 wird nur der betroffene Channel um die von
+    Slack gemeldete ``Retry-After``-Zeit verschoben - die übrigen Channels
+    laufen weiter. Mit ``digest_interval`` werden Interview-Ergebnisse pro
+    Channel gesammelt und periodisch als eine Digest-Nachricht gesendet.
+    """
+
+    def __init__(
+        self,
+        client,
+        digest_interval: Optional[float] = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL_SECONDS,
+        max_attempts: int = 5,
+        queue_size: int = 1000,
+    ):
+        self.client = client
+        self.digest_interval = digest_interval
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._digest_buffers: Dict[str, List[Dict[str, Any]]] = {}
+        # Pro Channel: ausstehende Nachrichten (Nachricht, Versuche, Digest?) und frühester Sendezeitpunkt
+        self._pending: Dict[str, Deque[List[Any]]] = {}
+        self._ready_at: Dict[str, float] = {}
+        self._next_flush = time.monotonic() + (digest_interval or 0)
+        self._lock = threading.Lock()
+
+        self._sent = 0
+        self._retried = 0
+        self._rate_limited = 0
+        self._dropped = 0
+        self._digests = 0
+
+        self._thread = threading.Thread(target=self._run, name="slack-delivery", daemon=True)
+        self._thread.start()
+
+    def enqueue_message(self, channel: str, **message) -> bool:
+        """Reiht eine fertige Nachricht (``chat_postMessage``-Argumente) ein."""
+        return self._put(("message", channel, message))
+
+    def enqueue_result(self, channel: str, payload: Dict[str, Any], candidate_phone: str, call_id: str,
+                       transcript_url: Optional[str] = None) -> bool:
+        """Reiht ein Interview-Ergebnis ein (im Digest-Modus gesammelt)."""
+        if not self.digest_interval:
+            return self.enqueue_message(
+                channel,
+                blocks=payload["blocks"],
+                attachments=[{"color": payload["color"], "fallback": f"Interview Result: {payload['empfehlung']}"}],
+            )
+        return self._put(("result", channel, {
+            "candidate_phone": candidate_phone,
+            "call_id": call_id,
+            "empfehlung": payload["empfehlung"],
+            "score": payload["score"],
+            "transcript_url": transcript_url,
+        }))
+
+    def _put(self, item) -> bool:
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            print("[ERROR] Slack delivery queue full - message dropped")
+            return False
+
+    def _run(self):
+        while True:
+            now = time.monotonic()
+            wakeups = [self._ready_at.get(channel, 0) for channel, pending in self._pending.items() if pending]
+            if self.digest_interval:
+                wakeups.append(self._next_flush)
+            timeout = max(0.0, min(wakeups) - now) if wakeups else None
+            try:
+                kind, channel, data = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind = None
+
+            if kind == "message":
+                self._schedule(channel, data)
+            elif kind == "result":
+                with self._lock:
+                    self._digest_buffers.setdefault(channel, []).append(data)
+
+            if self.digest_interval and time.monotonic() >= self._next_flush:
+                self._flush_digests()
+                self._next_flush = time.monotonic() + self.digest_interval
+
+            self._deliver_due()
+
+    def _schedule(self, channel: str, message: Dict[str, Any], digest: bool = False):
+        with self._lock:
+            self._pending.setdefault(channel, deque()).append([message, 0, digest])
+
+    def _flush_digests(self):
+        with self._lock:
+            buffers, self._digest_buffers = self._digest_buffers, {}
+        for channel, results in buffers.items():
+            for start in range(0, len(results), MAX_DIGEST_RESULTS):
+                self._schedule(channel, build_digest_payload(results[start:start + MAX_DIGEST_RESULTS]), digest=True)
+
+    def _deliver_due(self):
+        """Je fälligem Channel einen Sendeversuch; Fehler verschieben nur diesen Channel."""
+        for channel in list(self._pending):
+            pending = self._pending[channel]
+            if not pending:
+                continue
+            if self._ready_at.get(channel, 0) > time.monotonic():
+                continue
+            entry = pending[0]
+            delay = self._attempt(channel, entry)
+            if delay is None:
+                with self._lock:
+                    pending.popleft()
+                delay = self.min_interval
+            self._ready_at[channel] = time.monotonic() + delay
+
+    def _attempt(self, channel: str, entry: List[Any]) -> Optional[float]:
+        """``None`` bei Erfolg (oder endgültig verworfen), sonst Wartezeit bis zum nächsten Versuch."""
+        message, attempt, digest = entry
+        try:
+            self.client.chat_postMessage(channel=channel, **message)
+            with self._lock:
+                self._sent += 1
+                if digest:
+                    self._digests += 1
+            return None
+        except SlackApiError as error:
+            response = error.response
+            if getattr(response, "status_code", None) == 429:
+                delay = float(response.headers.get("Retry-After", 1))
+                with self._lock:
+                    self._rate_limited += 1
+            else:
+                print(f"Slack notification failed: {response.get('error')}")
+                delay = min(30.0, random.uniform(0, 2 ** attempt))
+        except Exception as exc:
+            print(f"Slack notification failed: {exc}")
+            delay = min(30.0, random.uniform(0, 2 ** attempt))
+
+        entry[1] = attempt + 1
+        if entry[1] >= self.max_attempts:
+            with self._lock:
+                self._dropped += 1
+            print(f"[ERROR] Slack message to #{channel} dropped after {self.max_attempts} attempts")
+            return None
+        with self._lock:
+            self._retried += 1
+        return max(delay, self.min_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": "digest" if self.digest_interval else "queue",
+                "min_interval_s": self.min_interval,
+                "queue_depth": self._queue.qsize() + sum(len(items) for items in self._pending.values()),
+                "buffered_results": sum(len(items) for items in self._digest_buffers.values()),
+                "sent": self._sent,
+                "digests_sent": self._digests,
+                "retried": self._retried,
+                "rate_limited": self._rate_limited,
+                "dropped": self._dropped,
+            }
+
+
+def delivery_queue_from_env(client) -> Optional[SlackDeliveryQueue]:
+    """``SLACK_DELIVERY_MODE``: ``queue`` (Standard), ``digest`` oder ``direct`` (ohne Queue).
+
+    Das Slack-Limit gilt pro Channel über alle Prozesse: im Pre-Fork-Betrieb
+    (config/server.py) hält jeder Worker den ``worker_count()``-fachen Abstand,
+    damit alle zusammen bei ca. einer Nachricht pro Sekunde bleiben.
+    ``SLACK_MIN_INTERVAL_SECONDS`` setzt den Abstand pro Worker explizit.
+    """
+    mode = os.getenv("SLACK_DELIVERY_MODE", "queue").lower()
+    if mode == "direct":
+        return None
+    digest_interval = None
+    if mode == "digest":
+        digest_interval = float(os.getenv("SLACK_DIGEST_INTERVAL_SECONDS", "300"))
+    min_interval = float(os.getenv("SLACK_MIN_INTERVAL_SECONDS") or DEFAULT_MIN_INTERVAL_SECONDS * worker_count())
+    return SlackDeliveryQueue(client, digest_interval=digest_interval, min_interval=min_interval)
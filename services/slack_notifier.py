@@ -3,6 +3,10 @@ from typing import Any, Dict, List, Optional
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+from services.config_service import config_service
+from services.slack_delivery import delivery_queue_from_env
 
 
 COLOR_MAP = {
@@ -109,7 +113,13 @@ def build_interview_payload(
 class SlackNotifier:
     def __init__(self):
         self.client = WebClient(token=os.getenv("SLACK_BOT_TOKEN"))
-        self.channel = os.getenv("SLACK_CHANNEL", "hr-notifications")
+        self.default_channel = os.getenv("SLACK_CHANNEL", "hr-notifications")
+        # Zustellung im Hintergrund (Rate-Limits, Digest); None = direkt senden
+        self.delivery = delivery_queue_from_env(self.client)
+
+    def _resolve_channel(self) -> str:
+        """Beim Senden: ``slack_channel`` aus system_config, sonst ``default_channel`` (``SLACK_CHANNEL``)"""
+        return config_service.get("slack_channel") or self.default_channel
 
     def send_interview_result(
         self,
@@ -121,10 +131,14 @@ class SlackNotifier:
         """Sendet Bewertungsergebnis an Slack-Channel."""
 
         payload = build_interview_payload(evaluation, candidate_phone, call_id, transcript_url)
+        channel = self._resolve_channel()
+
+        if self.delivery:
+            return {"queued": self.delivery.enqueue_result(channel, payload, candidate_phone, call_id, transcript_url)}
 
         try:
             response = self.client.chat_postMessage(
-                channel=self.channel,
+                channel=channel,
                 blocks=payload["blocks"],
                 attachments=[{"color": payload["color"], "fallback": f"Interview Result: {payload['empfehlung']}"}],
             )
@@ -136,10 +150,71 @@ class SlackNotifier:
 
     def send_error_notification(self, error_message: str, call_id: str = None):
         """Sendet Fehlermeldung an Slack."""
+        text = f"FEHLER: Interview System Error\n{error_message}\nCall ID: {call_id or 'Unknown'}"
+        channel = self._resolve_channel()
+        if self.delivery:
+            self.delivery.enqueue_message(channel, text=text)
+            return
+
         try:
-            self.client.chat_postMessage(
-                channel=self.channel,
-                text=f"FEHLER: Interview System Error\n{error_message}\nCall ID: {call_id or 'Unknown'}",
+            self.client.chat_postMessage(channel=channel, text=text)
+        except SlackApiError as error:
+            print(f"Error notification failed: {error.response['error']}")
+
+    def delivery_stats(self) -> Optional[Dict[str, Any]]:
+        return self.delivery.stats() if self.delivery else None
+
+
+class AsyncSlackNotifier(SlackNotifier):
+    """Async-Variante über ``AsyncWebClient`` für den FastAPI-Event-Loop."""
+
+    def __init__(self):
+        token = os.getenv("SLACK_BOT_TOKEN")
+        self.client = AsyncWebClient(token=token)
+        self.default_channel = os.getenv("SLACK_CHANNEL", "hr-notifications")
+        # Die Queue stellt aus ihrem eigenen Thread zu und braucht den Sync-Client
+        self.delivery = delivery_queue_from_env(WebClient(token=token))
+
+    async def _aresolve_channel(self) -> str:
+        # system_config ggf. im Thread neu laden, damit get() den Event-Loop nicht blockiert
+        await config_service.arefresh()
+        return self._resolve_channel()
+
+    async def send_interview_result(
+        self,
+        evaluation: Dict[str, Any],
+        candidate_phone: str,
+        call_id: str,
+        transcript_url: Optional[str] = None,
+    ):
+        """Sendet Bewertungsergebnis an Slack-Channel."""
+
+        payload = build_interview_payload(evaluation, candidate_phone, call_id, transcript_url)
+        channel = await self._aresolve_channel()
+
+        if self.delivery:
+            return {"queued": self.delivery.enqueue_result(channel, payload, candidate_phone, call_id, transcript_url)}
+
+        try:
+            return await self.client.chat_postMessage(
+                channel=channel,
+                blocks=payload["blocks"],
+                attachments=[{"color": payload["color"], "fallback": f"Interview Result: {payload['empfehlung']}"}],
             )
+
+        except SlackApiError as error:
+            print(f"Slack notification failed: {error.response['error']}")
+            return None
+
+    async def send_error_notification(self, error_message: str, call_id: str = None):
+        """Sendet Fehlermeldung an Slack."""
+        text = f"FEHLER: Interview System Error\n{error_message}\nCall ID: {call_id or 'Unknown'}"
+        channel = await self._aresolve_channel()
+        if self.delivery:
+            self.delivery.enqueue_message(channel, text=text)
+            return
+
+        try:
+            await self.client.chat_postMessage(channel=channel, text=text)
         except SlackApiError as error:
             print(f"Error notification failed: {error.response['error']}")
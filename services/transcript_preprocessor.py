@@ -0,0 +1,190 @@
+"""
+Transcript Preprocessor - Kürzt Transkripte vor der LLM-Bewertung
+"""
+
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.transcript_utils import split_turns
+
+# Grobe Schätzung ohne Tokenizer-Abhängigkeit (deutsche Texte: ~4 Zeichen pro Token)
+CHARS_PER_TOKEN = 4
+
+# Füllwörter (deutsch/englisch) inkl. nachfolgender Satzzeichen; "um"/"em" sind im Deutschen echte Wörter
+FILLER_PATTERN = re.compile(r"\b(?:ä+h+m*|ö+h+m*|e+h+m+|hm+|mhm+|u+h+m*|erm)\b[,.…]*\s*", re.IGNORECASE)
+REPEATED_WORD_PATTERN = re.compile(r"\b(\w+)(?:\s+\1\b)+", re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r"[ \t ]+")
+# Teil des Cache-Keys: ändert sich die Vorverarbeitung, werden alte Bewertungen nicht wiederverwendet
+PREPROCESSING_VERSION = "2"
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _clean_text(text: str) -> str:
+    text = FILLER_PATTERN.sub("", text)
+    text = REPEATED_WORD_PATTERN.sub(r"\1", text)
+    text = WHITESPACE_PATTERN.sub(" ", text)
+    # Durch entfernte Füllwörter entstandene Reste wie " ," oder führende Kommas
+    text = re.sub(r"\s+([,.!?])", r"\1", text)
+    return text.strip(" ,")
+
+
+def _render(turns: List[Dict[str, str]]) -> str:
+    return "\n".join(f"{turn['speaker']}: {turn['text']}" if turn["speaker"] else turn["text"] for turn in turns)
+
+
+class TranscriptPreprocessor:
+    """Normalisiert ein Transkript und hält ein Token-Budget ein.
+
+    1. Whitespace normalisieren, Füllwörter und Wortwiederholungen entfernen
+    2. Leere Turns und direkt wiederholte Turns (gleicher Sprecher, gleicher
+       Text unmittelbar hintereinander, z.B. doppelte ASR-Segmente) verwerfen,
+       aufeinanderfolgende Turns desselben Sprechers zusammenfassen
+    3. Über ``token_budget``: überlange Turns in der Mitte kürzen, dann Turns
+       abwechselnd vom Ende (Verabschiedung) und Anfang (Begrüßung) entfernen -
+       die inhaltlichen Abschnitte in der Mitte bleiben erhalten
+    """
+
+    def __init__(self, token_budget: Optional[int] = None):
+        self.token_budget = token_budget or int(os.getenv('TRANSCRIPT_TOKEN_BUDGET', '6000'))
+        # Einzelne Turns dürfen höchstens ein Achtel des Budgets belegen
+        self.max_turn_tokens = max(50, self.token_budget // 8)
+
+    def process(self, transcript: str) -> Tuple[str, Dict[str, Any]]:
+        original_tokens = estimate_tokens(transcript or "")
+        turns = self._clean_turns(split_turns(transcript or ""))
+        removed_turns = 0
+        truncated = False
+
+        if estimate_tokens(_render(turns)) > self.token_budget:
+            turns = [self._shorten_turn(turn) for turn in turns]
+            turns, removed_turns = self._trim_edges(turns)
+            truncated = True
+
+        processed = _render(turns)
+        processed_tokens = estimate_tokens(processed)
+        return processed, {
+            "original_tokens": original_tokens,
+            "processed_tokens": processed_tokens,
+            "tokens_saved": max(0, original_tokens - processed_tokens),
+            "truncated": truncated,
+            "removed_turns": removed_turns,
+        }
+
+    def _clean_turns(self, turns: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        cleaned: List[Dict[str, str]] = []
+        previous: Optional[Tuple[str, str]] = None
+        for turn in turns:
+            text = _clean_text(turn["text"])
+            if not text:
+                continue
+            # Nur unmittelbare Dubletten: kurze Antworten wie "Ja." auf verschiedene Fragen bleiben erhalten
+            key = (turn["speaker"], text.lower())
+            if key == previous:
+                continue
+            previous = key
+
+            if cleaned and cleaned[-1]["speaker"] == turn["speaker"]:
+                cleaned[-1]["text"] = f"{cleaned[-1]['text']} {text}"
+            else:
+                cleaned.append({"speaker": turn["speaker"], "text": text})
+        return cleaned
+
+    def _shorten_turn(self, turn: Dict[str, str]) -> Dict[str, str]:
+        max_chars = self.max_turn_tokens * CHARS_PER_TOKEN
+        text = turn["text"]
+        if len(text) <= max_chars:
+            return turn
+        half = max_chars // 2
+        return {"speaker": turn["speaker"], "text": f"{text[:half].rstrip()} […] {text[-half:].lstrip()}"}
+
+    def _trim_edges(self, turns: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], int]:
+        budget_chars = self.token_budget * CHARS_PER_TOKEN
+        # +1 für den Zeilenumbruch je Turn
+        sizes = [len(_render([turn])) + 1 for turn in turns]
+        start, end = 0, len(turns)
+        total = sum(sizes)
+        from_end = True
+        while total > budget_chars and end - start > 1:
+            if from_end:
+                end -= 1
+                total -= sizes[end]
+            else:
+                total -= sizes[start]
+                start += 1
+            from_end = not from_end
+
+        kept = turns[start:end]
+        if start:
+            kept.insert(0, {"speaker": "", "text": f"[… {start} Turns am Anfang gekürzt …]"})
+        if end < len(turns):
+            kept.append({"speaker": "", "text": f"[… {len(turns) - end} Turns am Ende gekürzt …]"})
+        return kept, start + len(turns) - end
+
+
+class PreprocessingEvaluator:
+    """Wrapper um einen Evaluator: bewertet das vorverarbeitete Transkript und
+    hängt die Token-Statistik als ``preprocessing`` an das Ergebnis.
+
+    Das Budget ist Teil von ``PROMPT_VERSION``, damit der Evaluation-Cache
+    bei geänderter Vorverarbeitung nicht alte Ergebnisse liefert.
+    """
+
+    def __init__(self, evaluator, preprocessor: Optional[TranscriptPreprocessor] = None):
+        self.evaluator = evaluator
+        self.preprocessor = preprocessor or TranscriptPreprocessor()
+        self.MODEL = getattr(evaluator, "MODEL", type(evaluator).__name__)
+        self.PROMPT_VERSION = (
+            f"{getattr(evaluator, 'PROMPT_VERSION', '1')}+pp{PREPROCESSING_VERSION}-{self.preprocessor.token_budget}"
+        )
+
+        self._lock = threading.Lock()
+        self._interviews = 0
+        self._original_tokens = 0
+        self._tokens_saved = 0
+        self._truncated = 0
+
+    def __getattr__(self, name):
+        return getattr(self.evaluator, name)
+
+    def preprocess(self, transcript: str) -> Tuple[str, Dict[str, Any]]:
+        processed, stats = self.preprocessor.process(transcript)
+        with self._lock:
+            self._interviews += 1
+            self._original_tokens += stats["original_tokens"]
+            self._tokens_saved += stats["tokens_saved"]
+            self._truncated += int(stats["truncated"])
+        print(f"[INFO] Transcript preprocessing: {stats['original_tokens']} -> "
+              f"{stats['processed_tokens']} tokens ({stats['tokens_saved']} saved)")
+        return processed, stats
+
+    def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
+        processed, stats = self.preprocess(transcript)
+        evaluation = self.evaluator.evaluate_interview(processed)
+        evaluation["preprocessing"] = stats
+        return evaluation
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "token_budget": self.preprocessor.token_budget,
+                "interviews": self._interviews,
+                "original_tokens": self._original_tokens,
+                "tokens_saved": self._tokens_saved,
+                "saved_ratio": round(self._tokens_saved / self._original_tokens, 3) if self._original_tokens else 0.0,
+                "truncated": self._truncated,
+            }
+
+
+class AsyncPreprocessingEvaluator(PreprocessingEvaluator):
+    """Async-Variante für die FastAPI-App (Vorverarbeitung ist reine CPU-Arbeit im Millisekundenbereich)."""
+
+    async def evaluate_interview(self, transcript: str) -> Dict[str, Any]:
+        processed, stats = self.preprocess(transcript)
+        evaluation = await self.evaluator.evaluate_interview(processed)
+        evaluation["preprocessing"] = stats
+        return evaluation
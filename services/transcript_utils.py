@@ -0,0 +1,158 @@
+"""
+Transcript Utils - Turn-Aufteilung, Streaming-Formate und LRU für Transkripte
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from config.database_sqlite import InterviewSession
+
+# "Interviewer: ...", "Kandidat: ...", "AI: ...", "User: ..." (Vapi)
+TURN_PATTERN = re.compile(r"^\s*([A-Za-zÄÖÜäöüß][\wÄÖÜäöüß-]{0,19}):\s*(.*)$")
+
+TRANSCRIPT_FORMATS = {
+    "json": "application/json",
+    "text": "text/plain; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def split_turns(transcript: str) -> List[Dict[str, str]]:
+    """Teilt ein Transkript in Sprecher-Turns; Zeilen ohne Sprecher gehören zum vorherigen Turn."""
+    turns: List[Dict[str, str]] = []
+    for line in (transcript or "").splitlines():
+        if not line.strip():
+            continue
+        match = TURN_PATTERN.match(line)
+        if match:
+            turns.append({"speaker": match.group(1).strip(), "text": match.group(2).strip()})
+        elif turns:
+            turns[-1]["text"] = f"{turns[-1]['text']}\n{line.strip()}".strip()
+        else:
+            turns.append({"speaker": "", "text": line.strip()})
+    return turns
+
+
+def transcript_etag(transcript: str) -> str:
+    return '"' + hashlib.sha256(transcript.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Auswertung von ``If-None-Match`` (Liste, ``*`` und schwache ETags)"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in [value[2:] if value.startswith("W/") else value for value in candidates]
+
+
+def transcript_query(call_id: str):
+    """Nur die ausgelieferten Spalten - evaluation_data wird nicht geladen"""
+    return select(
+        InterviewSession.vapi_call_id,
+        InterviewSession.candidate_phone,
+        InterviewSession.status,
+        InterviewSession.transcript,
+        InterviewSession.recording_url,
+        InterviewSession.completed_at,
+        InterviewSession.updated_at,
+    ).filter_by(vapi_call_id=call_id)
+
+
+def transcript_version_query(call_id: str):
+    """Nur ``updated_at`` - prüft, ob ein LRU-Eintrag noch aktuell ist (Index auf vapi_call_id)"""
+    return select(InterviewSession.updated_at).filter_by(vapi_call_id=call_id)
+
+
+def row_version(updated_at) -> Optional[str]:
+    return updated_at.isoformat() if updated_at else None
+
+
+def transcript_entry(row) -> Dict[str, Any]:
+    """Was der Endpoint ausliefert (und der LRU hält) - ohne ORM-Objekt."""
+    return {
+        "call_id": row.vapi_call_id,
+        "candidate_phone": row.candidate_phone,
+        "transcript": row.transcript,
+        "recording_url": row.recording_url,
+        "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+        "etag": transcript_etag(row.transcript),
+        "version": row_version(row.updated_at),
+    }
+
+
+def iter_transcript(entry: Dict[str, Any], fmt: str) -> Iterator[str]:
+    """Chunks für die Streaming-Formate ``text`` und ``ndjson`` (ein Chunk pro Turn)"""
+    for index, turn in enumerate(split_turns(entry["transcript"])):
+        if fmt == "ndjson":
+            yield json.dumps({"index": index, **turn}, ensure_ascii=False) + "\n"
+        else:
+            yield (f"{turn['speaker']}: {turn['text']}" if turn["speaker"] else turn["text"]) + "\n\n"
+
+
+def json_document(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in entry.items() if key not in ("etag", "version")}
+
+
+class TranscriptCache:
+    """In-Process-LRU für abgeschlossene Transkripte.
+
+    Transkripte können nachträglich überschrieben werden (Demo-Neuverarbeitung,
+    scripts/reevaluate_sessions.py - auch aus anderen Prozessen). Ein Eintrag
+    gilt deshalb nur, solange ``updated_at`` der Zeile zur gespeicherten
+    ``version`` passt; der Endpoint liest dafür nur diese eine Spalte statt
+    Transkript und ETag neu zu laden. Schreibt der eigene Prozess ein
+    Transkript, entfernt ``invalidate`` den Eintrag sofort.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv('TRANSCRIPT_CACHE_SIZE', '256'))
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+
+    def get(self, call_id: str, version: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Eintrag, wenn er zu ``version`` (``updated_at`` der Zeile) passt; veraltete werden entfernt."""
+        with self._lock:
+            entry = self._entries.get(call_id)
+            if entry is not None and entry["version"] != version:
+                del self._entries[call_id]
+                self._stale += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(call_id)
+            self._hits += 1
+            return entry
+
+    def invalidate(self, call_id: str):
+        with self._lock:
+            self._entries.pop(call_id, None)
+
+    def put(self, call_id: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._entries[call_id] = entry
+            self._entries.move_to_end(call_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stale": self._stale,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
@@ -1,9 +1,18 @@
-import requests
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from services.config_service import ConfigService, config_service
+from services.http_transport import (
+    AsyncHttpTransport,
+    HttpTransport,
+    get_shared_async_transport,
+    get_shared_transport,
+)
 
 class VapiClient:
-    def __init__(self):
+    def __init__(self, transport: Optional[HttpTransport] = None, config: Optional[ConfigService] = None):
+        self.transport = transport or get_shared_transport()
+        self.config = config or config_service
         self.api_key = os.getenv('VAPI_API_KEY')
         self.base_url = "https://api.vapi.ai"
         self.headers = {
@@ -11,9 +20,9 @@ class VapiClient:
             "Content-Type": "application/json"
         }
     
-    def create_assistant(self) -> Dict[str, Any]:
-        """Erstellt einen Interview-Assistenten mit optimierten Einstellungen"""
-        assistant_config = {
+    def build_assistant_config(self) -> Dict[str, Any]:
+        """Baut die Assistant-Konfiguration (Grundlage für den Registry-Hash)"""
+        return {
             "name": "HR Interview Agent",
             "model": {
                 "provider": "openai",
@@ -33,13 +42,19 @@ class VapiClient:
             "systemMessage": self._get_interview_instructions(),
             "recordingEnabled": True,
             "endCallMessage": "Vielen Dank für das Gespräch! Sie erhalten in den nächsten Tagen eine Rückmeldung von unserem HR-Team.",
-            "maxDurationSeconds": 1800,  # 30 Minuten
+            # system_config interview_duration_minutes (Standard 30); Änderungen ergeben einen neuen Assistenten
+            "maxDurationSeconds": self.config.interview_duration_minutes * 60,
             "silenceTimeoutSeconds": 30,
             "responseDelaySeconds": 0.5,
             "llmRequestDelaySeconds": 0.1
         }
+
+    def create_assistant(self, assistant_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Erstellt einen Interview-Assistenten mit optimierten Einstellungen"""
+        if assistant_config is None:
+            assistant_config = self.build_assistant_config()
         
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/assistant",
             headers=self.headers,
             json=assistant_config
@@ -83,7 +98,7 @@ Halte Antworten kurz und präzise. Stelle maximal 1-2 Fragen pro Turn.
             "customer": {"number": phone_number}
         }
         
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/call",
             headers=self.headers,
             json=call_config
@@ -92,8 +107,47 @@ Halte Antworten kurz und präzise. Stelle maximal 1-2 Fragen pro Turn.
     
     def get_call_details(self, call_id: str) -> Dict[str, Any]:
         """Holt Details eines abgeschlossenen Calls"""
-        response = requests.get(
+        response = self.transport.get(
+            f"{self.base_url}/call/{call_id}",
+            headers=self.headers
+        )
+        return response.json()
+
+
+class AsyncVapiClient(VapiClient):
+    """Async-Variante für den FastAPI-Event-Loop (gleiche Konfiguration, httpx-Transport)"""
+
+    def __init__(self, transport: Optional[AsyncHttpTransport] = None, config: Optional[ConfigService] = None):
+        super().__init__(transport=transport or get_shared_async_transport(), config=config)
+
+    async def create_assistant(self, assistant_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if assistant_config is None:
+            assistant_config = self.build_assistant_config()
+
+        response = await self.transport.post(
+            f"{self.base_url}/assistant",
+            headers=self.headers,
+            json=assistant_config
+        )
+        return response.json()
+
+    async def initiate_call(self, phone_number: str, assistant_id: str) -> Dict[str, Any]:
+        call_config = {
+            "assistant": {"assistantId": assistant_id},
+            "phoneNumberId": os.getenv('VAPI_PHONE_NUMBER_ID'),
+            "customer": {"number": phone_number}
+        }
+
+        response = await self.transport.post(
+            f"{self.base_url}/call",
+            headers=self.headers,
+            json=call_config
+        )
+        return response.json()
+
+    async def get_call_details(self, call_id: str) -> Dict[str, Any]:
+        response = await self.transport.get(
             f"{self.base_url}/call/{call_id}",
             headers=self.headers
         )
-        return response.json()
\ No newline at end of file
+        return response.json()
@@ -0,0 +1,149 @@
+"""
+Webhook Dedupe - Jeder abgeschlossene Call wird nur einmal bewertet, auch wenn Vapi den Webhook wiederholt
+"""
+
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from config.database_sqlite import ProcessedCall
+
+# Ergebnis von claim()
+CLAIMED = "claimed"        # Aufrufer verarbeitet den Call
+IN_FLIGHT = "in_flight"    # läuft bereits (hier oder in einem anderen Prozess)
+PROCESSED = "processed"    # schon erfolgreich verarbeitet
+
+
+class WebhookDedupe:
+    """Dauerhafter Marker in ``processed_calls`` plus Single-Flight im Prozess.
+
+    Gleichzeitige Duplikate im selben Prozess werden ohne Datenbankzugriff
+    zusammengelegt; spätere Duplikate (auch aus anderen Prozessen) erkennt
+    der Unique-Key auf ``call_id``. Ein fehlgeschlagener Lauf gibt den Call
+    wieder frei, ein Marker, der länger als ``WEBHOOK_CLAIM_TTL_SECONDS``
+    (Standard 900) in ``processing`` hängt (Absturz), darf neu beansprucht werden.
+    """
+
+    def __init__(self, db_manager, claim_ttl_seconds: Optional[int] = None):
+        self.db_manager = db_manager
+        self.claim_ttl = timedelta(
+            seconds=claim_ttl_seconds or int(os.getenv('WEBHOOK_CLAIM_TTL_SECONDS', '900'))
+        )
+        self._lock = threading.Lock()
+        self._in_flight: Set[str] = set()
+        self._checks = 0
+        self._claimed = 0
+        self._coalesced = 0
+        self._duplicates_in_flight = 0
+        self._duplicates_processed = 0
+        self._reclaimed = 0
+        self._completed = 0
+        self._released = 0
+
+    def claim(self, call_id: str) -> str:
+        """``CLAIMED``, wenn der Aufrufer verarbeiten soll, sonst ``IN_FLIGHT``/``PROCESSED``."""
+        with self._lock:
+            self._checks += 1
+            if call_id in self._in_flight:
+                self._coalesced += 1
+                return IN_FLIGHT
+            self._in_flight.add(call_id)
+        try:
+            state = self._claim_marker(call_id)
+        except Exception:
+            with self._lock:
+                self._in_flight.discard(call_id)
+            raise
+        with self._lock:
+            if state == CLAIMED:
+                self._claimed += 1
+            else:
+                self._in_flight.discard(call_id)
+                if state == PROCESSED:
+                    self._duplicates_processed += 1
+                else:
+                    self._duplicates_in_flight += 1
+        return state
+
+    def _claim_marker(self, call_id: str) -> str:
+        now = datetime.utcnow()
+        try:
+            with self.db_manager.write_session() as db_session:
+                db_session.add(ProcessedCall(call_id=call_id, status="processing", attempts=1, claimed_at=now))
+            return CLAIMED
+        except IntegrityError:
+            pass
+
+        # Marker existiert: nur freigegebene oder verwaiste Claims übernehmen (Compare-and-Set)
+        table = ProcessedCall.__table__
+        with self.db_manager.write_session() as db_session:
+            reclaimable = (table.c.status == "failed") | (
+                (table.c.status == "processing") & (table.c.claimed_at < now - self.claim_ttl)
+            )
+            result = db_session.execute(
+                update(table)
+                .where(table.c.call_id == call_id, reclaimable)
+                .values(status="processing", attempts=table.c.attempts + 1, claimed_at=now, finished_at=None)
+            )
+            if result.rowcount:
+                with self._lock:
+                    self._reclaimed += 1
+                return CLAIMED
+            status = db_session.execute(select(table.c.status).where(table.c.call_id == call_id)).scalar()
+        return PROCESSED if status == "done" else IN_FLIGHT
+
+    def finish(self, call_id: str, succeeded: bool):
+        """Marker auf ``done`` setzen bzw. für eine erneute Zustellung freigeben."""
+        try:
+            with self.db_manager.write_session() as db_session:
+                db_session.execute(
+                    update(ProcessedCall.__table__)
+                    .where(ProcessedCall.call_id == call_id)
+                    .values(status="done" if succeeded else "failed", finished_at=datetime.utcnow())
+                )
+        finally:
+            with self._lock:
+                self._in_flight.discard(call_id)
+                if succeeded:
+                    self._completed += 1
+                else:
+                    self._released += 1
+
+    def handoff(self, call_id: str):
+        """Verarbeitung liegt jetzt in der Job-Queue (evtl. in einem anderen Prozess): ab hier gilt nur der Marker."""
+        with self._lock:
+            self._in_flight.discard(call_id)
+
+    async def aclaim(self, call_id: str) -> str:
+        """Für die FastAPI-App: Datenbankzugriff im Thread statt im Event-Loop."""
+        with self._lock:
+            if call_id in self._in_flight:
+                self._checks += 1
+                self._coalesced += 1
+                return IN_FLIGHT
+        return await asyncio.to_thread(self.claim, call_id)
+
+    async def afinish(self, call_id: str, succeeded: bool):
+        await asyncio.to_thread(self.finish, call_id, succeeded)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            duplicates = self._coalesced + self._duplicates_in_flight + self._duplicates_processed
+            return {
+                "checks": self._checks,
+                "claimed": self._claimed,
+                "reclaimed": self._reclaimed,
+                "coalesced": self._coalesced,
+                "duplicates_in_flight": self._duplicates_in_flight,
+                "duplicates_processed": self._duplicates_processed,
+                "hit_rate": round(duplicates / self._checks, 3) if self._checks else 0.0,
+                "in_flight": len(self._in_flight),
+                "completed": self._completed,
+                "released": self._released,
+            }
+
@@ -0,0 +1,188 @@
+"""
+Worker Pool - Begrenzte Hintergrundverarbeitung für abgeschlossene Anrufe
+"""
+
+import asyncio
+import os
+import queue
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config.server import per_worker
+
+
+class ProcessingPool:
+    """Fester Worker-Pool mit begrenzter Warteschlange.
+
+    Ersetzt den Thread pro Webhook: Bursts landen in der Queue statt als
+    hunderte parallele Threads bei LLM, Datenbank und Slack.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None, name: str = "processing"):
+        self.workers = workers or per_worker('PROCESSING_WORKERS', 4)
+        self.queue_size = queue_size or int(os.getenv('PROCESSING_QUEUE_SIZE', '500'))
+        self.name = name
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._started = False
+
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def start(self):
+        """Startet die Worker-Threads (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"{self.name}-worker-{index}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+            self._started = True
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> bool:
+        """Reiht einen Job ein. Gibt False zurück, wenn die Queue voll ist."""
+        self.start()
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            return False
+
+        with self._lock:
+            self._submitted += 1
+        return True
+
+    def _worker_loop(self):
+        while True:
+            func, args, kwargs = self._queue.get()
+            with self._lock:
+                self._in_flight += 1
+            try:
+                func(*args, **kwargs)
+                with self._lock:
+                    self._completed += 1
+            except Exception as exc:
+                with self._lock:
+                    self._failed += 1
+                print(f"[ERROR] {self.name} job failed: {exc}")
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                self._queue.task_done()
+
+    def join(self):
+        """Wartet bis alle eingereihten Jobs abgearbeitet sind."""
+        self._queue.join()
+
+    def free_slots(self) -> int:
+        """Wie viele Jobs sofort einen freien Worker fänden (für Poller wie den JobWorker)."""
+        with self._lock:
+            return max(0, self.workers - self._in_flight - self._queue.qsize())
+
+    def stats(self) -> Dict[str, int]:
+        """Aktuelle Queue-Tiefe und Zähler."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "queue_depth": self._queue.qsize(),
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+
+class AsyncProcessingPool:
+    """Async-Gegenstück für die FastAPI-App: feste Anzahl Worker-Tasks im
+    Event-Loop, begrenzte ``asyncio.Queue``, gleiche Zähler wie ``ProcessingPool``."""
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None, name: str = "processing"):
+        self.workers = workers or per_worker('PROCESSING_WORKERS', 4)
+        self.queue_size = queue_size or int(os.getenv('PROCESSING_QUEUE_SIZE', '500'))
+        self.name = name
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def start(self):
+        """Startet die Worker-Tasks im laufenden Event-Loop (idempotent)."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        for index in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker_loop(), name=f"{self.name}-worker-{index}"))
+
+    def submit(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> bool:
+        """Reiht eine Coroutine-Funktion ein. Gibt False zurück, wenn die Queue voll ist."""
+        self.start()
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            return False
+
+        self._submitted += 1
+        return True
+
+    async def _worker_loop(self):
+        while True:
+            func, args, kwargs = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await func(*args, **kwargs)
+                self._completed += 1
+            except Exception as exc:
+                self._failed += 1
+                print(f"[ERROR] {self.name} job failed: {exc}")
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def join(self):
+        """Wartet bis alle eingereihten Jobs abgearbeitet sind."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def free_slots(self) -> int:
+        """Wie viele Jobs sofort einen freien Worker fänden (für Poller wie den AsyncJobWorker)."""
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return max(0, self.workers - self._in_flight - queued)
+
+    async def stop(self):
+        """Bricht die Worker-Tasks ab (Shutdown)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, int]:
+        """Aktuelle Queue-Tiefe und Zähler."""
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self._in_flight,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+        }
@@ -0,0 +1,27 @@
+from config.database_sqlite import DatabaseManager, InterviewSession
+from services.change_feed import ChangeFeed
+from services.event_bus import EventBus
+
+
+def _write(db_manager, **values):
+    with db_manager.write_session() as db_session:
+        db_session.add(InterviewSession(candidate_phone="+49", position="Dev", **values))
+
+
+def test_changes_from_other_writers_are_published_once(tmp_path):
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'feed.db'}")
+    db_manager.create_tables()
+    event_bus = EventBus()
+    subscription = event_bus.subscribe()
+    feed = ChangeFeed(db_manager, event_bus, interval=60)
+
+    assert feed.poll() == 0
+    _write(db_manager, vapi_call_id="call_1", status="in_progress")
+    assert feed.poll() == 1
+    # Überlappungsfenster des Cursors: dieselbe Änderung nicht erneut veröffentlichen
+    assert feed.poll() == 0
+
+    event = subscription.get(timeout=0)
+    assert event["type"] == "interview.updated"
+    assert event["data"]["call_id"] == "call_1"
+    assert subscription.get(timeout=0) is None
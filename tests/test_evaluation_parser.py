@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from services.evaluation_parser import EvaluationParseError, parse_evaluation
+
+VALID = {
+    "gesamtbewertung": {"score": 7, "empfehlung": "EINLADEN"},
+    "einzelbewertungen": {
+        dimension: {"score": 7, "kommentar": "ok"}
+        for dimension in ("kommunikation", "fachkompetenz", "motivation", "cultural_fit", "problemloesung")
+    },
+    "zusammenfassung": "Solide",
+}
+
+
+def test_valid_evaluation_in_markdown_is_accepted():
+    text = "Hier die Bewertung:\n```json\n" + json.dumps(VALID) + ",\n```"
+    assert parse_evaluation(text) == VALID
+
+
+def test_truncated_answer_is_a_parse_failure():
+    with pytest.raises(EvaluationParseError):
+        parse_evaluation('{"gesamtbewertung": {"score": 7, "empfehlung": "EIN')
+
+
+def test_invalid_recommendation_is_rejected():
+    evaluation = {**VALID, "gesamtbewertung": {"score": 7, "empfehlung": "EIN"}}
+    with pytest.raises(EvaluationParseError):
+        parse_evaluation(json.dumps(evaluation))
+
+
+def test_missing_dimension_is_rejected():
+    einzel = dict(VALID["einzelbewertungen"])
+    del einzel["motivation"]
+    with pytest.raises(EvaluationParseError):
+        parse_evaluation(json.dumps({**VALID, "einzelbewertungen": einzel}))
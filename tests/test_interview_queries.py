@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, quote
+
+from config.database_sqlite import DatabaseManager, InterviewSession
+from services.interview_queries import list_changes
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _add(db_manager, call_id, updated_at):
+    with db_manager.write_session() as db_session:
+        db_session.add(InterviewSession(vapi_call_id=call_id, candidate_phone="+49", position="Dev",
+                                        status="completed", created_at=updated_at, updated_at=updated_at))
+
+
+def _sync(db_manager, cursor=None, limit=2):
+    """Ein Sync-Durchlauf wie ein Client: blättern bis has_more == False."""
+    seen = []
+    while True:
+        db_session = db_manager.get_session()
+        try:
+            page = list_changes(db_session, limit=limit, now=NOW, **dict(parse_qsl(cursor or "")))
+        finally:
+            db_session.close()
+        seen += [item["call_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            return seen, cursor
+
+
+def test_late_commit_inside_lookback_is_not_skipped(tmp_path):
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'sync.db'}")
+    db_manager.create_tables()
+    _add(db_manager, "old", NOW - timedelta(hours=1))
+    _add(db_manager, "recent", NOW - timedelta(seconds=5))
+    seen, cursor = _sync(db_manager)
+    assert seen == ["old", "recent"]
+
+    # Zeitstempel vor "recent", aber erst nach dem ersten Sync committet
+    _add(db_manager, "late", NOW - timedelta(seconds=10))
+    seen, _ = _sync(db_manager, cursor)
+    assert "late" in seen
+    assert "old" not in seen
+
+
+def test_full_pages_advance_without_overlap(tmp_path):
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'sync.db'}")
+    db_manager.create_tables()
+    for index in range(5):
+        _add(db_manager, f"call_{index}", NOW - timedelta(seconds=5 - index))
+    seen, _ = _sync(db_manager)
+    assert seen == [f"call_{index}" for index in range(5)]
+
+
+def test_timezone_aware_cursor_is_normalized_to_utc(tmp_path):
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'sync.db'}")
+    db_manager.create_tables()
+    _add(db_manager, "before", NOW - timedelta(hours=2))
+    _add(db_manager, "after", NOW - timedelta(minutes=30))
+    cutoff = NOW - timedelta(hours=1)
+    for updated_after in (cutoff.isoformat() + "Z", cutoff.isoformat() + "+00:00",
+                          (cutoff + timedelta(hours=2)).isoformat() + "+02:00"):
+        seen, _ = _sync(db_manager, f"updated_after={quote(updated_after)}")
+        assert seen == ["after"]
+
+
+def test_future_cursor_with_timezone_returns_empty_page(tmp_path):
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'sync.db'}")
+    db_manager.create_tables()
+    seen, cursor = _sync(db_manager, "updated_after=2099-01-01T00%3A00%3A00Z")
+    assert seen == []
+    assert cursor is not None
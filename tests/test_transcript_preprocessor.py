@@ -0,0 +1,21 @@
+from services.transcript_preprocessor import TranscriptPreprocessor
+
+
+def _process(lines):
+    processed, _ = TranscriptPreprocessor(token_budget=6000).process("\n".join(lines))
+    return processed.splitlines()
+
+
+def test_repeated_short_answers_are_kept():
+    lines = [
+        "Interviewer: Q1", "Kandidat: Ja.",
+        "Interviewer: Q2", "Kandidat: Ja.",
+        "Interviewer: Q3", "Kandidat: Nein.",
+        "Interviewer: Q4", "Kandidat: Nein.",
+    ]
+    assert _process(lines) == lines
+
+
+def test_direct_duplicate_turn_is_dropped():
+    lines = ["Interviewer: Q1", "Kandidat: Ja, genau.", "Kandidat: Ja, genau.", "Interviewer: Q2"]
+    assert _process(lines) == ["Interviewer: Q1", "Kandidat: Ja, genau.", "Interviewer: Q2"]